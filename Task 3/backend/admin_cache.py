@@ -0,0 +1,102 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from bson.objectid import ObjectId
+
+ADMIN_CACHE_SYNC_INTERVAL = float(os.getenv("ADMIN_CACHE_SYNC_INTERVAL", "5"))
+VERSION_ID = "admin_cache"
+
+
+class AdminCache:
+    """Bounded LRU of user id -> admin flag with a per-entry TTL.
+
+    Both positive and negative answers are cached, so admin-gated routes and
+    the admin-scoped application lists skip the ``admins`` lookup on a hit.
+
+    Changes to ``admins`` are published by ``invalidate``, which bumps a
+    version document in ``counters``; every worker polls it at most every
+    ``ADMIN_CACHE_SYNC_INTERVAL`` seconds and drops its entries when it moves,
+    so a revoked admin loses access within that interval rather than the TTL.
+    """
+
+    def __init__(self, ttl=60, max_size=1024):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.version = None
+        self._checked = 0.0
+
+    def _get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[1] < time.monotonic():
+                self._entries.pop(user_id, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[0]
+
+    def _put(self, user_id, is_admin):
+        with self._lock:
+            self._entries[user_id] = (is_admin, time.monotonic() + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def is_admin(self, db, user_id):
+        """Return whether ``user_id`` is an admin, consulting Mongo only on a miss.
+
+        Raises ``bson.errors.InvalidId`` for malformed ids, which are never cached.
+        """
+        self._sync(db)
+        cached = self._get(user_id)
+        if cached is not None:
+            return cached
+        admin = db.admins.find_one({"_id": ObjectId(user_id)}, {"is_admin": 1})
+        result = bool(admin and admin.get("is_admin", False))
+        self._put(user_id, result)
+        return result
+
+    def _sync(self, db):
+        now = time.monotonic()
+        if now - self._checked < ADMIN_CACHE_SYNC_INTERVAL:
+            return
+        self._checked = now
+        doc = db.counters.find_one({"_id": VERSION_ID})
+        version = doc["version"] if doc else 0
+        with self._lock:
+            if version != self.version:
+                self._entries.clear()
+                self.version = version
+
+    def invalidate(self, db, user_id=None):
+        """Drop ``user_id`` (or every entry) here and tell the other workers to drop theirs.
+
+        Call after any change to the ``admins`` collection.
+        """
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(user_id), None)
+        db.counters.update_one({"_id": VERSION_ID}, {"$inc": {"version": 1}}, upsert=True)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries),
+                    "max_size": self.max_size, "ttl": self.ttl, "version": self.version}
+
+
+admin_cache = AdminCache(
+    ttl=float(os.getenv("ADMIN_CACHE_TTL", "60")),
+    max_size=int(os.getenv("ADMIN_CACHE_SIZE", "1024")),
+)
@@ -1,42 +1,84 @@
-from flask import Flask, send_from_directory, request, jsonify
+from flask import Flask, Blueprint, current_app, request, jsonify
 import os
 import urllib.parse
+import click
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager, jwt_required, get_jwt_identity
-from flask_pymongo import PyMongo
-from werkzeug.security import generate_password_hash, check_password_hash
 from utils import generate_token
+import password_hashing
+from password_hashing import hash_password, verify_password, needs_rehash, rehash_in_background, HashingBusy
 from bson.objectid import ObjectId
 from bson.errors import InvalidId
+from pymongo.errors import DuplicateKeyError
 from decorators import admin_required
-from logger import logger
+from admin_cache import admin_cache
+from response_cache import catalog_cache
+from pagination import paginated_find, page_payload, page_response, parse_limit, PaginationError
+import json_provider
+from applications import (
+    fetch_my_applications, apply_review, REVIEW_DECISIONS, missing_fields,
+    new_internship_application, new_project_application,
+    INTERNSHIP_REQUIRED_FIELDS, PROJECT_REQUIRED_FIELDS,
+)
+import counters
+import metrics
+import startup
+import rate_limit
+from mongo_client import ForkSafeMongo
+from indexes import ensure_indexes, check_query_plans
+from storage import create_storage, LocalStorage, UploadRejected, RESUME_MAX_BYTES
+from file_serving import serve_upload
+from exports import export_applications, EXPORT_KINDS
+from search import catalog_index, FACETS
+from progress import module_tasks, complete_task, mentor_advice, format_progress
+from status_events import (
+    hub as status_hub, status_event, issue_ticket, SSE_TICKET_TTL, STATUS_POLL_INTERVAL,
+)
+import logger as logging_setup
+from logger import logger, init_app as init_request_logging
 import datetime
 from dotenv import load_dotenv
 
 load_dotenv()
-app = Flask(__name__)
 
-# --- App Configuration ---
+# Extensions are bound to the app in create_app(); the Mongo client itself is
+# only created on first use in each process (see mongo_client.ForkSafeMongo).
 cors = CORS()
-cors.init_app(app, resources={
-    r"/*": {
-        "origins":"*",
-        "supports_credentials": True,
-        "allow_headers": ["Content-Type", "Authorization"],
-        "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"]
-    }
-})
-app.config["MONGO_URI"] = os.getenv("MONGO_URI", "mongodb://localhost:27017/owl_db")
-app.config['JWT_SECRET_KEY'] = os.getenv("JWT_SECRET_KEY", "super-secret-key-change-in-production")
-mongo = PyMongo(app)
-jwt = JWTManager(app)
+mongo = ForkSafeMongo()
+jwt = JWTManager()
+api = Blueprint("api", __name__, cli_group=None)
+UPLOADS_DIR = os.getenv("UPLOADS_DIR") or os.path.join(os.path.dirname(__file__), 'uploads')
+resume_storage = create_storage(os.getenv("RESUME_STORAGE", "local"), UPLOADS_DIR, mongo)
+
+@api.cli.command("ensure-indexes")
+@click.option("--check", is_flag=True, help="Explain route queries and fail on any COLLSCAN.")
+def ensure_indexes_command(check):
+    """Reconcile MongoDB indexes with the declared set."""
+    ensure_indexes(mongo.db)
+    if check:
+        failures = check_query_plans(mongo.db)
+        if failures:
+            raise SystemExit(f"{len(failures)} route queries use a COLLSCAN")
+        click.echo("All route queries are index-backed")
+
+@api.cli.command("rebuild-counters")
+def rebuild_counters_command():
+    """Recompute the admin dashboard counters from the source collections."""
+    summary = counters.rebuild(mongo.db)
+    click.echo(f"Counters rebuilt: {summary}")
+
+@api.cli.command("invalidate-admin-cache")
+@click.argument("user_id", required=False)
+def invalidate_admin_cache_command(user_id):
+    """Make every worker re-read admin flags after the admins collection was edited."""
+    admin_cache.invalidate(mongo.db, user_id)
+    click.echo("Admin cache invalidated")
 
 # --- Helper Functions ---
 def get_admin_status(user_id):
     """Helper function to check if a user is an admin."""
     try:
-        admin = mongo.db.admins.find_one({"_id": ObjectId(user_id), "is_admin": True})
-        return admin is not None
+        return admin_cache.is_admin(mongo.db, user_id)
     except InvalidId:
         return False
 
@@ -48,157 +90,228 @@ def normalize_url(url: str | None) -> str | None:
         return "https://" + url
     return url
 
+APPLICATION_FIELD_MAP = {
+    "applicant": "name", "projectTitle": "project_name", "projectId": "project_id",
+    "internshipTitle": "internship_title", "internshipId": "internship_id",
+    "resumeName": "resume_name", "resume": "resume_name", "resumeKey": "resume_key", "date": "created_at",
+}
+
+# ObjectIds and datetimes (including inside submission) are encoded by the JSON provider.
+def format_project_application(app):
+    return {
+        "id": app["_id"], "applicant": app.get("name"), "email": app.get("email"),
+        "projectTitle": app.get("project_name"), "projectId": app.get("project_id"),
+        "resumeName": app.get("resume_name"), "resumeKey": app.get("resume_key"), "status": app.get("status"),
+        "date": app.get("created_at"), "type": "project", "submission": app.get("submission", {})
+    }
+
+def format_internship_application(app):
+    return {
+        "id": app["_id"], "applicant": app.get("name"), "email": app.get("email"),
+        "internshipTitle": app.get("internship_title"), "internshipId": app.get("internship_id"),
+        "resume": app.get("resume_name"), "resumeKey": app.get("resume_key"), "status": app.get("status"),
+        "date": app.get("created_at"), "submission": app.get("submission", {})
+    }
+
+def format_catalog_item(doc):
+    return doc
+
+def format_user(user):
+    user["id"] = user.pop("_id")
+    user["joinDate"] = user["id"].generation_time.date()
+    return user
+
+def cache_metrics():
+    lines = ["# TYPE cache_requests_total counter"]
+    for name, stats in (("admin", admin_cache.stats()), ("catalog", catalog_cache.stats())):
+        lines.append(f'cache_requests_total{{cache="{name}",result="hit"}} {stats["hits"]}')
+        lines.append(f'cache_requests_total{{cache="{name}",result="miss"}} {stats["misses"]}')
+    return lines
+
+def log_queue_metrics():
+    sink = logging_setup.queued_sink
+    if sink is None:
+        return []
+    return ["# TYPE log_records_dropped_total counter", f"log_records_dropped_total {sink.dropped}"]
+
+def hashing_metrics():
+    return ["# TYPE password_hash_rejected_total counter",
+            f"password_hash_rejected_total {password_hashing.pool.rejected}",
+            "# TYPE password_hash_timed_out_total counter",
+            f"password_hash_timed_out_total {password_hashing.pool.timed_out}"]
+
+def sse_metrics():
+    stats = status_hub.stats()
+    return ["# TYPE sse_connections gauge", f"sse_connections {stats['connections']}",
+            "# TYPE sse_rejected_total counter", f"sse_rejected_total {stats['rejected']}",
+            "# TYPE sse_events_published_total counter", f"sse_events_published_total {stats['published']}"]
+
+metrics.register_collector(cache_metrics)
+metrics.register_collector(hashing_metrics)
+metrics.register_collector(log_queue_metrics)
+metrics.register_collector(sse_metrics)
+
+@api.app_errorhandler(HashingBusy)
+def handle_hashing_busy(e):
+    return jsonify({"msg": "Too many authentication requests, retry shortly"}), 429, {"Retry-After": str(e.retry_after)}
+
+@api.app_errorhandler(PaginationError)
+def handle_pagination_error(e):
+    return jsonify({"error": str(e)}), 400
+
+def store_resume(resume_file):
+    """Persist an uploaded resume and return the application fields describing it."""
+    if not resume_file or not resume_file.filename:
+        return {"resume_name": None}
+    stored = resume_storage.save(resume_file)
+    return {"resume_name": stored.original_name, "resume_key": stored.key, "resume_size": stored.size}
+
 # --- Basic & File Serving Routes ---
-@app.route('/')
+@api.route('/')
 def home():
     return "Backend is running!"
 
-@app.route('/uploads/<path:filename>')
+@api.route('/uploads/<path:filename>')
 def uploaded_file(filename):
-    uploads_dir = os.path.join(os.path.dirname(__file__), 'uploads')
     decoded_filename = urllib.parse.unquote(filename)
-    file_path = os.path.join(uploads_dir, decoded_filename)
-    if os.path.isfile(file_path):
-        return send_from_directory(uploads_dir, decoded_filename)
-    else:
-        logger.error(f"File not found: {file_path}")
+    storage = None if isinstance(resume_storage, LocalStorage) else resume_storage
+    response = serve_upload(UPLOADS_DIR, decoded_filename, storage)
+    if response is None:
+        # High volume under scans; sample with LOG_SAMPLE_RATES=upload_not_found=<rate>.
+        logger.bind(sample_key="upload_not_found").error(f"File not found: {os.path.join(UPLOADS_DIR, decoded_filename)}")
         return jsonify({"error": "File not found"}), 404
+    return response
 
 # --- Application Status Update Endpoints ---
-@app.route('/api/project_applications/<application_id>/status', methods=['PUT'])
-@jwt_required()
-@admin_required(mongo)
-def update_project_application_status(application_id):
-    data = request.get_json()
+MAX_BULK_REVIEW = int(os.getenv("MAX_BULK_REVIEW", "1000"))
+REVIEW_ERRORS = {
+    "invalid_id": ("Invalid application id", 400),
+    "not_found": ("Application not found", 404),
+    "conflict": ("Application was modified concurrently, retry", 409),
+}
+
+def review_application(collection, application_id):
+    data = request.get_json(silent=True) or {}
     new_status = data.get("status")
-    if not new_status or new_status not in ["approved", "rejected"]:
+    if not new_status or new_status not in REVIEW_DECISIONS:
         return jsonify({"error": "Invalid status value"}), 400
 
-    application = mongo.db.project_applications.find_one({"_id": ObjectId(application_id)})
-    if not application:
-        return jsonify({"error": "Application not found"}), 404
-
-    final_status = new_status
-    current_status = application.get("status")
-    if current_status in ["submitted", "resubmit"] and new_status == "approved":
-        final_status = "completed"
-    elif current_status in ["submitted", "resubmit"] and new_status == "rejected":
-        final_status = "resubmit"
-        
-    mongo.db.project_applications.update_one({"_id": ObjectId(application_id)}, {"$set": {"status": final_status}})
-    return jsonify({"msg": "Status updated", "id": application_id, "status": final_status})
+    result = apply_review(mongo.db, collection, [application_id], new_status).popitem()[1]
+    if "error" in result:
+        message, code = REVIEW_ERRORS[result["error"]]
+        return jsonify({"error": message}), code
+    return jsonify({"msg": "Status updated", "id": application_id, "status": result["status"]})
+
+def review_applications_bulk(collection):
+    data = request.get_json(silent=True) or {}
+    new_status = data.get("status")
+    ids = data.get("ids")
+    if not new_status or new_status not in REVIEW_DECISIONS:
+        return jsonify({"error": "Invalid status value"}), 400
+    if not isinstance(ids, list) or not ids:
+        return jsonify({"error": "'ids' must be a non-empty list"}), 400
+    if len(ids) > MAX_BULK_REVIEW:
+        return jsonify({"error": f"At most {MAX_BULK_REVIEW} ids per request"}), 400
+
+    results = apply_review(mongo.db, collection, [str(i) for i in ids], new_status)
+    updated = sum(1 for r in results.values() if "status" in r)
+    return jsonify({
+        "msg": f"{updated} of {len(results)} applications updated",
+        "results": [{"id": app_id, **result} for app_id, result in results.items()],
+    })
+
+@api.route('/api/project_applications/<application_id>/status', methods=['PUT'])
+@jwt_required()
+@admin_required(mongo)
+def update_project_application_status(application_id):
+    return review_application("project_applications", application_id)
 
-@app.route('/api/internship_applications/<application_id>/status', methods=['PUT'])
+@api.route('/api/internship_applications/<application_id>/status', methods=['PUT'])
 @jwt_required()
 @admin_required(mongo)
 def update_internship_application_status(application_id):
-    data = request.get_json()
-    new_status = data.get("status")
-    if not new_status or new_status not in ["approved", "rejected"]:
-        return jsonify({"error": "Invalid status value"}), 400
+    return review_application("internship_applications", application_id)
 
-    application = mongo.db.internship_applications.find_one({"_id": ObjectId(application_id)})
-    if not application:
-        return jsonify({"error": "Application not found"}), 404
-
-    final_status = new_status
-    current_status = application.get("status")
-    if current_status in ["submitted", "resubmit"] and new_status == "approved":
-        final_status = "completed"
-    elif current_status in ["submitted", "resubmit"] and new_status == "rejected":
-        final_status = "resubmit"
-    
-    mongo.db.internship_applications.update_one({"_id": ObjectId(application_id)}, {"$set": {"status": final_status}})
-    return jsonify({"msg": "Status updated", "id": application_id, "status": final_status})
+@api.route('/api/project_applications/status', methods=['PUT'])
+@jwt_required()
+@admin_required(mongo)
+def bulk_update_project_application_status():
+    return review_applications_bulk("project_applications")
+
+@api.route('/api/internship_applications/status', methods=['PUT'])
+@jwt_required()
+@admin_required(mongo)
+def bulk_update_internship_application_status():
+    return review_applications_bulk("internship_applications")
 
 # --- Application Submission Routes ---
-@app.route('/api/apply_internship', methods=['POST'])
+@api.route('/api/apply_internship', methods=['POST'])
 @jwt_required()
 def apply_internship():
     user_id = get_jwt_identity()
     data = request.form.to_dict()
-    resume_file = request.files.get('resume')
-    
-    if resume_file:
-        uploads_dir = os.path.join(os.path.dirname(__file__), 'uploads')
-        os.makedirs(uploads_dir, exist_ok=True)
-        filename = resume_file.filename
-        resume_file.save(os.path.join(uploads_dir, filename))
-        data['resumeName'] = filename
-
-    required_fields = ["internshipId", "internshipTitle", "name", "email"]
-    if not all(data.get(field) for field in required_fields):
+    if missing_fields(data, INTERNSHIP_REQUIRED_FIELDS):
         return jsonify({"error": "Missing required fields"}), 400
 
-    application = {
-        "user_id": user_id,
-        "internship_id": data.get("internshipId"),
-        "internship_title": data.get("internshipTitle"),
-        "name": data.get("name"),
-        "email": data.get("email"),
-        "resume_name": data.get("resumeName"),
-        "status": "in_process",
-        "created_at": datetime.datetime.now(datetime.timezone.utc)
-    }
+    try:
+        resume = store_resume(request.files.get('resume'))
+    except UploadRejected as e:
+        return jsonify({"error": str(e)}), e.status
+
+    application = new_internship_application(user_id, data, resume)
     result = mongo.db.internship_applications.insert_one(application)
+    counters.record_insert(mongo.db, "internship_applications", application["status"])
     return jsonify({"msg": "Application submitted successfully", "id": str(result.inserted_id)})
 
-@app.route('/api/apply_project/<project_id>', methods=['POST'])
+@api.route('/api/apply_project/<project_id>', methods=['POST'])
 @jwt_required()
 def apply_project(project_id):
     user_id = get_jwt_identity()
     data = request.form.to_dict()
-    resume_file = request.files.get('resume')
-    
-    if resume_file:
-        uploads_dir = os.path.join(os.path.dirname(__file__), 'uploads')
-        os.makedirs(uploads_dir, exist_ok=True)
-        filename = resume_file.filename
-        resume_file.save(os.path.join(uploads_dir, filename))
-        data['resumeName'] = filename
-        
-    required_fields = ["name", "email"]
-    if not all(data.get(field) for field in required_fields):
+    if missing_fields(data, PROJECT_REQUIRED_FIELDS):
         return jsonify({"error": "Missing required fields"}), 400
 
+    try:
+        resume = store_resume(request.files.get('resume'))
+    except UploadRejected as e:
+        return jsonify({"error": str(e)}), e.status
+
     project = mongo.db.projects.find_one({"id": project_id})
     if not project and ObjectId.is_valid(project_id):
         project = mongo.db.projects.find_one({"_id": ObjectId(project_id)})
-    project_name = project.get("name") if project else "Unknown Project"
 
-    application = {
-        "user_id": user_id, "project_id": project_id, "project_name": project_name,
-        "name": data.get("name"), "email": data.get("email"), "resume_name": data.get("resumeName"),
-        "status": "in_process", "created_at": datetime.datetime.now(datetime.timezone.utc), "type": "project"
-    }
+    application = new_project_application(user_id, project_id, project, data, resume)
     result = mongo.db.project_applications.insert_one(application)
+    counters.record_insert(mongo.db, "project_applications", application["status"])
     return jsonify({"msg": "Project application submitted successfully", "id": str(result.inserted_id)})
 
 # --- Data Retrieval Routes ---
-@app.route('/api/my_applications', methods=['GET'])
+@api.route('/api/my_applications', methods=['GET'])
 @jwt_required()
 def get_my_applications():
     user_id = get_jwt_identity()
-    internship_apps = list(mongo.db.internship_applications.find({"user_id": user_id}))
-    project_apps = list(mongo.db.project_applications.find({"user_id": user_id}))
-    
-    formatted_internships = [{
-        "id": str(app["_id"]), "type": "internship", "internshipId": app.get("internship_id"),
-        "internshipTitle": app.get("internship_title"), "resumeName": app.get("resume_name"),
-        "status": app.get("status"),
-        "date": app.get("created_at").isoformat() if app.get("created_at") else None
-    } for app in internship_apps]
-    
-    formatted_projects = [{
-        "id": str(app["_id"]), "type": "project", "projectId": app.get("project_id"),
-        "projectTitle": app.get("project_name"), "resumeName": app.get("resume_name"),
-        "status": app.get("status"),
-        "date": app.get("created_at").isoformat() if app.get("created_at") else None
-    } for app in project_apps]
-    
-    return jsonify(formatted_internships + formatted_projects)
-
-@app.route('/api/project_applications', methods=['GET'])
+    if "limit" not in request.args and "cursor" not in request.args:
+        items, _ = fetch_my_applications(mongo.db, user_id)
+        return jsonify(items)
+    items, next_cursor = fetch_my_applications(
+        mongo.db, user_id, parse_limit(request.args.get("limit")), request.args.get("cursor"))
+    return jsonify({"items": items, "next_cursor": next_cursor})
+
+@api.route('/api/my_applications/events/ticket', methods=['POST'])
+@jwt_required()
+def my_application_events_ticket():
+    """Trade the bearer token for a short-lived ticket for the event stream URL.
+
+    Streams are only served by the ASGI app (asgi.py), where an open stream
+    holds no thread. Under a threaded WSGI server each stream would pin a
+    worker thread for up to half an hour, so clients are told to poll.
+    """
+    if not current_app.config.get("STATUS_STREAMS"):
+        return jsonify({"stream": False, "pollInterval": STATUS_POLL_INTERVAL})
+    ticket = issue_ticket(current_app.config["JWT_SECRET_KEY"], get_jwt_identity())
+    return jsonify({"stream": True, "ticket": ticket, "expiresIn": SSE_TICKET_TTL})
+
+@api.route('/api/project_applications', methods=['GET'])
 @jwt_required()
 def get_project_applications():
     current_user_id = get_jwt_identity()
@@ -207,17 +320,13 @@ def get_project_applications():
     if not is_admin:
         query["user_id"] = current_user_id
     
-    applications = list(mongo.db.project_applications.find(query))
-    result = [{
-        "id": str(app["_id"]), "applicant": app.get("name"), "email": app.get("email"),
-        "projectTitle": app.get("project_name"), "projectId": app.get("project_id"),
-        "resumeName": app.get("resume_name"), "status": app.get("status"),
-        "date": app.get("created_at").isoformat() if app.get("created_at") else None,
-        "type": "project", "submission": app.get("submission", {})
-    } for app in applications]
-    return jsonify(result)
+    page = paginated_find(
+        mongo.db.project_applications, query,
+        sort_fields=("created_at", "_id"), default_sort="_id", date_field="created_at",
+        field_map=APPLICATION_FIELD_MAP, filter_fields=("status", "projectId"))
+    return page_response(page, format_project_application)
 
-@app.route('/api/internship_applications', methods=['GET'])
+@api.route('/api/internship_applications', methods=['GET'])
 @jwt_required()
 def get_internship_applications():
     current_user_id = get_jwt_identity()
@@ -226,48 +335,48 @@ def get_internship_applications():
     if not is_admin:
         query["user_id"] = current_user_id
         
-    applications = list(mongo.db.internship_applications.find(query))
-    result = [{
-        "id": str(app["_id"]), "applicant": app.get("name"), "email": app.get("email"),
-        "internshipTitle": app.get("internship_title"), "internshipId": app.get("internship_id"),
-        "resume": app.get("resume_name"), "status": app.get("status"),
-        "date": app.get("created_at").isoformat() if app.get("created_at") else None,
-        "submission": app.get("submission", {})
-    } for app in applications]
-    return jsonify(result)
+    page = paginated_find(
+        mongo.db.internship_applications, query,
+        sort_fields=("created_at", "_id"), default_sort="_id", date_field="created_at",
+        field_map=APPLICATION_FIELD_MAP, filter_fields=("status", "internshipId"))
+    return page_response(page, format_internship_application)
 
 # --- Projects, Internships, Users Management (Admin) & Public Views ---
-@app.route('/api/projects', methods=['GET', 'POST'])
+@api.route('/api/projects', methods=['GET', 'POST'])
 @jwt_required()
 def handle_projects():
     if request.method == 'GET':
-        projects_cursor = mongo.db.projects.find({})
-        projects_list = []
-        for p in projects_cursor:
-            p['_id'] = str(p['_id'])
-            projects_list.append(p)
-        return jsonify(projects_list)
+        def build():
+            page = paginated_find(
+                mongo.db.projects, {},
+                sort_fields=("_id", "name"), default_sort="_id", date_field="_id")
+            return page_payload(page, format_catalog_item)
+        return catalog_cache.cached_json("projects", build)
     
     if request.method == 'POST':
         if not get_admin_status(get_jwt_identity()):
             return jsonify({"msg": "Admins only"}), 403
         data = request.json
         result = mongo.db.projects.insert_one(data)
+        counters.record_insert(mongo.db, "projects")
+        catalog_cache.invalidate("projects")
+        catalog_index.record_write(mongo.db, "projects", data.get("id") or result.inserted_id)
         return jsonify({"msg": "Project added", "id": str(result.inserted_id)})
 
-@app.route('/api/projects/<project_id>', methods=['GET', 'PUT', 'DELETE'])
+@api.route('/api/projects/<project_id>', methods=['GET', 'PUT', 'DELETE'])
 @jwt_required()
 def handle_single_project(project_id):
     if request.method == 'GET':
-        query = {"$or": [{"id": project_id}]}
-        if ObjectId.is_valid(project_id):
-            query["$or"].append({"_id": ObjectId(project_id)})
-        
-        project = mongo.db.projects.find_one(query)
-        if not project:
-            return jsonify({"error": "Project not found"}), 404
-        project['_id'] = str(project['_id'])
-        return jsonify(project)
+        def build():
+            query = {"$or": [{"id": project_id}]}
+            if ObjectId.is_valid(project_id):
+                query["$or"].append({"_id": ObjectId(project_id)})
+
+            project = mongo.db.projects.find_one(query)
+            if not project:
+                return jsonify({"error": "Project not found"}), 404
+            return project
+        return catalog_cache.cached_json("projects", build)
 
     if not get_admin_status(get_jwt_identity()):
         return jsonify({"msg": "Admins only"}), 403
@@ -277,33 +386,41 @@ def handle_single_project(project_id):
         result = mongo.db.projects.update_one({"id": project_id}, {"$set": data})
         if result.matched_count == 0:
             return jsonify({"error": "Project not found"}), 404
+        catalog_cache.invalidate("projects")
+        catalog_index.record_write(mongo.db, "projects", project_id, data.get("id"))
         return jsonify({"msg": "Project updated"})
 
     if request.method == 'DELETE':
         result = mongo.db.projects.delete_one({"id": project_id})
         if result.deleted_count == 0:
             return jsonify({"error": "Project not found"}), 404
+        counters.record_delete(mongo.db, "projects")
+        catalog_cache.invalidate("projects")
+        catalog_index.record_write(mongo.db, "projects", project_id)
         return jsonify({"msg": "Project deleted"})
 
-@app.route('/api/internships', methods=['GET', 'POST'])
+@api.route('/api/internships', methods=['GET', 'POST'])
 @jwt_required()
 def handle_internships():
     if request.method == 'GET':
-        internships_cursor = mongo.db.internships.find({})
-        internships_list = []
-        for i in internships_cursor:
-            i['_id'] = str(i['_id'])
-            internships_list.append(i)
-        return jsonify(internships_list)
+        def build():
+            page = paginated_find(
+                mongo.db.internships, {},
+                sort_fields=("_id", "title"), default_sort="_id", date_field="_id")
+            return page_payload(page, format_catalog_item)
+        return catalog_cache.cached_json("internships", build)
     
     if request.method == 'POST':
         if not get_admin_status(get_jwt_identity()):
             return jsonify({"msg": "Admins only"}), 403
         data = request.json
         result = mongo.db.internships.insert_one(data)
+        counters.record_insert(mongo.db, "internships")
+        catalog_cache.invalidate("internships")
+        catalog_index.record_write(mongo.db, "internships", data.get("id") or result.inserted_id)
         return jsonify({"msg": "Internship added", "id": str(result.inserted_id)})
 
-@app.route('/api/internships/<internship_id>', methods=['PUT', 'DELETE'])
+@api.route('/api/internships/<internship_id>', methods=['PUT', 'DELETE'])
 @jwt_required()
 @admin_required(mongo)
 def handle_single_internship(internship_id):
@@ -312,27 +429,73 @@ def handle_single_internship(internship_id):
         result = mongo.db.internships.update_one({"id": internship_id}, {"$set": data})
         if result.matched_count == 0:
             return jsonify({"error": "Internship not found"}), 404
+        catalog_cache.invalidate("internships")
+        catalog_index.record_write(mongo.db, "internships", internship_id, data.get("id"))
         return jsonify({"msg": "Internship updated"})
 
     if request.method == 'DELETE':
         result = mongo.db.internships.delete_one({"id": internship_id})
         if result.deleted_count == 0:
             return jsonify({"error": "Internship not found"}), 404
+        counters.record_delete(mongo.db, "internships")
+        catalog_cache.invalidate("internships")
+        catalog_index.record_write(mongo.db, "internships", internship_id)
         return jsonify({"msg": "Internship deleted"})
 
-@app.route('/api/users', methods=['GET'])
+@api.route('/api/search', methods=['GET'])
+@jwt_required()
+def search_catalog():
+    try:
+        offset = int(request.args.get("offset", 0))
+    except ValueError:
+        raise PaginationError("'offset' must be an integer")
+    if offset < 0:
+        raise PaginationError("'offset' must not be negative")
+    filters = {name: [v for v in request.args.get(name, "").split(",") if v] for name in FACETS}
+    catalog_index.ensure_fresh(mongo.db)
+    return jsonify(catalog_index.search(
+        request.args.get("q", ""), filters, parse_limit(request.args.get("limit")), offset))
+
+@api.route('/api/search/suggest', methods=['GET'])
+@jwt_required()
+def suggest_catalog():
+    catalog_index.ensure_fresh(mongo.db)
+    limit = min(parse_limit(request.args.get("limit", "8")), 20)
+    return jsonify({"suggestions": catalog_index.suggest(request.args.get("q", ""), limit)})
+
+@api.route('/api/admin/summary', methods=['GET'])
+@jwt_required()
+@admin_required(mongo)
+def get_admin_summary():
+    return jsonify(counters.get_summary(mongo.db))
+
+@api.route('/api/admin/cache_stats', methods=['GET'])
+@jwt_required()
+@admin_required(mongo)
+def get_admin_cache_stats():
+    return jsonify({"admin_cache": admin_cache.stats(), "catalog_cache": catalog_cache.stats(),
+                    "search_index": catalog_index.stats()})
+
+@api.route('/api/admin/export/<kind>', methods=['GET'])
+@jwt_required()
+@admin_required(mongo)
+def export_application_rows(kind):
+    if kind not in EXPORT_KINDS:
+        return jsonify({"error": "Unknown export"}), 404
+    return export_applications(mongo.db, kind, request.args)
+
+@api.route('/api/users', methods=['GET'])
 @jwt_required()
 @admin_required(mongo)
 def get_users():
-    users = list(mongo.db.users.find({}, {"password_hash": 0}))
-    for user in users:
-        user["id"] = str(user["_id"])
-        user["joinDate"] = user["_id"].generation_time.date().isoformat()
-        del user["_id"]
-    return jsonify(users)
+    page = paginated_find(
+        mongo.db.users, {},
+        sort_fields=("_id", "email", "name"), default_sort="_id", date_field="_id",
+        projection={"password_hash": 0}, filter_fields=())
+    return page_response(page, format_user)
 
 # --- Work Submission ---
-@app.route('/api/project_applications/<application_id>/submission', methods=['PUT'])
+@api.route('/api/project_applications/<application_id>/submission', methods=['PUT'])
 @jwt_required()
 def update_project_submission(application_id):
     user_id = get_jwt_identity()
@@ -345,23 +508,25 @@ def update_project_submission(application_id):
     if not any([github_url, live_url, docs_url]):
         return jsonify({"error": "At least one link is required"}), 400
 
-    application = mongo.db.project_applications.find_one({'_id': ObjectId(application_id), 'user_id': user_id})
-    if not application:
-        return jsonify({"error": "Application not found or access denied"}), 404
-
     submission = {
         'github_url': github_url, 'live_url': live_url, 'docs_url': docs_url,
         'notes': (data.get("notes") or "").strip(),
         'submitted_at': datetime.datetime.now(datetime.timezone.utc)
     }
-    
-    mongo.db.project_applications.update_one(
-        {'_id': ObjectId(application_id)},
-        {'$set': {'submission': submission, 'status': 'submitted'}}
+
+    # Returns the pre-update document, so the counters see the exact previous status.
+    application = mongo.db.project_applications.find_one_and_update(
+        {'_id': ObjectId(application_id), 'user_id': user_id},
+        {'$set': {'submission': submission, 'status': 'submitted'}},
+        projection={'status': 1}
     )
+    if not application:
+        return jsonify({"error": "Application not found or access denied"}), 404
+    counters.record_transition(mongo.db, "project_applications", application.get("status"), "submitted")
+    status_hub.record(mongo.db, user_id, status_event("project_applications", application_id, "submitted", kind="submission"))
     return jsonify({'message': 'Submission saved successfully'})
 
-@app.route('/api/internship_applications/<application_id>/submission', methods=['PUT'])
+@api.route('/api/internship_applications/<application_id>/submission', methods=['PUT'])
 @jwt_required()
 def update_internship_submission(application_id):
     user_id = get_jwt_identity()
@@ -373,24 +538,52 @@ def update_internship_submission(application_id):
     if not any([github_url, live_url]):
         return jsonify({"error": "At least GitHub or Live URL is required"}), 400
 
-    application = mongo.db.internship_applications.find_one({'_id': ObjectId(application_id), 'user_id': user_id})
-    if not application:
-        return jsonify({'error': 'Application not found or access denied'}), 404
-
     submission = {
         'github_url': github_url, 'live_url': live_url,
         'notes': (data.get("notes") or "").strip(),
         'submitted_at': datetime.datetime.now(datetime.timezone.utc)
     }
-    
-    mongo.db.internship_applications.update_one(
-        {'_id': ObjectId(application_id)},
-        {'$set': {'submission': submission, 'status': 'submitted'}}
+
+    # Returns the pre-update document, so the counters see the exact previous status.
+    application = mongo.db.internship_applications.find_one_and_update(
+        {'_id': ObjectId(application_id), 'user_id': user_id},
+        {'$set': {'submission': submission, 'status': 'submitted'}},
+        projection={'status': 1}
     )
+    if not application:
+        return jsonify({'error': 'Application not found or access denied'}), 404
+    counters.record_transition(mongo.db, "internship_applications", application.get("status"), "submitted")
+    status_hub.record(mongo.db, user_id, status_event("internship_applications", application_id, "submitted", kind="submission"))
     return jsonify({'message': 'Submission saved successfully'})
 
+# --- Modules, Tasks & Mentor ---
+@api.route('/tasks/<module_id>', methods=['GET'])
+@jwt_required()
+def get_module_tasks(module_id):
+    if not ObjectId.is_valid(module_id):
+        return jsonify({"error": "Invalid module id"}), 400
+    module = module_tasks(mongo.db, get_jwt_identity(), ObjectId(module_id))
+    if module is None:
+        return jsonify({"error": "Module not found"}), 404
+    return jsonify(module)
+
+@api.route('/progress/<task_id>', methods=['POST'])
+@jwt_required()
+def complete_module_task(task_id):
+    if not ObjectId.is_valid(task_id):
+        return jsonify({"error": "Invalid task id"}), 400
+    progress = complete_task(mongo.db, get_jwt_identity(), ObjectId(task_id))
+    if progress is None:
+        return jsonify({"error": "Task not found"}), 404
+    return jsonify({"msg": "Task completed", "progress": format_progress(progress)})
+
+@api.route('/mentor/advice', methods=['GET'])
+@jwt_required()
+def get_mentor_advice():
+    return jsonify(mentor_advice(mongo.db, get_jwt_identity()))
+
 # --- Authentication ---
-@app.route('/auth/register', methods=['POST'])
+@api.route('/auth/register', methods=['POST'])
 def register():
     data = request.get_json()
     if not data or not data.get('email') or not data.get('password'):
@@ -398,21 +591,27 @@ def register():
     if mongo.db.users.find_one({"email": data["email"]}):
         return jsonify({"msg": "User already exists"}), 400
     
-    user = {"email": data["email"], "name": data.get("name", ""), "password_hash": generate_password_hash(data["password"])}
-    mongo.db.users.insert_one(user)
+    user = {"email": data["email"], "name": data.get("name", ""), "password_hash": hash_password(data["password"])}
+    try:
+        mongo.db.users.insert_one(user)
+    except DuplicateKeyError:
+        return jsonify({"msg": "User already exists"}), 400
+    counters.record_insert(mongo.db, "users")
     return jsonify({"msg": "Registration successful"})
 
-@app.route('/auth/login', methods=['POST'])
+@api.route('/auth/login', methods=['POST'])
 def login():
     data = request.json
     user = mongo.db.users.find_one({"email": data["email"]})
-    if user and check_password_hash(user.get("password_hash", ""), data["password"]):
+    if user and verify_password(user.get("password_hash", ""), data["password"]):
+        if needs_rehash(user.get("password_hash")):
+            rehash_in_background(mongo.db.users, user["_id"], data["password"])
         token = generate_token(str(user["_id"]))
         name = user.get("name") or data["email"].split("@")[0]
         return jsonify({"token": token, "name": name, "email": data["email"]})
     return jsonify({"msg": "Invalid credentials"}), 401
 
-@app.route('/auth/admin-login', methods=['POST'])
+@api.route('/auth/admin-login', methods=['POST'])
 def admin_login():
     data = request.json
     email = data.get("email", "")
@@ -422,12 +621,71 @@ def admin_login():
     if not admin and email == "admin":
         admin = mongo.db.admins.find_one({"username": "admin"})
 
-    if admin and check_password_hash(admin.get("password_hash", ""), password):
+    if admin and verify_password(admin.get("password_hash", ""), password):
+        if needs_rehash(admin.get("password_hash")):
+            rehash_in_background(mongo.db.admins, admin["_id"], password)
         token = generate_token(str(admin["_id"]))
         return jsonify({"token": token, "is_admin": True})
         
     return jsonify({"msg": "Invalid admin credentials"}), 401
 
 
+def create_app():
+    """Build the Flask app. Safe to call before a fork: no Mongo connection is opened here."""
+    with startup.phase("create_app"):
+        app = Flask(__name__)
+        app.config["MONGO_URI"] = os.getenv("MONGO_URI", "mongodb://localhost:27017/owl_db")
+        app.config['JWT_SECRET_KEY'] = os.getenv("JWT_SECRET_KEY", "super-secret-key-change-in-production")
+        # Leave headroom above the resume limit for the other multipart form fields.
+        app.config["MAX_CONTENT_LENGTH"] = RESUME_MAX_BYTES + 1024 * 1024
+        cors.init_app(app, resources={
+            r"/*": {
+                "origins":"*",
+                "supports_credentials": True,
+                "allow_headers": ["Content-Type", "Authorization"],
+                "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"]
+            }
+        })
+        mongo.init_app(app, event_listeners=[metrics.mongo_listener])
+        jwt.init_app(app)
+        json_provider.init_app(app)
+        logging_setup.configure_logging()
+        metrics.init_app(app)
+        init_request_logging(app)
+        startup.init_app(app)
+        rate_limit.init_app(app, mongo)
+        app.register_blueprint(api)
+    return app
+
+
+def warm_up(app):
+    """Get a worker ready before it takes traffic: connect, check indexes, prime caches.
+
+    Runs once per process after any fork (gunicorn ``post_worker_init``, the
+    ASGI lifespan, or ``python app.py``). Failures are logged, not raised, so
+    a worker still starts when Mongo is briefly unreachable.
+    """
+    with startup.phase("warmup"), app.app_context():
+        try:
+            mongo.cx.admin.command("ping")
+            if os.getenv("ENSURE_INDEXES_ON_START", "true").lower() == "true":
+                ensure_indexes(mongo.db)
+                counters.ensure_summary(mongo.db)
+            catalog_index.ensure_fresh(mongo.db)
+        except Exception as e:
+            logger.error(f"Warm-up (ping, indexes, counters, search index) failed: {e}")
+        # Compile the URL map now rather than on the first request.
+        app.url_map.update()
+    startup.mark_ready()
+    logger.info(f"Worker {os.getpid()} ready: {startup.timings()}")
+
+
+metrics.register_collector(startup.metrics_lines)
+
+# Module-level app for `flask run`, gunicorn's "app:app", asgi.py and the benchmarks.
+app = create_app()
+
+
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    warm_up(app)
+    app.run(debug=True)
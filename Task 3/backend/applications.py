@@ -0,0 +1,183 @@
+import datetime
+from collections import defaultdict
+from bson.objectid import ObjectId
+from pymongo import DESCENDING, UpdateMany
+import counters
+from status_events import hub as status_hub, status_event
+from pagination import after_cursor, encode_cursor
+
+def _branch_projection(app_type, id_field, id_key, title_field, title_key):
+    """$project producing the /api/my_applications item shape for one collection.
+
+    ``date`` stays a datetime so the JSON provider formats it like every other endpoint.
+    """
+    return {
+        "_id": 1,
+        "id": {"$toString": "$_id"},
+        "type": {"$literal": app_type},
+        id_key: {"$ifNull": [f"${id_field}", None]},
+        title_key: {"$ifNull": [f"${title_field}", None]},
+        "resumeName": {"$ifNull": ["$resume_name", None]},
+        "status": {"$ifNull": ["$status", None]},
+        "date": {"$ifNull": ["$created_at", None]},
+    }
+
+
+def my_applications_pipeline(user_id, limit=None, cursor=None):
+    """Single aggregation over both application collections, newest first.
+
+    Each branch matches and sorts on the ``(user_id, created_at)`` index and is
+    cut at ``limit + 1`` before the union so neither side over-fetches.
+    """
+    match = {"user_id": user_id}
+    if cursor:
+        match = {"$and": [match, after_cursor("created_at", DESCENDING, cursor)]}
+
+    def branch(projection):
+        stages = [{"$match": match}, {"$sort": {"created_at": -1, "_id": -1}}]
+        if limit:
+            stages.append({"$limit": limit + 1})
+        stages.append({"$project": projection})
+        return stages
+
+    pipeline = branch(_branch_projection("internship", "internship_id", "internshipId",
+                                         "internship_title", "internshipTitle"))
+    pipeline.append({"$unionWith": {
+        "coll": "project_applications",
+        "pipeline": branch(_branch_projection("project", "project_id", "projectId",
+                                              "project_name", "projectTitle")),
+    }})
+    pipeline.append({"$sort": {"date": -1, "_id": -1}})
+    if limit:
+        pipeline.append({"$limit": limit + 1})
+    else:
+        pipeline.append({"$unset": "_id"})
+    return pipeline
+
+
+def fetch_my_applications(db, user_id, limit=None, cursor=None):
+    """Return ``(items, next_cursor)`` for one user in a single round trip."""
+    items = list(db.internship_applications.aggregate(my_applications_pipeline(user_id, limit, cursor)))
+    return finish_my_applications(items, limit)
+
+
+def finish_my_applications(items, limit):
+    """Cut the over-fetched pipeline result to ``limit`` and derive the next cursor."""
+    if not limit:
+        return items, None
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1]["date"], items[-1]["_id"])
+    for item in items:
+        # Kept through the pipeline only so the page boundary can be encoded.
+        del item["_id"]
+    return items, next_cursor
+
+
+# --- New applications ---
+INTERNSHIP_REQUIRED_FIELDS = ("internshipId", "internshipTitle", "name", "email")
+PROJECT_REQUIRED_FIELDS = ("name", "email")
+
+
+def missing_fields(data, required):
+    return not all(data.get(field) for field in required)
+
+
+def new_internship_application(user_id, data, resume):
+    """Document inserted by apply_internship; ``resume`` comes from store_resume."""
+    return {
+        "user_id": user_id,
+        "internship_id": data.get("internshipId"),
+        "internship_title": data.get("internshipTitle"),
+        "name": data.get("name"),
+        "email": data.get("email"),
+        **resume,
+        "status": "in_process",
+        "created_at": datetime.datetime.now(datetime.timezone.utc)
+    }
+
+
+def new_project_application(user_id, project_id, project, data, resume):
+    """Document inserted by apply_project; ``project`` may be None for unknown ids."""
+    return {
+        "user_id": user_id, "project_id": project_id,
+        "project_name": project.get("name") if project else "Unknown Project",
+        "name": data.get("name"), "email": data.get("email"), **resume,
+        "status": "in_process", "created_at": datetime.datetime.now(datetime.timezone.utc), "type": "project"
+    }
+
+
+# --- Review state machine ---
+REVIEW_DECISIONS = ("approved", "rejected")
+# Work that has been submitted is completed on approval or sent back on rejection.
+SUBMITTED_STATES = ("submitted", "resubmit")
+SUBMITTED_OUTCOMES = {"approved": "completed", "rejected": "resubmit"}
+
+
+def resolve_status(current_status, decision):
+    """Status an application ends up in when an admin applies ``decision``."""
+    if current_status in SUBMITTED_STATES:
+        return SUBMITTED_OUTCOMES[decision]
+    return decision
+
+
+def apply_review(db, collection, application_ids, decision):
+    """Apply an admin decision to many applications in two round trips.
+
+    Reads the current statuses with one ``find``, groups the ids by
+    ``(current, final)`` transition and writes one conditional ``UpdateMany``
+    per group in a single unordered ``bulk_write``. Returns ``{id: result}``
+    where result is ``{"status": final}`` or ``{"error": reason}`` with reason
+    one of ``invalid_id``, ``not_found`` or ``conflict`` (the status changed
+    between the read and the write). Streaming deployments add one
+    ``insert_many`` for the status events of every applied change.
+    """
+    results = {}
+    object_ids = {}
+    for raw in application_ids:
+        if ObjectId.is_valid(raw):
+            oid = ObjectId(raw)
+            object_ids[str(oid)] = oid
+        else:
+            results[str(raw)] = {"error": "invalid_id"}
+
+    coll = db[collection]
+    current, owners = {}, {}
+    for d in coll.find({"_id": {"$in": list(object_ids.values())}}, {"status": 1, "user_id": 1}):
+        current[str(d["_id"])] = d.get("status")
+        owners[str(d["_id"])] = d.get("user_id")
+
+    groups = defaultdict(list)
+    for app_id in object_ids:
+        if app_id not in current:
+            results[app_id] = {"error": "not_found"}
+            continue
+        final = resolve_status(current[app_id], decision)
+        groups[(current[app_id], final)].append(app_id)
+        results[app_id] = {"status": final}
+
+    pending = {key: ids for key, ids in groups.items() if key[0] != key[1]}
+    if not pending:
+        return results
+
+    ops = [UpdateMany({"_id": {"$in": [object_ids[i] for i in ids]}, "status": old},
+                      {"$set": {"status": new}})
+           for (old, new), ids in pending.items()]
+    written = coll.bulk_write(ops, ordered=False)
+
+    expected = sum(len(ids) for ids in pending.values())
+    if written.modified_count != expected:
+        # Someone else moved some of these in between; find out which.
+        touched = [object_ids[i] for ids in pending.values() for i in ids]
+        now = {str(d["_id"]): d.get("status") for d in coll.find({"_id": {"$in": touched}}, {"status": 1})}
+        for (old, new), ids in pending.items():
+            applied = [i for i in ids if now.get(i) == new]
+            for i in set(ids) - set(applied):
+                results[i] = {"error": "conflict"}
+            pending[(old, new)] = applied
+
+    counters.record_transitions(db, collection, [(old, new, len(ids)) for (old, new), ids in pending.items()])
+    status_hub.record_many(db, [(owners[app_id], status_event(collection, app_id, new))
+                                for (old, new), ids in pending.items() for app_id in ids if owners.get(app_id)])
+    return results
@@ -0,0 +1,321 @@
+"""Async ASGI serving mode: ``uvicorn asgi:application``.
+
+Routes where the sync app blocks a worker on slow clients or sequential
+Mongo calls are served natively here with PyMongo's asyncio client and
+Starlette's streaming multipart parser. Every other route is forwarded to
+the Flask app unchanged, so JSON contracts, auth and error handling are
+identical in both modes.
+"""
+import asyncio
+import contextlib
+import os
+import time
+from a2wsgi import WSGIMiddleware
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from pymongo import AsyncMongoClient
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Mount, Route
+from werkzeug.datastructures import FileStorage
+from bson.objectid import ObjectId
+
+from app import app as flask_app, mongo, store_resume, warm_up
+from applications import (
+    my_applications_pipeline, finish_my_applications, missing_fields,
+    new_internship_application, new_project_application,
+    INTERNSHIP_REQUIRED_FIELDS, PROJECT_REQUIRED_FIELDS,
+)
+from counters import SUMMARY_ID, insert_changes
+from pagination import parse_limit, PaginationError
+from storage import UploadRejected, RESUME_MAX_BYTES
+from status_events import (
+    hub as status_hub, replay_frames, format_sse, parse_event_id, read_ticket, TooManyStreams,
+    SSE_HEARTBEAT, SSE_MAX_STREAM_SECONDS,
+)
+from logger import logger
+from mongo_client import pool_options
+import metrics
+from metrics import ASGIRequestMetrics
+from rate_limit import (
+    admission, controls, shedding_limits, AdmissionControl, ADMISSIONS, MemoryStore,
+    RATE_LIMIT_ENABLED, SHED_RETRY_AFTER, STREAMING_RULES, forwarded_ip, upload_size,
+)
+
+MONGO_URI = flask_app.config["MONGO_URI"]
+# Event streams are served natively below; the ticket route offers them instead of polling.
+flask_app.config["STATUS_STREAMS"] = True
+status_hub.streaming = True
+ASGI_WSGI_THREADS = int(os.getenv("ASGI_WSGI_THREADS", "10"))
+# Requests on the native routes hold no thread while they wait, so they are bounded separately.
+SHED_MAX_NATIVE_IN_FLIGHT = int(os.getenv("SHED_MAX_NATIVE_IN_FLIGHT", "256"))
+# Flask requests here run on the a2wsgi pool rather than gunicorn threads.
+admission.max_in_flight, admission.max_upload_bytes = shedding_limits(
+    ASGI_WSGI_THREADS, flask_app.config["MAX_CONTENT_LENGTH"])
+native_admission = AdmissionControl(
+    "native", admission.budgets, admission.store, SHED_MAX_NATIVE_IN_FLIGHT,
+    int(os.getenv("SHED_MAX_UPLOAD_BYTES") or 8 * flask_app.config["MAX_CONTENT_LENGTH"]))
+controls.append(native_admission)
+# Same policy as the Flask-CORS setup in app.py, for the natively served routes.
+CORS = [Middleware(
+    CORSMiddleware, allow_origins=["*"], allow_credentials=True,
+    allow_headers=["Content-Type", "Authorization"],
+    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+)]
+
+
+class AuthError(Exception):
+    def __init__(self, message, status=401):
+        super().__init__(message)
+        self.status = status
+
+
+def current_user_id(request):
+    """Validate the bearer token exactly as ``@jwt_required()`` does on the Flask routes.
+
+    Failures carry flask_jwt_extended's own status and message: 401 for a
+    missing header or an expired token, 422 for a malformed or invalid one.
+    """
+    with flask_app.test_request_context(headers=list(request.headers.items())):
+        try:
+            verify_jwt_in_request()
+            return get_jwt_identity()
+        except Exception as e:
+            # Raises again for anything that is not a JWT error.
+            response = flask_app.make_response(flask_app.handle_user_exception(e))
+            raise AuthError(response.get_json()["msg"], response.status_code)
+
+
+def stream_user_id(request):
+    """User for an event stream: a ticket from /api/my_applications/events/ticket, or a bearer token."""
+    ticket = request.query_params.get("ticket")
+    if not ticket:
+        return current_user_id(request)
+    user_id = read_ticket(flask_app.config["JWT_SECRET_KEY"], ticket)
+    if user_id is None:
+        raise AuthError("Invalid or expired stream ticket")
+    return user_id
+
+
+def json_error(message, status, key="error"):
+    return JSONResponse({key: message}, status_code=status)
+
+
+class Admission:
+    """Rate limiting and load shedding for a natively served route.
+
+    Budgets and buckets are shared with the Flask routes (``rule`` is the
+    Flask URL rule), while in-flight work is counted in its own pool.
+    """
+
+    def __init__(self, app, rule):
+        self.app = app
+        self.rule = rule
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            return await self.app(scope, receive, send)
+        request = Request(scope)
+        if RATE_LIMIT_ENABLED:
+            try:
+                client = f"user:{stream_user_id(request)}"
+            except AuthError:
+                remote_addr = request.client.host if request.client else None
+                client = f"ip:{forwarded_ip(remote_addr, request.headers.get('x-forwarded-for'))}"
+            if isinstance(admission.store, MemoryStore):
+                retry_after = admission.check_rate(self.rule, client)
+            else:
+                retry_after = await run_in_threadpool(admission.check_rate, self.rule, client)
+            if retry_after is not None:
+                ADMISSIONS.inc((self.rule, "limited"))
+                response = JSONResponse({"msg": "Too many requests, retry shortly"}, status_code=429,
+                                        headers={"Retry-After": str(retry_after)})
+                return await response(scope, receive, send)
+        if self.rule in STREAMING_RULES:
+            ADMISSIONS.inc((self.rule, "admitted"))
+            return await self.app(scope, receive, send)
+        length = request.headers.get("content-length")
+        upload_bytes = upload_size(request.headers.get("content-type"), int(length) if length else None,
+                                   flask_app.config["MAX_CONTENT_LENGTH"])
+        if not native_admission.enter(upload_bytes):
+            ADMISSIONS.inc((self.rule, "shed"))
+            response = JSONResponse({"msg": "Server is busy, retry shortly"}, status_code=503,
+                                    headers={"Retry-After": str(SHED_RETRY_AFTER)})
+            return await response(scope, receive, send)
+        ADMISSIONS.inc((self.rule, "admitted"))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            native_admission.leave(upload_bytes)
+
+
+def limited(rule):
+    """Route middleware: CORS outermost, so 429/503 responses carry CORS headers and are measured too."""
+    return CORS + [Middleware(ASGIRequestMetrics, rule=rule), Middleware(Admission, rule=rule)]
+
+
+async def read_application_form(request):
+    """Parse the multipart body without blocking the event loop and store the resume."""
+    length = int(request.headers.get("content-length") or 0)
+    if length > flask_app.config["MAX_CONTENT_LENGTH"]:
+        raise UploadRejected(f"File exceeds {RESUME_MAX_BYTES} bytes", status=413)
+    # File parts are spooled to temp files as they arrive (1 MB in memory at most).
+    form = await request.form()
+    data = {k: v for k, v in form.items() if isinstance(v, str)}
+    upload = form.get("resume")
+    resume_file = None
+    if upload is not None and not isinstance(upload, str):
+        resume_file = FileStorage(stream=upload.file, filename=upload.filename)
+    return data, resume_file
+
+
+async def insert_application(db, collection, application):
+    result = await db[collection].insert_one(application)
+    # Same rule as counters.increment: never create a partial summary.
+    await db.counters.update_one({"_id": SUMMARY_ID, "built_at": {"$exists": True}},
+                                 {"$inc": insert_changes(collection, application["status"])})
+    return result.inserted_id
+
+
+async def apply_internship(request):
+    try:
+        user_id = current_user_id(request)
+    except AuthError as e:
+        return json_error(str(e), e.status, key="msg")
+    try:
+        data, resume_file = await read_application_form(request)
+        if missing_fields(data, INTERNSHIP_REQUIRED_FIELDS):
+            return json_error("Missing required fields", 400)
+        # Hashing and writing the file is disk-bound; keep it off the event loop.
+        resume = await run_in_threadpool(store_resume, resume_file)
+    except UploadRejected as e:
+        return json_error(str(e), e.status)
+
+    db = request.app.state.db
+    inserted_id = await insert_application(
+        db, "internship_applications", new_internship_application(user_id, data, resume))
+    return JSONResponse({"msg": "Application submitted successfully", "id": str(inserted_id)})
+
+
+async def apply_project(request):
+    project_id = request.path_params["project_id"]
+    try:
+        user_id = current_user_id(request)
+    except AuthError as e:
+        return json_error(str(e), e.status, key="msg")
+    try:
+        data, resume_file = await read_application_form(request)
+        if missing_fields(data, PROJECT_REQUIRED_FIELDS):
+            return json_error("Missing required fields", 400)
+        resume = await run_in_threadpool(store_resume, resume_file)
+    except UploadRejected as e:
+        return json_error(str(e), e.status)
+
+    db = request.app.state.db
+    project = await db.projects.find_one({"id": project_id})
+    if not project and ObjectId.is_valid(project_id):
+        project = await db.projects.find_one({"_id": ObjectId(project_id)})
+    inserted_id = await insert_application(
+        db, "project_applications", new_project_application(user_id, project_id, project, data, resume))
+    return JSONResponse({"msg": "Project application submitted successfully", "id": str(inserted_id)})
+
+
+async def my_applications(request):
+    try:
+        user_id = current_user_id(request)
+    except AuthError as e:
+        return json_error(str(e), e.status, key="msg")
+    args = request.query_params
+    paginated = "limit" in args or "cursor" in args
+    try:
+        limit = parse_limit(args.get("limit")) if paginated else None
+        pipeline = my_applications_pipeline(user_id, limit, args.get("cursor"))
+    except PaginationError as e:
+        return json_error(str(e), 400)
+    cursor = await request.app.state.db.internship_applications.aggregate(pipeline)
+    items, next_cursor = finish_my_applications(await cursor.to_list(), limit)
+    # Flask's provider encodes the datetimes exactly as the WSGI route does; JSONResponse cannot.
+    body = items if not paginated else {"items": items, "next_cursor": next_cursor}
+    return Response(flask_app.json.dumps(body), media_type="application/json")
+
+
+class LoopInbox:
+    """Hub inbox that hands events from publishing threads to the event loop."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=256)
+
+    def put_nowait(self, event):
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            pass
+
+
+async def my_application_events(request):
+    """SSE stream served on the event loop, so open streams hold no threads."""
+    try:
+        user_id = stream_user_id(request)
+    except AuthError as e:
+        return json_error(str(e), e.status, key="msg")
+    await run_in_threadpool(status_hub.start, mongo.db)
+    inbox = LoopInbox(asyncio.get_running_loop())
+    try:
+        status_hub.subscribe(user_id, inbox)
+    except TooManyStreams:
+        return JSONResponse({"error": "Too many open event streams"}, status_code=503, headers={"Retry-After": "30"})
+    last_event_id = request.headers.get("last-event-id") or request.query_params.get("lastEventId")
+    dumps = flask_app.json.dumps
+
+    async def stream():
+        try:
+            frames, sent = replay_frames(user_id, last_event_id, dumps)
+            yield "".join(frames)
+            deadline = time.monotonic() + SSE_MAX_STREAM_SECONDS
+            while time.monotonic() < deadline:
+                try:
+                    event = await asyncio.wait_for(inbox.queue.get(), SSE_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if parse_event_id(event["eventId"]) > sent:
+                    yield format_sse(event, dumps)
+        finally:
+            status_hub.unsubscribe(user_id, inbox)
+
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    # Created per process at startup, never inherited across a fork.
+    client = AsyncMongoClient(MONGO_URI, event_listeners=[metrics.mongo_listener], **pool_options())
+    app.state.db = client.get_default_database()
+    await run_in_threadpool(warm_up, flask_app)
+    logger.info("ASGI app started")
+    yield
+    await client.close()
+
+
+application = Starlette(
+    routes=[
+        Route("/api/apply_internship", apply_internship, methods=["POST", "OPTIONS"],
+              middleware=limited("/api/apply_internship")),
+        Route("/api/apply_project/{project_id}", apply_project, methods=["POST", "OPTIONS"],
+              middleware=limited("/api/apply_project/<project_id>")),
+        Route("/api/my_applications", my_applications, methods=["GET", "OPTIONS"],
+              middleware=limited("/api/my_applications")),
+        Route("/api/my_applications/events", my_application_events, methods=["GET", "OPTIONS"],
+              middleware=limited("/api/my_applications/events")),
+        Mount("/", app=WSGIMiddleware(flask_app, workers=ASGI_WSGI_THREADS)),
+    ],
+    lifespan=lifespan,
+)
@@ -0,0 +1,9 @@
+"""Reproducible load and latency benchmarks for the Flask backend.
+
+``python -m benchmarks seed`` restores the ``owl_backup/owl_db`` dumps into a
+scratch database and scales them up synthetically; ``python -m benchmarks
+run`` drives the scenarios through the Flask app and writes a JSON report
+that ``python -m benchmarks compare`` checks against a saved baseline.
+The standalone ``*_bench.py`` scripts and ``load_test.py`` cover individual
+subsystems.
+"""
@@ -0,0 +1,157 @@
+import argparse
+import datetime
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pymongo import MongoClient
+from pymongo.uri_parser import parse_uri
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+DEFAULT_URI = "mongodb://localhost:27017/owl_bench_suite"
+
+
+def _database(uri, force):
+    name = parse_uri(uri).get("database")
+    if not name:
+        raise SystemExit("The Mongo URI must name a database, e.g. mongodb://localhost:27017/owl_bench_suite")
+    if name == "owl_db" and not force:
+        raise SystemExit("Refusing to seed the application database 'owl_db'; pass --force to override")
+    return MongoClient(uri)[name]
+
+
+def seed_command(args):
+    from benchmarks.seed import restore_dumps, scale, snapshot
+    from indexes import ensure_indexes
+    import counters
+
+    db = _database(args.mongo_uri, args.force)
+    for name in db.list_collection_names():
+        db.drop_collection(name)
+    print(f"restored: {restore_dumps(db)}")
+    print(f"scaled: {scale(db, args.users, args.applications, args.seed)}")
+    ensure_indexes(db)
+    counters.rebuild(db)
+    print(f"snapshot: {len(snapshot(db))} collections")
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_command(args):
+    from benchmarks.seed import restore_snapshot
+
+    db = _database(args.mongo_uri, args.force)
+    # The apply and review scenarios write; start every run from the seeded state.
+    if not args.no_restore and not restore_snapshot(db):
+        raise SystemExit("No seed snapshot found; run `python -m benchmarks seed` first")
+    uploads = tempfile.mkdtemp(prefix="owl-bench-uploads-")
+    try:
+        _run(args, uploads)
+    finally:
+        shutil.rmtree(uploads, ignore_errors=True)
+
+
+def _run(args, uploads):
+    # The app reads its configuration at import time.
+    os.environ["MONGO_URI"] = args.mongo_uri
+    # Keep the apply scenario's resumes out of the repository's uploads/ directory.
+    os.environ["UPLOADS_DIR"] = uploads
+    os.environ["RESUME_STORAGE"] = "local"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    # Every simulated user shares one client address; measure the handlers, not the limiter.
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    import app as app_module
+    from benchmarks.scenarios import Context, install_probe, run_scenario
+
+    install_probe(app_module.app)
+    ctx = Context(app_module)
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "mongo_uri": args.mongo_uri,
+            "restored": not args.no_restore,
+            "users": ctx.db.users.estimated_document_count(),
+            "applications": ctx.db.internship_applications.estimated_document_count()
+            + ctx.db.project_applications.estimated_document_count(),
+        },
+        "scenarios": {},
+    }
+    for name in args.scenarios.split(","):
+        result = run_scenario(ctx, name, args.iterations, args.concurrency)
+        report["scenarios"][name] = result
+        print(f"{name:<16} {result['throughput_per_s']:>8}/s  p50 {result['p50_ms']} ms  "
+              f"p95 {result['p95_ms']} ms  p99 {result['p99_ms']} ms  {result['status_codes']}")
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"report written to {args.output}")
+
+
+def compare_command(args):
+    """Exit non-zero when a scenario regressed beyond the tolerance."""
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    tolerance = args.tolerance
+    regressions = []
+    for name, base in baseline["scenarios"].items():
+        now = current["scenarios"].get(name)
+        if now is None:
+            continue
+        if now["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {base['p95_ms']} -> {now['p95_ms']} ms")
+        if now["throughput_per_s"] < base["throughput_per_s"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {base['throughput_per_s']} -> {now['throughput_per_s']}/s")
+        for route, stats in base["routes"].items():
+            now_ops = now["routes"].get(route, {}).get("mongo_ops_per_request")
+            if now_ops is not None and now_ops > stats["mongo_ops_per_request"]:
+                regressions.append(f"{name} {route}: Mongo ops/request "
+                                   f"{stats['mongo_ops_per_request']} -> {now_ops}")
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if regressions:
+        raise SystemExit(1)
+    print("no regressions")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--mongo-uri", default=os.getenv("BENCH_MONGO_URI", DEFAULT_URI))
+    parser.add_argument("--force", action="store_true", help="allow using the owl_db database")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    seed = sub.add_parser("seed", help="restore the dumps and scale them up")
+    seed.add_argument("--users", type=int, default=10000)
+    seed.add_argument("--applications", type=int, default=100000)
+    seed.add_argument("--seed", type=int, default=42)
+    seed.set_defaults(func=seed_command)
+
+    run = sub.add_parser("run", help="drive the scenarios and write a JSON report")
+    run.add_argument("--scenarios", default="login,dashboard,apply,review,my_applications")
+    run.add_argument("--iterations", type=int, default=500)
+    run.add_argument("--concurrency", type=int, default=8)
+    run.add_argument("--output", default="benchmark-report.json")
+    run.add_argument("--no-restore", action="store_true", help="keep writes from earlier runs")
+    run.set_defaults(func=run_command)
+
+    compare = sub.add_parser("compare", help="compare a report with a saved baseline")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--tolerance", type=float, default=0.15)
+    compare.set_defaults(func=compare_command)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
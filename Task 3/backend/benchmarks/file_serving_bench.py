@@ -0,0 +1,74 @@
+"""Compare worker CPU seconds per resume download across serving modes.
+
+Usage: python benchmarks/file_serving_bench.py [--size-mb 2] [--requests 200]
+
+Each mode is driven through Flask's test client against ``serve_upload`` so
+the numbers reflect only the time a worker spends producing the response.
+"""
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from flask import Flask, abort
+from file_serving import serve_upload
+
+
+def build_app(uploads_dir, offload):
+    app = Flask(__name__)
+
+    @app.route("/uploads/<path:filename>")
+    def uploaded_file(filename):
+        response = serve_upload(uploads_dir, filename, offload=offload)
+        if response is None:
+            abort(404)
+        return response
+
+    return app
+
+
+def run_mode(uploads_dir, key, offload, headers, requests):
+    client = build_app(uploads_dir, offload).test_client()
+    status = None
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    for _ in range(requests):
+        response = client.get(f"/uploads/{key}", headers=headers)
+        response.get_data()  # drain the body as a real WSGI server would
+        status = response.status_code
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    return status, cpu / requests, wall / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=2.0)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as uploads_dir:
+        payload = b"%PDF-1.4\n" + os.urandom(int(args.size_mb * 1024 * 1024))
+        sha = hashlib.sha256(payload).hexdigest()
+        key = f"{sha}.pdf"
+        with open(os.path.join(uploads_dir, key), "wb") as f:
+            f.write(payload)
+
+        modes = [
+            ("python full body", "", {}),
+            ("python range 64KiB", "", {"Range": "bytes=0-65535"}),
+            ("conditional 304", "", {"If-None-Match": f'"{sha}"'}),
+            ("x-accel-redirect", "x-accel", {}),
+            ("x-sendfile", "x-sendfile", {}),
+        ]
+        print(f"{'mode':<22}{'status':>8}{'cpu ms/req':>14}{'wall ms/req':>14}")
+        for name, offload, headers in modes:
+            status, cpu, wall = run_mode(uploads_dir, key, offload, headers, args.requests)
+            print(f"{name:<22}{status:>8}{cpu * 1000:>14.3f}{wall * 1000:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Closed-loop load generator for comparing the sync (gunicorn) and async (uvicorn) modes.
+
+Start each mode against the same local mongod with rate limiting off (every
+worker here shares one token, so the per-user budgets would otherwise turn
+most requests into 429s), then point this at it:
+
+    RATE_LIMIT_ENABLED=false gunicorn -w 4 -b :8000 app:app
+    RATE_LIMIT_ENABLED=false uvicorn asgi:application --workers 4 --port 8001
+
+    python benchmarks/load_test.py --url http://localhost:8000 --email u@example.com --password pw
+    python benchmarks/load_test.py --url http://localhost:8001 --email u@example.com --password pw
+
+Scenarios: ``my_applications`` (GET), ``projects`` (GET) and ``apply``
+(multipart POST with a resume, optionally throttled to mimic slow clients).
+Only the standard library is used so it runs anywhere the backend runs.
+The run fails if the server rate limited any request.
+"""
+import argparse
+import http.client
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import urllib.parse
+import uuid
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class Target:
+    def __init__(self, url):
+        parsed = urllib.parse.urlparse(url)
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+
+    def connect(self):
+        return http.client.HTTPConnection(self.host, self.port, timeout=60)
+
+
+def login(target, email, password):
+    conn = target.connect()
+    conn.request("POST", "/auth/login", json.dumps({"email": email, "password": password}),
+                 {"Content-Type": "application/json"})
+    response = conn.getresponse()
+    body = json.loads(response.read())
+    conn.close()
+    if response.status != 200:
+        raise SystemExit(f"Login failed: {body}")
+    return body["token"]
+
+
+def multipart_body(fields, resume_bytes):
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="resume"; filename="cv.pdf"\r\n'
+                 f'Content-Type: application/pdf\r\n\r\n'.encode() + resume_bytes + b"\r\n")
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+def send_slowly(conn, method, path, body, headers, chunk_delay):
+    """Send the body in 64 KiB chunks with a pause between them, like a slow uplink."""
+    conn.putrequest(method, path)
+    for key, value in headers.items():
+        conn.putheader(key, value)
+    conn.putheader("Content-Length", str(len(body)))
+    conn.endheaders()
+    for start in range(0, len(body), 64 * 1024):
+        conn.send(body[start:start + 64 * 1024])
+        time.sleep(chunk_delay)
+
+
+def worker(target, scenario, token, deadline, args, latencies, errors, limited, lock):
+    conn = target.connect()
+    auth = {"Authorization": f"Bearer {token}"}
+    resume = b"%PDF-1.4\n" + os.urandom(args.resume_kb * 1024)
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        try:
+            if scenario == "apply":
+                # A fresh resume per request so storage dedup does not skew the numbers.
+                body, content_type = multipart_body(
+                    {"internshipId": "load-test", "internshipTitle": "Load Test", "name": "Load", "email": "load@example.com"},
+                    resume + os.urandom(16))
+                send_slowly(conn, "POST", "/api/apply_internship", body,
+                            {**auth, "Content-Type": content_type}, args.chunk_delay)
+            else:
+                path = "/api/my_applications" if scenario == "my_applications" else "/api/projects"
+                conn.request("GET", path, headers=auth)
+            response = conn.getresponse()
+            response.read()
+            if response.status == 429:
+                with lock:
+                    limited.append(time.perf_counter() - t0)
+                continue
+            ok = response.status < 400
+        except (OSError, http.client.HTTPException):
+            ok = False
+            conn.close()
+            conn = target.connect()
+        elapsed = time.perf_counter() - t0
+        with lock:
+            if ok:
+                latencies.append(elapsed)
+            else:
+                errors.append(elapsed)
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--token")
+    parser.add_argument("--email")
+    parser.add_argument("--password")
+    parser.add_argument("--scenario", choices=["my_applications", "projects", "apply"], default="my_applications")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--resume-kb", type=int, default=256)
+    parser.add_argument("--chunk-delay", type=float, default=0.0, help="seconds between 64 KiB upload chunks")
+    args = parser.parse_args()
+
+    target = Target(args.url)
+    token = args.token or login(target, args.email, args.password)
+    latencies, errors, limited, lock = [], [], [], threading.Lock()
+    deadline = time.perf_counter() + args.duration
+    threads = [threading.Thread(target=worker, args=(target, args.scenario, token, deadline, args, latencies, errors, limited, lock))
+               for _ in range(args.concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+
+    print(json.dumps({
+        "url": args.url, "scenario": args.scenario, "concurrency": args.concurrency,
+        "requests": len(latencies), "errors": len(errors), "rate_limited": len(limited),
+        "rps": round(len(latencies) / wall, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }, indent=2))
+    if limited:
+        sys.exit(f"{len(limited)} requests were rate limited (429), so these numbers are not comparable; "
+                 "restart the server with RATE_LIMIT_ENABLED=false")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Measure the request-thread cost of a log call in the sync and queued logging modes.
+
+Usage: python benchmarks/logging_bench.py [--calls 20000] [--with-console] [--fsync]
+
+Each call runs inside a Flask request context, so the request-id/route
+patcher is included, just as it is for log calls made from route handlers.
+With ``--fsync`` both modes also write to a sink that fsyncs every write,
+standing in for a slow disk or a network log shipper: the sync mode pays for
+it on every call, the queued mode once per batch on the writer thread.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ["LOG_DIR"] = tempfile.mkdtemp(prefix="owl-log-bench-")
+
+from flask import Flask, g
+import logger as logging_setup
+from logger import logger
+
+
+class FsyncFile:
+    def __init__(self, path):
+        self.file = open(path, "a", encoding="utf-8")
+
+    def write(self, text):
+        self.file.write(text)
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+
+def measure(mode, calls, echo, fsync):
+    logging_setup.configure_logging(mode, echo=echo)
+    if fsync:
+        slow = FsyncFile(os.path.join(os.environ["LOG_DIR"], f"fsync-{mode}.log"))
+        if mode == "queued":
+            logging_setup.queued_sink.echo = slow
+        else:
+            logger.add(slow.write, format=logging_setup.log_format, filter=logging_setup.sample_filter)
+    app = Flask(__name__)
+    with app.test_request_context("/api/projects"):
+        g.request_id = "bench"
+        g.log_started = time.perf_counter()
+        start = time.perf_counter()
+        for i in range(calls):
+            logger.info(f"GET /api/projects served item {i}")
+        elapsed = time.perf_counter() - start
+    dropped = logging_setup.queued_sink.dropped if logging_setup.queued_sink else 0
+    # Flush before the next mode so background writes don't overlap the measurement.
+    logging_setup.configure_logging("sync", echo=False)
+    return elapsed / calls * 1e6, dropped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--with-console", action="store_true", help="include the stderr sink")
+    parser.add_argument("--fsync", action="store_true", help="add a sink that fsyncs every write")
+    args = parser.parse_args()
+
+    results = [(mode, *measure(mode, args.calls, args.with_console, args.fsync)) for mode in ("sync", "queued")]
+    logger.remove()
+    print(f"{'mode':<10}{'us/call':>10}{'dropped':>10}")
+    for mode, per_call, dropped in results:
+        print(f"{mode:<10}{per_call:>10.1f}{dropped:>10}")
+    print(f"log files in {os.environ['LOG_DIR']}")
+
+
+if __name__ == "__main__":
+    main()
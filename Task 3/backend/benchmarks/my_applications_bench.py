@@ -0,0 +1,99 @@
+"""Compare the legacy two-query /api/my_applications with the $unionWith pipeline.
+
+Usage: MONGO_URI=mongodb://localhost:27017 python benchmarks/my_applications_bench.py
+
+Seeds a scratch database (``owl_bench_my_applications`` by default, dropped
+afterwards; it must be empty unless ``--force`` is given) with
+1k, 10k and 100k applications for a single user, split across both
+application collections, and reports median latency per call.
+"""
+import argparse
+import datetime
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("ENSURE_INDEXES_ON_START", "false")
+
+from pymongo import MongoClient
+from applications import fetch_my_applications
+from indexes import ensure_indexes
+
+USER_ID = "bench-user"
+
+
+def legacy_my_applications(db, user_id):
+    """The pre-aggregation implementation: two finds, Python formatting, concat."""
+    internship_apps = list(db.internship_applications.find({"user_id": user_id}))
+    project_apps = list(db.project_applications.find({"user_id": user_id}))
+    formatted_internships = [{
+        "id": str(app["_id"]), "type": "internship", "internshipId": app.get("internship_id"),
+        "internshipTitle": app.get("internship_title"), "resumeName": app.get("resume_name"),
+        "status": app.get("status"),
+        "date": app.get("created_at").isoformat() if app.get("created_at") else None
+    } for app in internship_apps]
+    formatted_projects = [{
+        "id": str(app["_id"]), "type": "project", "projectId": app.get("project_id"),
+        "projectTitle": app.get("project_name"), "resumeName": app.get("resume_name"),
+        "status": app.get("status"),
+        "date": app.get("created_at").isoformat() if app.get("created_at") else None
+    } for app in project_apps]
+    # The client sorted these by date; include that cost for a fair comparison.
+    return sorted(formatted_internships + formatted_projects, key=lambda a: a["date"] or "", reverse=True)
+
+
+def seed(db, count):
+    db.internship_applications.delete_many({})
+    db.project_applications.delete_many({})
+    start = datetime.datetime(2024, 1, 1)
+    half = count // 2
+    db.internship_applications.insert_many([{
+        "user_id": USER_ID, "internship_id": f"internship-{i % 20}", "internship_title": "Bench Internship",
+        "name": "Bench", "email": "bench@example.com", "resume_name": "cv.pdf", "status": "in_process",
+        "created_at": start + datetime.timedelta(minutes=2 * i),
+    } for i in range(half)])
+    db.project_applications.insert_many([{
+        "user_id": USER_ID, "project_id": f"project-{i % 20}", "project_name": "Bench Project",
+        "name": "Bench", "email": "bench@example.com", "resume_name": "cv.pdf", "status": "in_process",
+        "created_at": start + datetime.timedelta(minutes=2 * i + 1), "type": "project",
+    } for i in range(count - half)])
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--db", default="owl_bench_my_applications")
+    parser.add_argument("--force", action="store_true", help="use (and drop) a database that already has data")
+    args = parser.parse_args()
+
+    client = MongoClient(os.getenv("MONGO_URI", "mongodb://localhost:27017"))
+    db = client[args.db]
+    if (args.db == "owl_db" or db.list_collection_names()) and not args.force:
+        raise SystemExit(f"Refusing to use and drop the non-empty database {args.db!r}; pass --force to override")
+    ensure_indexes(db)
+    print(f"{'apps/user':>10}{'legacy ms':>12}{'pipeline ms':>14}{'page(50) ms':>14}")
+    try:
+        for size in (int(s) for s in args.sizes.split(",")):
+            seed(db, size)
+            legacy = timed(lambda: legacy_my_applications(db, USER_ID), args.repeat)
+            pipeline = timed(lambda: fetch_my_applications(db, USER_ID), args.repeat)
+            page = timed(lambda: fetch_my_applications(db, USER_ID, limit=50), args.repeat)
+            print(f"{size:>10}{legacy:>12.1f}{pipeline:>14.1f}{page:>14.1f}")
+    finally:
+        client.drop_database(args.db)
+
+
+if __name__ == "__main__":
+    main()
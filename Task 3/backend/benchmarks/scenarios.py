@@ -0,0 +1,159 @@
+import io
+import os
+import random
+import statistics
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from flask import g
+from flask_jwt_extended import create_access_token
+from benchmarks.seed import BENCH_ADMIN_EMAIL, BENCH_PASSWORD
+
+MONGO_OPS_HEADER = "X-Bench-Mongo-Ops"
+REVIEW_BATCH = 200
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class Context:
+    """Shared state for the scenarios: app, db handles, tokens and sampled ids."""
+
+    def __init__(self, app_module, seed=7):
+        self.app = app_module.app
+        self.db = app_module.mongo.db
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.user_count = self.db.users.count_documents({"email": {"$regex": "^bench-user-"}})
+        admin = self.db.admins.find_one({"email": BENCH_ADMIN_EMAIL})
+        with self.app.app_context():
+            self.admin_headers = {"Authorization": f"Bearer {create_access_token(identity=str(admin['_id']))}"}
+            sample = self.db.users.find({"email": {"$regex": "^bench-user-"}}, {"_id": 1}).sort("_id", 1).limit(1000)
+            self.user_headers = [{"Authorization": f"Bearer {create_access_token(identity=str(u['_id']))}"}
+                                 for u in sample]
+        self.reviewable = [str(d["_id"]) for d in self.db.internship_applications.find(
+            {"status": {"$in": ["submitted", "resubmit"]}}, {"_id": 1}).sort("_id", 1).limit(20000)]
+        self.resume = b"%PDF-1.4\n" + self.rng.randbytes(128 * 1024)
+
+    def pick(self, seq):
+        with self.lock:
+            return self.rng.choice(seq)
+
+    def sample(self, seq, k):
+        with self.lock:
+            return self.rng.sample(seq, min(k, len(seq)))
+
+
+def login_storm(ctx):
+    with ctx.lock:
+        i = ctx.rng.randrange(max(ctx.user_count, 1))
+    return [("POST", "/auth/login", {"json": {"email": f"bench-user-{i}@example.com", "password": BENCH_PASSWORD}})]
+
+
+def dashboard(ctx):
+    """The admin dashboard as it should load: summary plus the first page of each list."""
+    h = ctx.admin_headers
+    return [
+        ("GET", "/api/admin/summary", {"headers": h}),
+        ("GET", "/api/projects", {"headers": h}),
+        ("GET", "/api/internships", {"headers": h}),
+        ("GET", "/api/users?limit=50", {"headers": h}),
+        ("GET", "/api/internship_applications?limit=50&sort=-created_at", {"headers": h}),
+        ("GET", "/api/project_applications?limit=50&sort=-created_at", {"headers": h}),
+    ]
+
+
+def apply_with_resume(ctx):
+    # A unique tail per request so storage deduplication does not short-circuit the write.
+    resume = ctx.resume + os.urandom(16)
+    return [("POST", "/api/apply_internship", {
+        "headers": ctx.pick(ctx.user_headers),
+        "data": {"internshipId": "bench-internship", "internshipTitle": "Bench", "name": "Bench", "email": "b@example.com",
+                 "resume": (io.BytesIO(resume), "resume.pdf")},
+        "content_type": "multipart/form-data",
+    })]
+
+
+def bulk_review(ctx):
+    return [("PUT", "/api/internship_applications/status", {
+        "headers": ctx.admin_headers,
+        "json": {"ids": ctx.sample(ctx.reviewable, REVIEW_BATCH), "status": ctx.pick(["approved", "rejected"])},
+    })]
+
+
+def my_applications(ctx):
+    return [("GET", "/api/my_applications?limit=50", {"headers": ctx.pick(ctx.user_headers)})]
+
+
+SCENARIOS = {
+    "login": login_storm,
+    "dashboard": dashboard,
+    "apply": apply_with_resume,
+    "review": bulk_review,
+    "my_applications": my_applications,
+}
+
+
+def install_probe(app):
+    """Expose the per-request Mongo command count recorded by metrics.py."""
+    @app.after_request
+    def _mongo_ops(response):
+        response.headers[MONGO_OPS_HEADER] = str(len(g.get("mongo_trace", [])))
+        return response
+
+
+def run_scenario(ctx, name, iterations, concurrency):
+    build = SCENARIOS[name]
+    latencies = []
+    route_latencies = defaultdict(list)
+    route_ops = defaultdict(list)
+    statuses = Counter()
+    lock = threading.Lock()
+    local = threading.local()
+
+    def one_iteration(_):
+        if not hasattr(local, "client"):
+            local.client = ctx.app.test_client()
+        t_start = time.perf_counter()
+        for method, path, kwargs in build(ctx):
+            t0 = time.perf_counter()
+            response = local.client.open(path, method=method, **kwargs)
+            response.get_data()
+            elapsed = time.perf_counter() - t0
+            route = path.split("?")[0]
+            with lock:
+                statuses[response.status_code] += 1
+                route_latencies[route].append(elapsed)
+                route_ops[route].append(int(response.headers.get(MONGO_OPS_HEADER, 0)))
+        with lock:
+            latencies.append(time.perf_counter() - t_start)
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one_iteration, range(iterations)))
+    wall = time.perf_counter() - wall_start
+
+    def ms(value):
+        return round(value * 1000, 2) if value is not None else None
+
+    return {
+        "iterations": iterations,
+        "concurrency": concurrency,
+        "throughput_per_s": round(iterations / wall, 1),
+        "p50_ms": ms(statistics.median(latencies)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "status_codes": {str(k): v for k, v in sorted(statuses.items())},
+        "routes": {
+            route: {
+                "p50_ms": ms(statistics.median(samples)),
+                "p99_ms": ms(percentile(samples, 99)),
+                "mongo_ops_per_request": round(sum(route_ops[route]) / len(route_ops[route]), 2),
+            } for route, samples in sorted(route_latencies.items())
+        },
+    }
@@ -0,0 +1,92 @@
+"""Measure /api/search and /api/search/suggest latency on a synthetic catalog.
+
+Usage: python benchmarks/search_bench.py [--entries 100000] [--distinct-skills 5000]
+
+Builds the in-process catalog index from generated projects and internships
+(no MongoDB needed) and reports median and p99 latency per query shape, first
+with a small fixed skill list and then with ``--distinct-skills`` free-text
+skills drawn from a long-tailed distribution, as in the real catalog dumps.
+The caches are cleared every ``--cache-every`` queries to include misses.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from search import CatalogIndex
+
+WORDS = ("web", "mobile", "data", "cloud", "security", "design", "react", "python", "django", "flask",
+         "node", "api", "machine", "learning", "vision", "network", "game", "portfolio", "commerce",
+         "analytics", "devops", "blockchain", "chat", "dashboard", "testing", "embedded", "robotics")
+SKILLS = ("Python", "JavaScript", "React", "SQL", "Docker", "Git", "Figma", "AWS", "Go", "Rust", "Kotlin")
+DURATIONS = ("1 Month", "2 Months", "3 Months", "6 Months")
+MODES = ("Remote", "On-site", "Hybrid")
+QUERIES = {
+    "one term": {"query": "python"},
+    "two terms": {"query": "machine learning"},
+    "prefix": {"query": "dash"},
+    "filtered": {"query": "web", "filters": {"mode": ["Remote"], "duration": ["3 Months"]}},
+    "browse facets": {"query": "", "filters": {"skills": ["Rust"]}},
+}
+
+
+def synthetic(count, rng, skills=SKILLS):
+    # Long-tailed: a few skills are everywhere, most appear a handful of times.
+    weights = [1 / (rank + 1) for rank in range(len(skills))]
+    for i in range(count):
+        title = " ".join(rng.sample(WORDS, 3)).title()
+        doc = {"id": f"entry{i}", "description": " ".join(rng.choices(WORDS, k=30)),
+               "skills": rng.choices(skills, weights, k=4), "tech_stack": rng.sample(SKILLS, 3)}
+        if i % 2:
+            yield "internships", dict(doc, title=title, duration=rng.choice(DURATIONS), mode=rng.choice(MODES))
+        else:
+            yield "projects", dict(doc, name=title)
+
+
+def timed(fn, runs, clear=None, every=0):
+    samples = []
+    for run in range(runs):
+        if every and run % every == 0:
+            clear()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def run(label, skills, args):
+    index = CatalogIndex()
+    start = time.perf_counter()
+    for collection, doc in synthetic(args.entries, random.Random(1), skills):
+        index.add_documents(collection, [doc])
+    print(f"{label}: indexed {args.entries} entries in {time.perf_counter() - start:.1f} s: {index.stats()}")
+
+    queries = dict(QUERIES, **{"browse facets": {"query": "", "filters": {"skills": [skills[-1]]}}})
+    for name, spec in queries.items():
+        median, p99 = timed(lambda: index.search(spec["query"], spec.get("filters")), args.runs,
+                            index._cache.clear, args.cache_every)
+        print(f"search {name:<14} median {median:7.2f} ms   p99 {p99:7.2f} ms")
+    for prefix in ("d", "dash", "machine le"):
+        median, p99 = timed(lambda: index.suggest(prefix), args.runs)
+        print(f"suggest {prefix!r:<13} median {median:7.2f} ms   p99 {p99:7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=100000)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--distinct-skills", type=int, default=5000)
+    parser.add_argument("--cache-every", type=int, default=50, help="clear the caches every N queries (0: never)")
+    args = parser.parse_args()
+
+    run(f"{len(SKILLS)} skills", SKILLS, args)
+    run(f"{args.distinct_skills} skills", tuple(f"Skill {i}" for i in range(args.distinct_skills)), args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import datetime
+import os
+import random
+import bson
+from bson.objectid import ObjectId
+from werkzeug.security import generate_password_hash
+
+DUMP_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "owl_backup", "owl_db")
+BENCH_PASSWORD = "bench-password"
+BENCH_ADMIN_EMAIL = "bench-admin@example.com"
+STATUSES = ("in_process", "submitted", "resubmit", "completed", "approved", "rejected")
+BATCH = 10000
+SNAPSHOT_PREFIX = "bench_snapshot."
+
+
+def restore_dumps(db, dump_dir=DUMP_DIR):
+    """Load every ``<collection>.bson`` from a mongodump directory, replacing the collection."""
+    restored = {}
+    for name in sorted(os.listdir(dump_dir)):
+        if not name.endswith(".bson"):
+            continue
+        collection = name[:-len(".bson")]
+        db.drop_collection(collection)
+        with open(os.path.join(dump_dir, name), "rb") as f:
+            docs = list(bson.decode_file_iter(f))
+        if docs:
+            db[collection].insert_many(docs)
+        restored[collection] = len(docs)
+    return restored
+
+
+def seeded_object_id(rng, when):
+    """An ObjectId for ``when`` whose remaining 8 bytes come from ``rng``, so seeds reproduce ids."""
+    return ObjectId(int(when.timestamp()).to_bytes(4, "big") + rng.randbytes(8))
+
+
+def snapshot(db):
+    """Copy every collection server-side so ``restore_snapshot`` can undo a run's writes."""
+    names = [n for n in db.list_collection_names() if not n.startswith(SNAPSHOT_PREFIX)]
+    for name in names:
+        db[name].aggregate([{"$out": SNAPSHOT_PREFIX + name}])
+    return names
+
+
+def restore_snapshot(db):
+    """Put every collection back to its state at seed time; False when there is no snapshot."""
+    names = [n for n in db.list_collection_names() if n.startswith(SNAPSHOT_PREFIX)]
+    if not names:
+        return False
+    snapshotted = {n[len(SNAPSHOT_PREFIX):] for n in names}
+    for name in db.list_collection_names():
+        if not name.startswith(SNAPSHOT_PREFIX) and name not in snapshotted:
+            db.drop_collection(name)  # created by a run, e.g. rate_limits or status_events
+    for name in names:
+        # $out replaces the documents but keeps the target's indexes.
+        db[name].aggregate([{"$out": name[len(SNAPSHOT_PREFIX):]}])
+    return True
+
+
+def _insert_batched(collection, docs):
+    batch = []
+    for doc in docs:
+        batch.append(doc)
+        if len(batch) >= BATCH:
+            collection.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        collection.insert_many(batch, ordered=False)
+
+
+def scale(db, users, applications, seed=42):
+    """Add ``users`` synthetic users and ``applications`` applications split across both kinds.
+
+    Catalog entries come from the restored dumps, so applications point at
+    real projects and internships. All synthetic users share one password
+    hash to keep seeding fast. ``seed`` makes the data, ObjectIds included,
+    identical across runs.
+    """
+    rng = random.Random(seed)
+    password_hash = generate_password_hash(BENCH_PASSWORD)
+    start = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+
+    user_ids = []
+
+    def user_docs():
+        for i in range(users):
+            oid = seeded_object_id(rng, start + datetime.timedelta(seconds=i))
+            user_ids.append(str(oid))
+            yield {"_id": oid, "email": f"bench-user-{i}@example.com", "name": f"Bench User {i}",
+                   "password_hash": password_hash}
+
+    _insert_batched(db.users, user_docs())
+    db.admins.update_one({"email": BENCH_ADMIN_EMAIL}, {"$set": {
+        "username": "bench-admin", "password_hash": password_hash, "is_admin": True}}, upsert=True)
+
+    internships = list(db.internships.find({}, {"id": 1, "title": 1})) or [{"_id": "bench-internship", "title": "Bench"}]
+    projects = list(db.projects.find({}, {"id": 1, "name": 1})) or [{"_id": "bench-project", "name": "Bench"}]
+
+    def application_docs(kind):
+        count = applications // 2 if kind == "internship" else applications - applications // 2
+        for i in range(count):
+            user_index = rng.randrange(len(user_ids))
+            created_at = start + datetime.timedelta(seconds=rng.randrange(365 * 24 * 3600))
+            doc = {
+                "_id": seeded_object_id(rng, created_at),
+                "user_id": user_ids[user_index], "name": f"Bench User {user_index}",
+                "email": f"bench-user-{user_index}@example.com", "resume_name": "resume.pdf",
+                "status": rng.choice(STATUSES),
+                "created_at": created_at,
+            }
+            if kind == "internship":
+                target = rng.choice(internships)
+                doc.update(internship_id=target.get("id") or str(target["_id"]), internship_title=target.get("title"))
+            else:
+                target = rng.choice(projects)
+                doc.update(project_id=target.get("id") or str(target["_id"]), project_name=target.get("name"), type="project")
+            if doc["status"] in ("submitted", "resubmit", "completed"):
+                doc["submission"] = {"github_url": "https://github.com/example/bench", "live_url": None,
+                                     "notes": "", "submitted_at": doc["created_at"]}
+            yield doc
+
+    _insert_batched(db.internship_applications, application_docs("internship"))
+    _insert_batched(db.project_applications, application_docs("project"))
+    return {"users": users, "applications": applications}
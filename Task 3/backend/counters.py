@@ -0,0 +1,94 @@
+import datetime
+from collections import defaultdict
+from logger import logger
+
+# All dashboard counters live in one document so the summary is a single read.
+SUMMARY_ID = "summary"
+APPLICATION_COLLECTIONS = ("internship_applications", "project_applications")
+CATALOG_COLLECTIONS = ("users", "projects", "internships")
+
+
+def increment(db, changes):
+    """Atomically apply ``{counter_path: delta}`` to the summary document.
+
+    Never creates the document: deltas applied to a missing summary would
+    leave a partial one that looks complete. ``get_summary`` rebuilds it
+    from the source collections instead, which already include this write.
+    """
+    changes = {path: delta for path, delta in changes.items() if delta}
+    if changes:
+        db.counters.update_one({"_id": SUMMARY_ID, "built_at": {"$exists": True}}, {"$inc": changes})
+
+
+def insert_changes(collection, status=None):
+    """Counter deltas for one new document; shared with the async app."""
+    changes = {f"{collection}.total": 1}
+    if status:
+        changes[f"{collection}.status.{status}"] = 1
+    return changes
+
+
+def record_insert(db, collection, status=None):
+    increment(db, insert_changes(collection, status))
+
+
+def record_delete(db, collection):
+    increment(db, {f"{collection}.total": -1})
+
+
+def record_transition(db, collection, old_status, new_status, count=1):
+    """Move ``count`` applications from ``old_status`` to ``new_status`` in the breakdown."""
+    record_transitions(db, collection, [(old_status, new_status, count)])
+
+
+def record_transitions(db, collection, transitions):
+    """Apply several ``(old_status, new_status, count)`` moves in one update."""
+    changes = defaultdict(int)
+    for old_status, new_status, count in transitions:
+        if old_status == new_status:
+            continue
+        changes[f"{collection}.status.{new_status}"] += count
+        if old_status:
+            changes[f"{collection}.status.{old_status}"] -= count
+    increment(db, changes)
+
+
+def ensure_summary(db):
+    """Seed the counters on a database that predates them; a no-op afterwards."""
+    if db.counters.count_documents({"_id": SUMMARY_ID, "built_at": {"$exists": True}}, limit=1) == 0:
+        rebuild(db)
+
+
+def get_summary(db):
+    summary = db.counters.find_one({"_id": SUMMARY_ID}, {"_id": 0})
+    # Only a rebuild sets built_at; anything else is missing or partial.
+    if summary is None or "built_at" not in summary:
+        return rebuild(db)
+    summary.pop("built_at")
+    for name in CATALOG_COLLECTIONS:
+        summary.setdefault(name, {}).setdefault("total", 0)
+    for name in APPLICATION_COLLECTIONS:
+        section = summary.setdefault(name, {})
+        section.setdefault("total", 0)
+        section.setdefault("status", {})
+    return summary
+
+
+def rebuild(db):
+    """Recompute every counter from the source collections and replace the summary."""
+    summary = {"_id": SUMMARY_ID, "built_at": datetime.datetime.now(datetime.timezone.utc)}
+    for name in CATALOG_COLLECTIONS:
+        summary[name] = {"total": db[name].count_documents({})}
+    for name in APPLICATION_COLLECTIONS:
+        by_status = {}
+        total = 0
+        for row in db[name].aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}]):
+            total += row["count"]
+            if row["_id"]:
+                by_status[row["_id"]] = row["count"]
+        summary[name] = {"total": total, "status": by_status}
+    db.counters.replace_one({"_id": SUMMARY_ID}, summary, upsert=True)
+    logger.info("Dashboard counters rebuilt")
+    summary.pop("_id")
+    summary.pop("built_at")
+    return summary
@@ -1,8 +1,8 @@
 from functools import wraps
 from flask import jsonify
 from flask_jwt_extended import get_jwt_identity
-from bson.objectid import ObjectId
 from bson.errors import InvalidId
+from admin_cache import admin_cache
 
 def admin_required(mongo):
     """Decorator to check if the user is an admin"""
@@ -14,14 +14,15 @@ def admin_required(mongo):
                 return '', 200  # Allow CORS preflight
             try:
                 user_id = get_jwt_identity()
-                admin = mongo.db.admins.find_one({"_id": ObjectId(user_id)})
-                if not admin or not admin.get("is_admin", False):
-                    return jsonify({"msg": "Unauthorized - Admin access required"}), 401
-                return f(*args, **kwargs)
+                is_admin = admin_cache.is_admin(mongo.db, user_id)
             except InvalidId:
                 return jsonify({"msg": "Invalid user ID format"}), 400
             except Exception as e:
                 return jsonify({"msg": f"Error: {str(e)}"}), 500
-        
+            if not is_admin:
+                return jsonify({"msg": "Unauthorized - Admin access required"}), 401
+            # Route errors are left to the app's error handlers.
+            return f(*args, **kwargs)
+
         return decorated_function
     return decorator
\ No newline at end of file
@@ -0,0 +1,144 @@
+import csv
+import datetime
+import io
+import os
+from bson.objectid import ObjectId
+from flask import Response, current_app, stream_with_context
+from pagination import PaginationError, list_filters
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+# Per collection: the catalog it points at, the application's catalog key and title fields,
+# the catalog document's title field, and the filter accepted as ?project= / ?internship=.
+EXPORT_KINDS = {
+    "project_applications": {
+        "catalog": "projects", "key": "project_id", "title": "project_name",
+        "catalog_title": "name", "filter": "project",
+    },
+    "internship_applications": {
+        "catalog": "internships", "key": "internship_id", "title": "internship_title",
+        "catalog_title": "title", "filter": "internship",
+    },
+}
+
+EXPORT_COLUMNS = ("id", "created_at", "status", "user_id", "user_name", "applicant", "email",
+                  "catalog_id", "catalog_title", "resume_name", "github_url", "live_url", "submitted_at")
+
+
+def _catalog_titles(db, kind):
+    """Map both the slug ``id`` and the ObjectId string of every catalog entry to its title.
+
+    Catalogs are a few hundred documents at most, so they are read once per export.
+    """
+    spec = EXPORT_KINDS[kind]
+    titles = {}
+    for doc in db[spec["catalog"]].find({}, {"id": 1, spec["catalog_title"]: 1}):
+        title = doc.get(spec["catalog_title"])
+        titles[str(doc["_id"])] = title
+        if doc.get("id"):
+            titles[doc["id"]] = title
+    return titles
+
+
+def _user_names(db, user_ids):
+    """Resolve one batch of user ids to names with a single ``$in`` query."""
+    oids = [ObjectId(u) for u in user_ids if ObjectId.is_valid(u)]
+    if not oids:
+        return {}
+    return {str(u["_id"]): u.get("name") for u in db.users.find({"_id": {"$in": oids}}, {"name": 1})}
+
+
+def _row(doc, spec, titles, names):
+    submission = doc.get("submission") or {}
+    catalog_id = doc.get(spec["key"])
+    return {
+        "id": str(doc["_id"]),
+        "created_at": doc.get("created_at"),
+        "status": doc.get("status"),
+        "user_id": doc.get("user_id"),
+        "user_name": names.get(doc.get("user_id")),
+        "applicant": doc.get("name"),
+        "email": doc.get("email"),
+        "catalog_id": catalog_id,
+        "catalog_title": titles.get(catalog_id) or doc.get(spec["title"]),
+        "resume_name": doc.get("resume_name"),
+        "github_url": submission.get("github_url"),
+        "live_url": submission.get("live_url"),
+        "submitted_at": submission.get("submitted_at"),
+    }
+
+
+def _batches(cursor, size):
+    batch = []
+    for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# Spreadsheets evaluate cells starting with these as formulas; applicants control names and emails.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_value(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return "" if value is None else value
+
+
+def export_query(kind, args):
+    """Mongo filter for ``?status=``, ``?from=``/``?to=`` and ``?project=``/``?internship=``."""
+    spec = EXPORT_KINDS[kind]
+    return list_filters(args, {}, ("status", spec["filter"]), {spec["filter"]: spec["key"]}, "created_at")
+
+
+def export_applications(db, kind, args):
+    """Stream every matching application as CSV or NDJSON.
+
+    Documents are read ``EXPORT_BATCH_SIZE`` at a time from an ``_id``-ordered
+    cursor (so no in-memory sort is needed), joined to user names with one
+    query per batch and to catalog titles from a map loaded up front, then
+    encoded and yielded. Memory stays bounded by one batch regardless of size.
+    """
+    fmt = args.get("format", "csv")
+    if fmt not in EXPORT_FORMATS:
+        raise PaginationError(f"Unsupported export format '{fmt}', expected one of: {', '.join(EXPORT_FORMATS)}")
+    spec = EXPORT_KINDS[kind]
+    query = export_query(kind, args)
+    titles = _catalog_titles(db, kind)
+    projection = {f: 1 for f in ("created_at", "status", "user_id", "name", "email", "resume_name",
+                                 "submission", spec["key"], spec["title"])}
+    cursor = db[kind].find(query, projection).sort("_id", 1).batch_size(EXPORT_BATCH_SIZE)
+    dumps = current_app.json.dumps
+
+    def generate():
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, EXPORT_COLUMNS)
+            writer.writeheader()
+            # Send the header right away so the download starts before the first batch.
+            yield buffer.getvalue()
+        for batch in _batches(cursor, EXPORT_BATCH_SIZE):
+            names = _user_names(db, {doc.get("user_id") for doc in batch if doc.get("user_id")})
+            rows = [_row(doc, spec, titles, names) for doc in batch]
+            if fmt == "ndjson":
+                yield "".join(dumps(row) + "\n" for row in rows)
+                continue
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows({k: _csv_value(v) for k, v in row.items()} for row in rows)
+            yield buffer.getvalue()
+
+    filename = f"{kind}-{datetime.date.today().isoformat()}.{fmt}"
+    return Response(stream_with_context(generate()), mimetype=EXPORT_FORMATS[fmt], headers={
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        # Stop nginx from buffering the whole export before the first byte reaches the client.
+        "X-Accel-Buffering": "no",
+        "Cache-Control": "no-store",
+    })
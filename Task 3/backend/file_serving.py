@@ -0,0 +1,64 @@
+import mimetypes
+import os
+import re
+import urllib.parse
+from flask import current_app, request, send_file
+from werkzeug.security import safe_join
+
+# Content-addressed uploads are named "<sha256>.<ext>" and never change.
+CONTENT_KEY_RE = re.compile(r"^([0-9a-f]{64})\.[a-z0-9]+$")
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# "" serves bytes from Python, "x-accel" hands off to nginx, "x-sendfile" to Apache/lighttpd.
+UPLOADS_OFFLOAD = os.getenv("UPLOADS_OFFLOAD", "").lower()
+UPLOADS_ACCEL_PREFIX = os.getenv("UPLOADS_ACCEL_PREFIX", "/protected-uploads").rstrip("/")
+
+
+def _offload_response(path, filename, etag, offload):
+    """Headers-only response; the front proxy streams the bytes (and handles ranges)."""
+    stat = os.stat(path)
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    response = current_app.response_class(mimetype=mimetype)
+    response.set_etag(etag if isinstance(etag, str) else f"{stat.st_mtime_ns:x}-{stat.st_size:x}")
+    response.last_modified = int(stat.st_mtime)
+    response = response.make_conditional(request)
+    if response.status_code == 304:
+        return response
+    if offload == "x-accel":
+        response.headers["X-Accel-Redirect"] = f"{UPLOADS_ACCEL_PREFIX}/{urllib.parse.quote(filename)}"
+    else:
+        response.headers["X-Sendfile"] = os.path.abspath(path)
+    return response
+
+
+def serve_upload(uploads_dir, filename, storage=None, offload=UPLOADS_OFFLOAD):
+    """Serve an uploaded file with conditional GET, byte ranges and cache headers.
+
+    Files on disk are looked up first (covering legacy uploads stored under
+    their original names); content-addressed keys then fall back to
+    ``storage`` for non-local backends such as GridFS. Returns ``None`` when
+    the file does not exist.
+    """
+    match = CONTENT_KEY_RE.match(filename)
+    # The sha256 in the key is a strong validator for the exact bytes.
+    etag = match.group(1) if match else True
+
+    path = safe_join(uploads_dir, filename)
+    if path and os.path.isfile(path):
+        if offload in ("x-accel", "x-sendfile"):
+            response = _offload_response(path, filename, etag, offload)
+        else:
+            response = send_file(path, etag=etag, conditional=True)
+    elif match and storage is not None and storage.exists(filename):
+        grid_out = storage.open(filename)
+        response = send_file(grid_out, download_name=filename, etag=etag,
+                             last_modified=grid_out.upload_date, conditional=True)
+    else:
+        return None
+
+    if match:
+        response.cache_control.no_cache = None
+        response.cache_control.private = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+    return response
@@ -0,0 +1,24 @@
+"""Gunicorn settings: ``gunicorn -c gunicorn.conf.py`` (worker count from WEB_CONCURRENCY).
+
+The app is imported once in the master (``preload_app``) and forked, so
+workers share its code pages and skip the import cost. Nothing in
+``create_app`` opens a Mongo connection; each worker creates its own client
+and warms up in ``post_worker_init`` before it accepts connections.
+"""
+import os
+
+wsgi_app = "app:app"
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+
+
+def post_fork(server, worker):
+    import startup
+    startup.mark_worker_started()
+
+
+def post_worker_init(worker):
+    from app import warm_up
+    warm_up(worker.wsgi)
@@ -0,0 +1,138 @@
+import datetime
+from bson.objectid import ObjectId
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure
+from logger import logger
+
+# Indexes required by the backend's hot queries: (collection, name, keys, options)
+INDEXES = [
+    ("users", "email_unique", [("email", ASCENDING)], {"unique": True}),
+    ("admins", "email", [("email", ASCENDING)], {}),
+    ("admins", "username", [("username", ASCENDING)], {}),
+    ("projects", "id", [("id", ASCENDING)], {}),
+    ("internships", "id", [("id", ASCENDING)], {}),
+    ("internship_applications", "user_id_status", [("user_id", ASCENDING), ("status", ASCENDING)], {}),
+    ("internship_applications", "user_id_created_at", [("user_id", ASCENDING), ("created_at", DESCENDING)], {}),
+    ("internship_applications", "status_created_at", [("status", ASCENDING), ("created_at", DESCENDING)], {}),
+    ("project_applications", "user_id_status", [("user_id", ASCENDING), ("status", ASCENDING)], {}),
+    ("project_applications", "user_id_created_at", [("user_id", ASCENDING), ("created_at", DESCENDING)], {}),
+    ("project_applications", "status_created_at", [("status", ASCENDING), ("created_at", DESCENDING)], {}),
+    ("project_applications", "project_id", [("project_id", ASCENDING)], {}),
+    ("internship_applications", "internship_id", [("internship_id", ASCENDING)], {}),
+    ("tasks", "module_id", [("module_id", ASCENDING), ("_id", ASCENDING)], {}),
+    ("progress", "user_id_module_id", [("user_id", ASCENDING), ("module_id", ASCENDING)], {"unique": True}),
+    ("progress", "user_id_updated_at", [("user_id", ASCENDING), ("updated_at", DESCENDING)], {}),
+    # Only used with RATE_LIMIT_STORE=mongo; idle buckets expire.
+    ("rate_limits", "expires_at_ttl", [("expires_at", ASCENDING)], {"expireAfterSeconds": 0}),
+]
+
+# Representative query shapes issued by the routes, used by the COLLSCAN check.
+_SAMPLE_ID = ObjectId.from_datetime(datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc))
+ROUTE_QUERIES = [
+    ("login/register", "users", {"email": "user@example.com"}),
+    ("admin_login (email)", "admins", {"email": "admin@example.com"}),
+    ("admin_login (username)", "admins", {"username": "admin"}),
+    ("admin status", "admins", {"_id": _SAMPLE_ID, "is_admin": True}),
+    ("handle_single_project", "projects", {"id": "portfoliowebsite"}),
+    ("handle_single_internship", "internships", {"id": "fullstackdevelopmentinternship"}),
+    ("my_applications (internships)", "internship_applications", {"user_id": str(_SAMPLE_ID)}),
+    ("my_applications (projects)", "project_applications", {"user_id": str(_SAMPLE_ID)}),
+    ("internship submission", "internship_applications", {"_id": _SAMPLE_ID, "user_id": str(_SAMPLE_ID)}),
+    ("project submission", "project_applications", {"_id": _SAMPLE_ID, "user_id": str(_SAMPLE_ID)}),
+    ("internship applications by status", "internship_applications", {"status": {"$in": ["submitted"]}}),
+    ("project applications by status", "project_applications", {"status": {"$in": ["submitted"]}}),
+    ("export by project", "project_applications", {"project_id": {"$in": ["portfoliowebsite"]}}),
+    ("export by internship", "internship_applications",
+     {"internship_id": {"$in": ["fullstackdevelopmentinternship"]}}),
+    ("module tasks", "tasks", {"module_id": _SAMPLE_ID}),
+    ("module progress", "progress", {"user_id": str(_SAMPLE_ID), "module_id": _SAMPLE_ID}),
+    ("mentor advice", "progress", {"user_id": str(_SAMPLE_ID)}),
+]
+
+
+# Options ensure_indexes reconciles; an absent or false value means the server default.
+INDEX_OPTIONS = ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression", "hidden")
+
+
+def _option(spec, name):
+    value = spec.get(name)
+    return None if value is False else value
+
+
+def _drift(existing, keys, options):
+    """Names of the options that differ, or None when the keys themselves differ."""
+    if [tuple(k) for k in existing.get("key", [])] != [(f, d) for f, d in keys]:
+        return None
+    return {name for name in INDEX_OPTIONS if _option(existing, name) != _option(options, name)}
+
+
+def _modify(coll, name, existing, options, drift):
+    """Apply TTL and hidden changes in place with collMod; False when a rebuild is needed."""
+    if not drift <= {"expireAfterSeconds", "hidden"}:
+        return False
+    if "expireAfterSeconds" in drift and (_option(existing, "expireAfterSeconds") is None
+                                          or _option(options, "expireAfterSeconds") is None):
+        return False  # adding or removing a TTL needs a rebuild
+    change = {"name": name}
+    for option in drift:
+        change[option] = options.get(option, False)
+    try:
+        coll.database.command({"collMod": coll.name, "index": change})
+    except OperationFailure as e:
+        logger.warning(f"collMod on {coll.name}.{name} failed, rebuilding: {e}")
+        return False
+    return True
+
+
+def ensure_indexes(db):
+    """Create missing indexes and reconcile any whose keys or options drifted.
+
+    Safe to run repeatedly: indexes that already match are left untouched.
+    TTL and hidden changes are applied in place with ``collMod``; other
+    changes drop and rebuild the index. Returns the list of index names that
+    were created, modified or rebuilt.
+    """
+    changed = []
+    for collection, name, keys, options in INDEXES:
+        coll = db[collection]
+        existing = coll.index_information().get(name)
+        drift = _drift(existing, keys, options) if existing else None
+        if existing and drift == set():
+            continue
+        if drift and _modify(coll, name, existing, options, drift):
+            logger.warning(f"Index {collection}.{name} options changed ({', '.join(sorted(drift))}), modified in place")
+            changed.append(f"{collection}.{name}")
+            continue
+        if existing:
+            logger.warning(f"Index {collection}.{name} definition changed, rebuilding")
+            coll.drop_index(name)
+        try:
+            coll.create_index(keys, name=name, **options)
+            changed.append(f"{collection}.{name}")
+        except OperationFailure as e:
+            # e.g. duplicate emails blocking the unique index; keep starting up.
+            logger.error(f"Could not create index {collection}.{name}: {e}")
+    if changed:
+        logger.info(f"Indexes created or updated: {', '.join(changed)}")
+    return changed
+
+
+def _stages(plan):
+    yield plan.get("stage")
+    for child_key in ("inputStage", "queryPlan"):
+        if child_key in plan:
+            yield from _stages(plan[child_key])
+    for child in plan.get("inputStages", []):
+        yield from _stages(child)
+
+
+def check_query_plans(db):
+    """Explain every route query and return those whose winning plan is a COLLSCAN."""
+    failures = []
+    for route, collection, query in ROUTE_QUERIES:
+        explain = db.command("explain", {"find": collection, "filter": query}, verbosity="queryPlanner")
+        winning = explain["queryPlanner"]["winningPlan"]
+        if "COLLSCAN" in set(_stages(winning)):
+            failures.append((route, collection, query))
+            logger.error(f"COLLSCAN for {route}: {collection}.find({query})")
+    return failures
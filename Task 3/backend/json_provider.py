@@ -0,0 +1,84 @@
+import datetime
+import os
+from decimal import Decimal
+from flask import Response, current_app, stream_with_context
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+from bson.objectid import ObjectId
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib provider below handles the same types
+    orjson = None
+
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "500"))
+
+
+def _default(value):
+    """Types neither encoder knows: ObjectIds become hex strings."""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class MongoJSONProvider(DefaultJSONProvider):
+    """Stdlib fallback that encodes ObjectId and datetimes (ISO 8601) natively."""
+
+    @staticmethod
+    def default(value):
+        if isinstance(value, (datetime.datetime, datetime.date)):
+            return value.isoformat()
+        try:
+            return _default(value)
+        except TypeError:
+            return DefaultJSONProvider.default(value)
+
+
+class OrjsonProvider(JSONProvider):
+    """orjson-backed provider; datetimes, dates and nested dicts are encoded in C."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS),
+            mimetype="application/json")
+
+
+def init_app(app):
+    app.json = OrjsonProvider(app) if orjson else MongoJSONProvider(app)
+
+
+def stream_json_array(items, formatter=None, batch_size=STREAM_BATCH_SIZE):
+    """Stream an iterable (typically a Mongo cursor) as a JSON array.
+
+    Documents are formatted and encoded ``batch_size`` at a time, so neither
+    the full list nor the full body is ever held in memory.
+    """
+    dumps = current_app.json.dumps
+    if hasattr(items, "batch_size"):
+        items = items.batch_size(batch_size)
+
+    def generate():
+        yield "["
+        first = True
+        batch = []
+        for item in items:
+            batch.append(dumps(formatter(item) if formatter else item))
+            if len(batch) >= batch_size:
+                yield ("" if first else ",") + ",".join(batch)
+                first = False
+                batch = []
+        if batch:
+            yield ("" if first else ",") + ",".join(batch)
+        yield "]"
+
+    return Response(stream_with_context(generate()), mimetype="application/json")
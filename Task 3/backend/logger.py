@@ -1,39 +1,223 @@
 from loguru import logger
-import sys
+from flask import g, has_request_context, request
+import atexit
+import json
 import os
+import queue
+import random
+import sys
+import threading
+import time
+import traceback
+import uuid
 
 # Configure loguru logger
 log_level = os.getenv("LOG_LEVEL", "INFO")
 log_format = "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
 
-# Remove default handler
-logger.remove()
-
-# Add console handler
-logger.add(
-    sys.stderr,
-    format=log_format,
-    level=log_level,
-    colorize=True,
-)
-
-# Add file handler for errors and above
-logger.add(
-    "logs/error.log",
-    format=log_format,
-    level="ERROR",
-    rotation="10 MB",
-    retention="1 week",
-)
-
-# Add file handler for all logs
-logger.add(
-    "logs/app.log",
-    format=log_format,
-    level=log_level,
-    rotation="10 MB",
-    retention="3 days",
-)
-
-# Create logs directory if it doesn't exist
-os.makedirs("logs", exist_ok=True)
\ No newline at end of file
+# "sync": colorized stderr + rotating files written on the calling thread (default).
+# "queued": JSON lines handed to a background writer through a bounded queue.
+LOG_MODE = os.getenv("LOG_MODE", "sync")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_QUEUE_POLICY = os.getenv("LOG_QUEUE_POLICY", "drop")  # or "block"
+LOG_ROTATE_BYTES = int(os.getenv("LOG_ROTATE_BYTES", str(10 * 1024 * 1024)))
+LOG_DIR = os.getenv("LOG_DIR", "logs")
+
+
+def parse_sample_rates(spec):
+    """Parse ``"DEBUG=0.1,upload_not_found=0.01"`` into ``{key: keep_probability}``.
+
+    Keys are either level names or a ``sample_key`` bound on the record.
+    """
+    rates = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        key, _, rate = item.partition("=")
+        rates[key.strip()] = float(rate)
+    return rates
+
+
+SAMPLE_RATES = parse_sample_rates(os.getenv("LOG_SAMPLE_RATES", ""))
+
+
+def sample_filter(record):
+    level_rate = SAMPLE_RATES.get(record["level"].name, 1.0)
+    rate = SAMPLE_RATES.get(record["extra"].get("sample_key"), level_rate)
+    return rate >= 1.0 or random.random() < rate
+
+
+def _add_request_context(record):
+    """Attach request id, route and elapsed time when logging inside a Flask request."""
+    if not has_request_context():
+        return
+    extra = record["extra"]
+    extra.setdefault("request_id", g.get("request_id"))
+    extra.setdefault("route", request.url_rule.rule if request.url_rule else request.path)
+    if "log_started" in g:
+        extra.setdefault("duration_ms", round((time.perf_counter() - g.log_started) * 1000, 2))
+
+
+class QueuedJSONSink:
+    """Loguru sink that defers JSON formatting and I/O to a background thread.
+
+    The calling thread only puts the loguru record on a bounded queue; the
+    request context is still read there by the patcher, since it is thread-local.
+    When the queue is full the record is dropped (and counted) or the caller
+    blocks, depending on ``policy``. Each process writes its own file
+    (``app-<pid>.jsonl``) so gunicorn workers never share a rotating file, and
+    the writer thread is restarted in forked children.
+    """
+
+    def __init__(self, directory, max_size=10000, policy="drop", rotate_bytes=10 * 1024 * 1024, echo=sys.stderr):
+        self.directory = directory
+        self.max_size = max_size
+        self.policy = policy
+        self.rotate_bytes = rotate_bytes
+        self.echo = echo
+        self.dropped = 0
+        self._closed = False
+        self._start()
+        os.register_at_fork(after_in_child=self._start)
+        atexit.register(self.close)
+
+    def _start(self):
+        if self._closed:
+            return
+        self._queue = queue.Queue(self.max_size)
+        self._path = os.path.join(self.directory, f"app-{os.getpid()}.jsonl")
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, message):
+        # Only the record loguru already built is queued; formatting happens on the writer.
+        if self.policy == "block":
+            self._queue.put(message.record)
+            return
+        try:
+            self._queue.put_nowait(message.record)
+        except queue.Full:
+            self.dropped += 1
+
+    @staticmethod
+    def _format(record):
+        item = {
+            "time": record["time"].isoformat(),
+            "level": record["level"].name,
+            "message": record["message"],
+            "logger": record["name"],
+            "function": record["function"],
+            "line": record["line"],
+            "pid": record["process"].id,
+        }
+        if record["extra"]:
+            item.update(record["extra"])
+        if record["exception"]:
+            exc = record["exception"]
+            item["exception"] = "".join(traceback.format_exception(exc.type, exc.value, exc.traceback))
+        return json.dumps(item, default=str) + "\n"
+
+    def _run(self):
+        out = open(self._path, "a", encoding="utf-8")
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            # Drain whatever else is waiting so bursts become one write.
+            while len(batch) < 512:
+                try:
+                    nxt = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    self._queue.put(None)
+                    break
+                batch.append(nxt)
+            text = "".join(self._format(record) for record in batch)
+            out.write(text)
+            out.flush()
+            if self.echo is not None:
+                self.echo.write(text)
+            if out.tell() >= self.rotate_bytes:
+                out.close()
+                os.replace(self._path, self._path + ".1")
+                out = open(self._path, "a", encoding="utf-8")
+        out.close()
+
+    def close(self, timeout=2.0):
+        self._closed = True
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+
+queued_sink = None
+
+
+def configure_logging(mode=LOG_MODE, echo=True):
+    """(Re)install the sinks for ``mode``; called by ``create_app``.
+
+    File sinks are opened lazily on the first record they accept.
+    """
+    global queued_sink
+    # Create logs directory before any file sink opens it
+    os.makedirs(LOG_DIR, exist_ok=True)
+
+    # Remove default handler
+    logger.remove()
+    logger.configure(patcher=_add_request_context)
+    if queued_sink is not None:
+        queued_sink.close()
+        queued_sink = None
+
+    if mode == "queued":
+        queued_sink = QueuedJSONSink(LOG_DIR, LOG_QUEUE_SIZE, LOG_QUEUE_POLICY, LOG_ROTATE_BYTES,
+                                     echo=sys.stderr if echo else None)
+        logger.add(queued_sink.write, level=log_level, filter=sample_filter, format="{message}")
+        return
+
+    # Add console handler
+    if echo:
+        logger.add(
+            sys.stderr,
+            format=log_format,
+            level=log_level,
+            colorize=True,
+            filter=sample_filter,
+        )
+
+    # Add file handler for errors and above
+    logger.add(
+        os.path.join(LOG_DIR, "error.log"),
+        format=log_format,
+        level="ERROR",
+        rotation="10 MB",
+        retention="1 week",
+        filter=sample_filter,
+        delay=True,
+    )
+
+    # Add file handler for all logs
+    logger.add(
+        os.path.join(LOG_DIR, "app.log"),
+        format=log_format,
+        level=log_level,
+        rotation="10 MB",
+        retention="3 days",
+        filter=sample_filter,
+        delay=True,
+    )
+
+
+def init_app(app):
+    """Give every request an id (honouring X-Request-ID) for log correlation."""
+
+    @app.before_request
+    def _assign_request_id():
+        g.request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+        g.log_started = time.perf_counter()
+
+    @app.after_request
+    def _echo_request_id(response):
+        if "request_id" in g:
+            response.headers["X-Request-ID"] = g.request_id
+        return response
@@ -0,0 +1,261 @@
+import contextvars
+import hmac
+import ipaddress
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from flask import g, has_request_context, jsonify, request
+from pymongo import monitoring
+from logger import logger
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "0"))
+# /metrics is served to a bearer METRICS_TOKEN or to clients in METRICS_ALLOWED_IPS
+# (addresses or CIDRs; loopback only by default). Set TRUSTED_PROXY_HOPS behind a proxy.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_ALLOWED_IPS = [ipaddress.ip_network(n.strip(), strict=False)
+                       for n in os.getenv("METRICS_ALLOWED_IPS", "127.0.0.1,::1").split(",") if n.strip()]
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a tuple of label values."""
+
+    def __init__(self, name, help_text, labels, buckets):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_values, value):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for label_values, (counts, total, count) in sorted(self._series.items()):
+                labels = _labels(self.labels, label_values)
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{self.name}_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f"{self.name}_sum{{{labels}}} {total}")
+                lines.append(f"{self.name}_count{{{labels}}} {count}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text, labels, kind="counter"):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.kind = kind
+        self._values = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, label_values, amount=1):
+        with self._lock:
+            self._values[label_values] += amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{{{_labels(self.labels, label_values)}}} {value}")
+        return lines
+
+
+def _labels(names, values):
+    return ",".join(f'{n}="{str(v).replace(chr(34), chr(39))}"' for n, v in zip(names, values))
+
+
+REQUEST_LATENCY = Histogram("http_request_duration_seconds", "Request latency by route.",
+                            ("method", "route", "status"), LATENCY_BUCKETS)
+RESPONSE_SIZE = Histogram("http_response_size_bytes", "Response body size by route.",
+                          ("method", "route"), SIZE_BUCKETS)
+IN_FLIGHT = Counter("http_requests_in_flight", "Requests currently being handled.", ("route",), kind="gauge")
+MONGO_LATENCY = Histogram("mongo_command_duration_seconds", "MongoDB command latency by issuing route.",
+                          ("route", "command", "collection"), LATENCY_BUCKETS)
+MONGO_DOCS = Counter("mongo_documents_returned_total", "Documents returned by find/aggregate/getMore.",
+                     ("route", "collection"))
+MONGO_FAILURES = Counter("mongo_command_failures_total", "Failed MongoDB commands.", ("route", "command"))
+MONGO_ROUND_TRIPS = Histogram("mongo_round_trips_per_request", "MongoDB commands issued per request.",
+                              ("route",), COUNT_BUCKETS)
+
+_collectors = []
+
+
+def register_collector(collect):
+    """Add a callable returning extra exposition lines (e.g. cache counters)."""
+    _collectors.append(collect)
+
+
+def render():
+    lines = []
+    for metric in (REQUEST_LATENCY, RESPONSE_SIZE, IN_FLIGHT, MONGO_LATENCY, MONGO_DOCS,
+                   MONGO_FAILURES, MONGO_ROUND_TRIPS):
+        lines.extend(metric.render())
+    for collect in _collectors:
+        lines.extend(collect())
+    return "\n".join(lines) + "\n"
+
+
+def metrics_allowed(remote_addr, authorization):
+    if METRICS_TOKEN and hmac.compare_digest((authorization or "").encode(), f"Bearer {METRICS_TOKEN}".encode()):
+        return True
+    try:
+        address = ipaddress.ip_address(remote_addr or "")
+    except ValueError:
+        return False
+    return any(address in network for network in METRICS_ALLOWED_IPS)
+
+
+# Route of the natively served ASGI request running in the current task, if any.
+_asgi_route = contextvars.ContextVar("asgi_route", default=None)
+
+
+def _route():
+    if not has_request_context():
+        return _asgi_route.get() or "background"
+    return request.url_rule.rule if request.url_rule else "unmatched"
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Attributes each command to the Flask route running on the same thread, or to the
+    ASGI route running in the same task for the async client."""
+
+    IGNORED = {"hello", "isMaster", "ismaster", "ping", "endSessions", "saslStart", "saslContinue"}
+
+    def __init__(self):
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        if event.command_name in self.IGNORED:
+            return
+        collection = event.command.get(event.command_name)
+        if not isinstance(collection, str):
+            collection = event.command.get("collection", "")
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = collection
+
+    def _finish(self, event, failed):
+        with self._lock:
+            collection = self._pending.pop((event.connection_id, event.request_id), None)
+        if collection is None:
+            return
+        route = _route()
+        seconds = event.duration_micros / 1e6
+        docs = 0
+        if not failed:
+            cursor = event.reply.get("cursor") if isinstance(event.reply, dict) else None
+            if cursor:
+                docs = len(cursor.get("firstBatch") or cursor.get("nextBatch") or [])
+            elif event.command_name == "findAndModify" and event.reply.get("value") is not None:
+                docs = 1
+        MONGO_LATENCY.observe((route, event.command_name, collection), seconds)
+        if docs:
+            MONGO_DOCS.inc((route, collection), docs)
+        if failed:
+            MONGO_FAILURES.inc((route, event.command_name))
+        if has_request_context() and "mongo_trace" in g:
+            g.mongo_trace.append((event.command_name, collection, round(seconds * 1000, 2), docs))
+
+    def succeeded(self, event):
+        self._finish(event, failed=False)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
+
+
+mongo_listener = MongoCommandListener()
+
+
+class ASGIRequestMetrics:
+    """ASGI middleware recording the request metrics for a route served outside Flask (asgi.py).
+
+    ``rule`` is the Flask-style URL rule, so both servers report the same route label.
+    """
+
+    def __init__(self, app, rule):
+        self.app = app
+        self.rule = rule
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        started = time.perf_counter()
+        response = {"status": 500, "size": 0}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["size"] += len(message.get("body", b""))
+            await send(message)
+
+        IN_FLIGHT.inc((self.rule,), 1)
+        token = _asgi_route.set(self.rule)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _asgi_route.reset(token)
+            IN_FLIGHT.inc((self.rule,), -1)
+            REQUEST_LATENCY.observe((scope["method"], self.rule, response["status"]), time.perf_counter() - started)
+            RESPONSE_SIZE.observe((scope["method"], self.rule), response["size"])
+
+
+def init_app(app):
+    """Install the request timing hooks and the ``/metrics`` endpoint.
+
+    Requests are recorded at teardown, so unhandled exceptions count as 500s.
+    """
+
+    @app.before_request
+    def _start_timer():
+        g.request_started = time.perf_counter()
+        g.mongo_trace = []
+        g.metrics_route = _route()
+        IN_FLIGHT.inc((g.metrics_route,), 1)
+
+    @app.after_request
+    def _response_details(response):
+        if "request_started" in g:
+            g.metrics_status = response.status_code
+            g.metrics_size = response.content_length
+        return response
+
+    @app.teardown_request
+    def _record(exc):
+        if "request_started" not in g:
+            return
+        elapsed = time.perf_counter() - g.request_started
+        route = g.metrics_route
+        IN_FLIGHT.inc((route,), -1)
+        status = 500 if exc is not None else g.get("metrics_status", 500)
+        REQUEST_LATENCY.observe((request.method, route, status), elapsed)
+        if g.get("metrics_size") is not None:
+            RESPONSE_SIZE.observe((request.method, route), g.metrics_size)
+        MONGO_ROUND_TRIPS.observe((route,), len(g.mongo_trace))
+        if SLOW_REQUEST_MS and elapsed * 1000 >= SLOW_REQUEST_MS:
+            logger.warning(
+                f"Slow request {request.method} {request.full_path} took {elapsed * 1000:.1f} ms "
+                f"with {len(g.mongo_trace)} Mongo commands: {g.mongo_trace}")
+
+    @app.route('/metrics')
+    def metrics():
+        if not metrics_allowed(request.remote_addr, request.headers.get("Authorization")):
+            return jsonify({"msg": "Forbidden"}), 403
+        return render(), 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
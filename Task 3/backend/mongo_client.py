@@ -0,0 +1,63 @@
+import os
+import threading
+from pymongo import MongoClient
+
+# Pool settings; unset variables keep PyMongo's defaults.
+_POOL_OPTIONS = {
+    "maxPoolSize": "MONGO_MAX_POOL_SIZE",
+    "minPoolSize": "MONGO_MIN_POOL_SIZE",
+    "maxIdleTimeMS": "MONGO_MAX_IDLE_TIME_MS",
+    "waitQueueTimeoutMS": "MONGO_WAIT_QUEUE_TIMEOUT_MS",
+    "connectTimeoutMS": "MONGO_CONNECT_TIMEOUT_MS",
+    "serverSelectionTimeoutMS": "MONGO_SERVER_SELECTION_TIMEOUT_MS",
+}
+
+
+def pool_options():
+    """Client keyword arguments from the ``MONGO_*`` pool environment variables."""
+    return {option: int(os.environ[env]) for option, env in _POOL_OPTIONS.items() if os.getenv(env)}
+
+
+class ForkSafeMongo:
+    """Stand-in for ``flask_pymongo.PyMongo`` whose client is created per process.
+
+    ``init_app`` only records settings. The ``MongoClient`` (its monitor
+    threads and connection pool) is created on first use in each process, so
+    a client built in a gunicorn ``--preload`` master is never used by the
+    forked workers: a child that sees a different pid builds its own.
+    """
+
+    def __init__(self, app=None, **kwargs):
+        self._uri = None
+        self._kwargs = {}
+        self._pid = None
+        self._client = None
+        self._db = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app, **kwargs)
+
+    def init_app(self, app, **kwargs):
+        self._uri = app.config["MONGO_URI"]
+        self._kwargs = {**pool_options(), **kwargs}
+        app.extensions["mongo"] = self
+
+    def _ensure(self):
+        pid = os.getpid()
+        if self._pid != pid:
+            with self._lock:
+                if self._pid != pid:
+                    # An inherited client is abandoned, not closed: its sockets belong to the parent.
+                    self._client = MongoClient(self._uri, **self._kwargs)
+                    self._db = self._client.get_default_database()
+                    self._pid = pid
+
+    @property
+    def cx(self):
+        self._ensure()
+        return self._client
+
+    @property
+    def db(self):
+        self._ensure()
+        return self._db
@@ -0,0 +1,192 @@
+import base64
+import datetime
+import os
+from flask import jsonify, request
+from bson import json_util
+from bson.objectid import ObjectId
+from pymongo import ASCENDING, DESCENDING
+from json_provider import stream_json_array
+
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "200"))
+
+
+class PaginationError(ValueError):
+    """Raised when list query arguments (limit, cursor, sort, dates) are invalid."""
+
+
+class Page:
+    """One page of documents plus the opaque cursor for the next one."""
+
+    def __init__(self, items, next_cursor, fields, paginated):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.fields = fields
+        self.paginated = paginated
+
+
+def encode_cursor(sort_value, object_id):
+    """Pack the last (sort value, _id) pair of a page into an opaque token.
+
+    A missing or null sort value is stored as an explicit null, which
+    ``after_cursor`` orders before every other value, as MongoDB does.
+    """
+    raw = json_util.dumps({"v": sort_value, "id": object_id})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json_util.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        return data["v"], data["id"]
+    except Exception:
+        raise PaginationError("Invalid cursor")
+
+
+def _parse_date(value, name):
+    try:
+        parsed = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        raise PaginationError(f"Invalid '{name}' date, expected ISO format")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed
+
+
+def _date_bounds(date_field, args):
+    """Build the range filter for ?from=/&to= on either a date field or _id."""
+    bounds = {}
+    for arg, op in (("from", "$gte"), ("to", "$lt")):
+        if args.get(arg):
+            when = _parse_date(args[arg], arg)
+            bounds[op] = ObjectId.from_datetime(when) if date_field == "_id" else when
+    return {date_field: bounds} if bounds else {}
+
+
+def _parse_sort(value, sort_fields, default_sort):
+    key = value or default_sort
+    direction = DESCENDING if key.startswith("-") else ASCENDING
+    field = key.lstrip("-")
+    if field not in sort_fields:
+        raise PaginationError(f"Unsupported sort key '{field}', expected one of: {', '.join(sort_fields)}")
+    return field, direction
+
+
+def parse_limit(value):
+    if value is None:
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(value)
+    except ValueError:
+        raise PaginationError("'limit' must be an integer")
+    if limit < 1:
+        raise PaginationError("'limit' must be positive")
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def after_cursor(field, direction, cursor):
+    """Keyset condition selecting documents strictly after the cursor position.
+
+    Documents are ordered on ``(field, _id)`` with null or missing values first,
+    matching MongoDB's sort; ``{field: None}`` matches both.
+    """
+    last_value, last_id = decode_cursor(cursor)
+    op = "$gt" if direction == ASCENDING else "$lt"
+    if field == "_id":
+        return {"_id": {op: last_id}}
+    same_value = {field: last_value, "_id": {op: last_id}}
+    if last_value is None:
+        if direction == DESCENDING:
+            return same_value  # Nulls come last, so only the remaining nulls follow.
+        return {"$or": [{field: {"$ne": None}}, same_value]}
+    after = [{field: {op: last_value}}, same_value]
+    if direction == DESCENDING:
+        after.append({field: None})
+    return {"$or": after}
+
+
+def build_projection(fields, field_map, sort_field, base_projection=None):
+    """Translate requested output fields into a Mongo projection."""
+    if not fields:
+        return base_projection
+    projection = {field_map.get(f, f): 1 for f in fields}
+    projection[sort_field] = 1
+    if base_projection:
+        # Inclusion projections cannot carry exclusions; just drop the hidden fields.
+        for hidden, flag in base_projection.items():
+            if not flag:
+                projection.pop(hidden, None)
+    return projection
+
+
+def list_filters(args, base_query, filter_fields, field_map, date_field):
+    """Combine ``base_query`` with the ``filter_fields`` and ``from``/``to`` query arguments."""
+    query = dict(base_query)
+    for name in filter_fields:
+        if args.get(name):
+            values = [v for v in args[name].split(",") if v]
+            query[field_map.get(name, name)] = {"$in": values}
+    query.update(_date_bounds(date_field, args))
+    return query
+
+
+def paginated_find(collection, base_query, *, sort_fields, default_sort, date_field,
+                   field_map=None, projection=None, filter_fields=("status",)):
+    """Run a filtered, projected, cursor-paginated find driven by request.args.
+
+    Supported query arguments: ``limit``, ``cursor``, ``sort`` (prefix ``-`` for
+    descending), ``from``/``to`` (ISO dates), ``fields`` (comma separated output
+    keys) and any of ``filter_fields`` (comma separated values match with $in).
+    Requests without ``limit`` or ``cursor`` keep the legacy unbounded listing.
+    """
+    args = request.args
+    paginated = "limit" in args or "cursor" in args
+    field_map = field_map or {}
+
+    query = list_filters(args, base_query, filter_fields, field_map, date_field)
+
+    sort_field, direction = _parse_sort(args.get("sort"), sort_fields, default_sort)
+    sort_field = field_map.get(sort_field, sort_field)
+    if args.get("cursor"):
+        query = {"$and": [query, after_cursor(sort_field, direction, args["cursor"])]}
+
+    fields = [f for f in args.get("fields", "").split(",") if f]
+    cursor = collection.find(query, build_projection(fields, field_map, sort_field, projection))
+    cursor = cursor.sort([(sort_field, direction), ("_id", direction)])
+
+    if not paginated:
+        # Left unmaterialized so page_response can stream it.
+        return Page(cursor, None, fields, False)
+
+    limit = parse_limit(args.get("limit"))
+    # Fetch one extra document to learn whether another page exists.
+    docs = list(cursor.limit(limit + 1))
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        last = docs[-1]
+        next_cursor = encode_cursor(last.get(sort_field), last["_id"])
+    return Page(docs, next_cursor, fields, True)
+
+
+def select_fields(item, fields, always=("id", "_id")):
+    """Trim a formatted item down to the requested output fields."""
+    if not fields:
+        return item
+    return {k: v for k, v in item.items() if k in fields or k in always}
+
+
+def page_response(page, formatter):
+    """JSON response for a page; legacy unbounded listings are streamed from the cursor."""
+    if page.paginated:
+        return jsonify(page_payload(page, formatter))
+    return stream_json_array(page.items, lambda doc: select_fields(formatter(doc), page.fields))
+
+
+def page_payload(page, formatter):
+    """Format a page into the JSON body: a bare list (legacy) or an envelope."""
+    items = [select_fields(formatter(doc), page.fields) for doc in page.items]
+    if not page.paginated:
+        return items
+    return {"items": items, "next_cursor": page.next_cursor}
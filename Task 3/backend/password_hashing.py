@@ -0,0 +1,85 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from werkzeug.security import generate_password_hash, check_password_hash
+from logger import logger
+
+# Werkzeug method string, e.g. "scrypt:32768:8:1" or "pbkdf2:sha256:600000".
+PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", "2"))
+HASH_QUEUE_LIMIT = int(os.getenv("HASH_QUEUE_LIMIT", "16"))
+HASH_TIMEOUT = float(os.getenv("HASH_TIMEOUT", "10"))
+HASH_RETRY_AFTER = int(os.getenv("HASH_RETRY_AFTER", "1"))
+
+
+class HashingBusy(Exception):
+    """Raised when the hashing queue is full or a job outlives ``HASH_TIMEOUT``; callers answer 429 with Retry-After."""
+
+    retry_after = HASH_RETRY_AFTER
+
+
+class HashingPool:
+    """Runs password KDFs on a small dedicated pool with bounded admission.
+
+    hashlib's scrypt/pbkdf2 release the GIL, so at most ``workers`` cores per
+    process go to hashing while other request threads keep running. At most
+    ``queue_limit`` jobs may be running or waiting; beyond that new work is
+    rejected immediately instead of piling up behind a login burst. A job
+    keeps its slot until it actually finishes, even if its caller gave up.
+    """
+
+    def __init__(self, workers, queue_limit):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._slots = threading.BoundedSemaphore(queue_limit)
+        self.rejected = 0
+        self.timed_out = 0
+
+    def submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise HashingBusy()
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, fn, *args):
+        future = self.submit(fn, *args)
+        try:
+            return future.result(timeout=HASH_TIMEOUT)
+        except FutureTimeout:
+            # A job still queued is dropped (freeing its slot); a running one finishes on its own.
+            future.cancel()
+            self.timed_out += 1
+            raise HashingBusy()
+
+
+pool = HashingPool(HASH_WORKERS, HASH_QUEUE_LIMIT)
+
+
+def hash_password(password):
+    return pool.run(generate_password_hash, password, PASSWORD_HASH_METHOD)
+
+
+def verify_password(password_hash, password):
+    return pool.run(check_password_hash, password_hash or "", password)
+
+
+def needs_rehash(password_hash):
+    """True when the stored hash was made with a different method or cost."""
+    return bool(password_hash) and password_hash.split("$", 1)[0] != PASSWORD_HASH_METHOD
+
+
+def rehash_in_background(collection, doc_id, password):
+    """Upgrade a stored hash after a successful login without delaying the response."""
+    def upgrade():
+        collection.update_one({"_id": doc_id}, {"$set": {
+            "password_hash": generate_password_hash(password, PASSWORD_HASH_METHOD)}})
+
+    def report(future):
+        if future.exception():
+            logger.error(f"Password rehash failed for {doc_id}: {future.exception()}")
+
+    try:
+        pool.submit(upgrade).add_done_callback(report)
+    except HashingBusy:
+        pass  # Try again on the next login.
@@ -0,0 +1,107 @@
+import datetime
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from utils import get_random_quote
+
+# One document per (user, module): the set of completed task ids plus the
+# derived counts, so progress bars and mentor advice read a single document.
+PROGRESS_FIELDS = {"module_id": 1, "completed": 1, "completed_count": 1, "total_tasks": 1,
+                   "percent": 1, "updated_at": 1}
+
+
+def format_task(task, completed):
+    return {"id": task["_id"], "title": task.get("title"), "description": task.get("description"),
+            "completed": task["_id"] in completed}
+
+
+def format_progress(progress):
+    if not progress:
+        return None
+    return {
+        "moduleId": progress["module_id"],
+        "completedTasks": progress.get("completed", []),
+        "completed": progress.get("completed_count", 0),
+        "total": progress.get("total_tasks", 0),
+        "percent": progress.get("percent", 0),
+        "updatedAt": progress.get("updated_at"),
+    }
+
+
+def module_tasks(db, user_id, module_id):
+    """``{"tasks", "progress"}`` for a module, tasks flagged with this user's completions; None if unknown.
+
+    Two indexed reads: the tasks by ``module_id`` and the user's progress document.
+    """
+    tasks = list(db.tasks.find({"module_id": module_id}, {"title": 1, "description": 1}).sort("_id", 1))
+    if not tasks and not db.modules.find_one({"_id": module_id}, {"_id": 1}):
+        return None
+    progress = db.progress.find_one({"user_id": user_id, "module_id": module_id}, PROGRESS_FIELDS)
+    if not progress:
+        progress = {"module_id": module_id, "total_tasks": len(tasks)}
+    completed = set(progress.get("completed", []))
+    return {"tasks": [format_task(task, completed) for task in tasks], "progress": format_progress(progress)}
+
+
+def module_total(db, module_id):
+    """Number of tasks in a module, kept on the module document and counted only when missing.
+
+    Whoever adds or removes a module's tasks must ``$unset`` its ``total_tasks`` so it is recounted.
+    """
+    module = db.modules.find_one({"_id": module_id}, {"total_tasks": 1})
+    if module and "total_tasks" in module:
+        return module["total_tasks"]
+    total = db.tasks.count_documents({"module_id": module_id})
+    if module:
+        db.modules.update_one({"_id": module_id, "total_tasks": {"$exists": False}}, {"$set": {"total_tasks": total}})
+    return total
+
+
+def _completion_update(task_id, total, now):
+    """Pipeline update adding ``task_id`` to the set and recomputing the counts in the same write."""
+    completed = {"$setUnion": [{"$ifNull": ["$completed", []]}, [task_id]]}
+    return [
+        {"$set": {"completed": completed}},
+        {"$set": {
+            "completed_count": {"$size": "$completed"},
+            "total_tasks": total,
+            "percent": {"$round": [{"$multiply": [{"$divide": [{"$size": "$completed"}, max(total, 1)]}, 100]}, 1]},
+            "updated_at": now,
+        }},
+    ]
+
+
+def complete_task(db, user_id, task_id):
+    """Mark a task complete for the user and return the module's updated progress, or None.
+
+    Completing the same task twice is a no-op. The progress document is
+    created on the first completion; concurrent first completions race on the
+    unique ``(user_id, module_id)`` index and the loser retries as an update.
+    """
+    task = db.tasks.find_one({"_id": task_id}, {"module_id": 1})
+    if not task:
+        return None
+    module_id = task["module_id"]
+    total = module_total(db, module_id)
+    update = _completion_update(task_id, total, datetime.datetime.now(datetime.timezone.utc))
+    for attempt in range(2):
+        try:
+            return db.progress.find_one_and_update(
+                {"user_id": user_id, "module_id": module_id}, update, projection=PROGRESS_FIELDS,
+                upsert=True, return_document=ReturnDocument.AFTER)
+        except DuplicateKeyError:
+            if attempt:
+                raise
+
+
+def mentor_advice(db, user_id):
+    """Advice based on the user's most recently active module: one read on ``(user_id, updated_at)``."""
+    progress = db.progress.find_one({"user_id": user_id}, PROGRESS_FIELDS, sort=[("updated_at", -1)])
+    quote = get_random_quote()
+    if not progress:
+        return {"advice": f"Pick a module and complete its first task. {quote}", "progress": None}
+    done, total = progress.get("completed_count", 0), progress.get("total_tasks", 0)
+    if total and done >= total:
+        advice = f"You've finished all {total} tasks in this module. Time to submit your work! {quote}"
+    else:
+        advice = f"You've completed {done} of {total} tasks ({progress.get('percent', 0)}%). {quote}"
+    return {"advice": advice, "progress": format_progress(progress)}
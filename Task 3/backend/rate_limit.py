@@ -0,0 +1,321 @@
+import datetime
+import os
+import threading
+import time
+from collections import OrderedDict
+from flask import g, jsonify, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, PyMongoError
+import metrics
+from logger import logger
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+# "memory": per-process buckets (default). "mongo": buckets shared by every worker.
+RATE_LIMIT_STORE = os.getenv("RATE_LIMIT_STORE", "memory")
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+# Request threads per worker (gunicorn.conf.py); the shedding defaults are derived from it.
+WORKER_THREADS = int(os.getenv("GUNICORN_THREADS", "8"))
+# Per process; unset means derived from the thread count (see shedding_limits), 0 disables.
+SHED_MAX_IN_FLIGHT = os.getenv("SHED_MAX_IN_FLIGHT")
+SHED_MAX_UPLOAD_BYTES = os.getenv("SHED_MAX_UPLOAD_BYTES")
+# Shed requests that waited longer than this in front of the app, measured from the
+# proxy's X-Request-Start header (nginx: proxy_set_header X-Request-Start "t=${msec}").
+SHED_MAX_QUEUE_MS = float(os.getenv("SHED_MAX_QUEUE_MS", "0"))
+SHED_RETRY_AFTER = int(os.getenv("SHED_RETRY_AFTER", "2"))
+# Number of proxies in front of the app whose X-Forwarded-For can be trusted. The default
+# matches Render's single load balancer; without it every client shares the proxy's
+# address and so one IP budget. Set 0 when clients connect directly, or they can pick
+# their own address (and budget) by sending X-Forwarded-For.
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "1"))
+
+# Budgets as "requests/seconds" per client (JWT identity, else IP), keyed by URL rule.
+# Routes without an entry share the "default" bucket.
+DEFAULT_BUDGETS = {
+    "default": "300/60",
+    "/auth/login": "10/60",
+    "/auth/admin-login": "10/60",
+    "/auth/register": "5/300",
+    "/api/apply_internship": "20/3600",
+    "/api/apply_project/<project_id>": "20/3600",
+    "/api/my_applications/events": "30/60",
+    "/api/search/suggest": "600/60",
+}
+# Never limited or shed: health check and scrapes.
+EXEMPT_RULES = {"/", "/metrics"}
+# Long-lived streams served on the event loop (asgi.py) hold no thread and have their own caps.
+STREAMING_RULES = {"/api/my_applications/events"}
+
+ADMISSIONS = metrics.Counter("http_admission_total", "Requests admitted, rate limited or shed.",
+                             ("route", "result"))
+
+
+def parse_budget(spec):
+    """``"10/60"`` -> ``(10, 60.0)``: a bucket of 10 refilled over 60 seconds; ``"off"`` -> None."""
+    if spec in ("off", "0", ""):
+        return None
+    count, _, seconds = spec.partition("/")
+    return int(count), float(seconds or 1)
+
+
+def parse_budgets(spec):
+    """Parse ``"/auth/login=5/60,default=600/60"`` on top of the defaults."""
+    budgets = dict(DEFAULT_BUDGETS)
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        rule, _, budget = item.rpartition("=")
+        budgets[rule.strip()] = budget.strip()
+    return {rule: parse_budget(budget) for rule, budget in budgets.items()}
+
+
+BUDGETS = parse_budgets(os.getenv("RATE_LIMITS", ""))
+
+
+class MemoryStore:
+    """Token buckets in this process, least recently used evicted beyond ``max_keys``."""
+
+    def __init__(self, max_keys=RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, period):
+        """Spend one token; returns ``(allowed, retry_after_seconds)``."""
+        now = time.monotonic()
+        rate = capacity / period
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, 0 if allowed else (1 - tokens) / rate
+
+
+class MongoStore:
+    """Token buckets in the ``rate_limits`` collection, shared by all workers and hosts.
+
+    Each check is one atomic pipeline update on the bucket's ``_id``; idle
+    buckets are removed by the TTL index on ``expires_at``.
+    """
+
+    def __init__(self, mongo, collection="rate_limits"):
+        self.mongo = mongo
+        self.collection = collection
+
+    def take(self, key, capacity, period):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        rate_per_ms = capacity / period / 1000
+        refilled = {"$min": [capacity, {"$add": [
+            {"$ifNull": ["$tokens", capacity]},
+            {"$multiply": [{"$subtract": [now, {"$ifNull": ["$updated", now]}]}, rate_per_ms]},
+        ]}]}
+        update = [
+            {"$set": {"tokens": refilled}},
+            {"$set": {"allowed": {"$gte": ["$tokens", 1]}}},
+            {"$set": {
+                "tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", 1]}, "$tokens"]},
+                "updated": now,
+                "expires_at": now + datetime.timedelta(seconds=period),
+            }},
+        ]
+        collection = self.mongo.db[self.collection]
+        for attempt in range(2):
+            try:
+                bucket = collection.find_one_and_update(
+                    {"_id": key}, update, upsert=True, return_document=ReturnDocument.AFTER)
+                break
+            except DuplicateKeyError:
+                # Two first requests raced on the upsert; the second one is now an update.
+                if attempt:
+                    raise
+        if bucket["allowed"]:
+            return True, 0
+        return False, (1 - bucket["tokens"]) / (rate_per_ms * 1000)
+
+
+def shedding_limits(threads, max_content_length):
+    """Default ``(max_in_flight, max_upload_bytes)`` for a worker with ``threads`` request threads.
+
+    A threaded WSGI worker never has more than ``threads`` requests inside
+    the app; the rest wait, uncounted, in the server's queue. So the in-flight
+    limit keeps one thread free to turn requests away at once, and uploads
+    may occupy at most half the threads with maximum-size bodies.
+    """
+    in_flight = max(1, threads - 1) if SHED_MAX_IN_FLIGHT is None else int(SHED_MAX_IN_FLIGHT)
+    if SHED_MAX_UPLOAD_BYTES is not None:
+        return in_flight, int(SHED_MAX_UPLOAD_BYTES)
+    return in_flight, max(1, threads // 2) * (max_content_length or 0)
+
+
+def queue_wait_ms(header, now=None):
+    """Milliseconds since the proxy received the request, from ``X-Request-Start``; None if absent.
+
+    Accepts ``t=<seconds>`` (nginx ``$msec``), milliseconds or microseconds since the epoch.
+    """
+    if not header:
+        return None
+    try:
+        started = float(header.strip().removeprefix("t="))
+    except ValueError:
+        return None
+    if started > 1e14:
+        started /= 1e6
+    elif started > 1e11:
+        started /= 1e3
+    return ((now or time.time()) - started) * 1000
+
+
+class AdmissionControl:
+    """Rate limiting per client and route, then load shedding per process.
+
+    Rate limits protect the service from one client; shedding protects every
+    client from overload: when too many requests (or too many upload bytes)
+    are already being handled, new ones get 503 with ``Retry-After`` straight
+    away instead of queueing behind the work in progress.
+    """
+
+    def __init__(self, name, budgets, store, max_in_flight, max_upload_bytes):
+        self.name = name
+        self.budgets = budgets
+        self.store = store
+        self.max_in_flight = max_in_flight
+        self.max_upload_bytes = max_upload_bytes
+        self.in_flight = 0
+        self.upload_bytes = 0
+        self.store_errors = 0
+        self._lock = threading.Lock()
+
+    def check_rate(self, rule, client):
+        """Seconds to wait before retrying, or None when the request is within budget."""
+        name = rule if rule in self.budgets else "default"
+        budget = self.budgets.get(name)
+        if budget is None:
+            return None
+        try:
+            allowed, retry_after = self.store.take(f"{name}|{client}", *budget)
+        except PyMongoError as e:
+            # Fail open: an unreachable shared store must not take the API down with it.
+            self.store_errors += 1
+            logger.warning(f"Rate limit store unavailable, admitting request: {e}")
+            return None
+        return None if allowed else max(1, int(retry_after + 0.999))
+
+    def enter(self, upload_bytes=0):
+        """Reserve capacity for a request; False when it should be shed."""
+        with self._lock:
+            if self.max_in_flight and self.in_flight >= self.max_in_flight:
+                return False
+            if upload_bytes and self.max_upload_bytes and self.upload_bytes + upload_bytes > self.max_upload_bytes:
+                return False
+            self.in_flight += 1
+            self.upload_bytes += upload_bytes
+            return True
+
+    def leave(self, upload_bytes=0):
+        with self._lock:
+            self.in_flight -= 1
+            self.upload_bytes -= upload_bytes
+
+    def stats(self):
+        return {"in_flight": self.in_flight, "upload_bytes": self.upload_bytes, "store_errors": self.store_errors}
+
+
+# Thread-bound Flask requests. Limits are set by init_app once the body size limit is known.
+admission = AdmissionControl("wsgi", BUDGETS, MemoryStore(), 0, 0)
+
+
+def admission_metrics():
+    lines = ADMISSIONS.render()
+    for name, key, kind in (("admission_in_flight", "in_flight", "gauge"),
+                            ("admission_upload_bytes", "upload_bytes", "gauge"),
+                            ("rate_limit_store_errors_total", "store_errors", "counter")):
+        lines.append(f"# TYPE {name} {kind}")
+        lines += [f'{name}{{pool="{control.name}"}} {control.stats()[key]}' for control in controls]
+    return lines
+
+
+controls = [admission]
+metrics.register_collector(admission_metrics)
+
+
+def too_many_requests(retry_after):
+    return jsonify({"msg": "Too many requests, retry shortly"}), 429, {"Retry-After": str(retry_after)}
+
+
+def overloaded():
+    return jsonify({"msg": "Server is busy, retry shortly"}), 503, {"Retry-After": str(SHED_RETRY_AFTER)}
+
+
+def _client_key():
+    """JWT identity when the request carries a valid token, else the client IP."""
+    if request.headers.get("Authorization"):
+        try:
+            verify_jwt_in_request(optional=True)
+            identity = get_jwt_identity()
+            if identity:
+                return f"user:{identity}"
+        except Exception:
+            pass  # Invalid or expired tokens are rejected by the route itself; limit by IP.
+    return f"ip:{request.remote_addr}"
+
+
+def forwarded_ip(remote_addr, forwarded_for, hops=None):
+    """The client address as seen by the outermost trusted proxy, like ProxyFix(x_for=hops)."""
+    hops = TRUSTED_PROXY_HOPS if hops is None else hops
+    values = [v.strip() for v in (forwarded_for or "").split(",") if v.strip()]
+    if hops and len(values) >= hops:
+        return values[-hops]
+    return remote_addr
+
+
+def upload_size(content_type, content_length, max_content_length):
+    """Bytes an upload will stream in; unknown lengths count as the largest accepted body."""
+    if not (content_type or "").startswith("multipart/form-data"):
+        return 0
+    return content_length if content_length is not None else max_content_length
+
+
+def init_app(app, mongo=None, threads=WORKER_THREADS):
+    """Check every request against its budget, then against the shedding thresholds."""
+    admission.max_in_flight, admission.max_upload_bytes = shedding_limits(
+        threads, app.config.get("MAX_CONTENT_LENGTH"))
+    if RATE_LIMIT_STORE == "mongo":
+        admission.store = MongoStore(mongo)
+    elif RATE_LIMIT_STORE != "memory":
+        raise ValueError(f"Unknown rate limit store '{RATE_LIMIT_STORE}'")
+    if TRUSTED_PROXY_HOPS:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXY_HOPS)
+
+    @app.before_request
+    def _admit():
+        rule = request.url_rule.rule if request.url_rule else None
+        if rule is None or rule in EXEMPT_RULES or request.method == "OPTIONS":
+            return None
+        if RATE_LIMIT_ENABLED:
+            retry_after = admission.check_rate(rule, _client_key())
+            if retry_after is not None:
+                ADMISSIONS.inc((rule, "limited"))
+                return too_many_requests(retry_after)
+        waited = queue_wait_ms(request.headers.get("X-Request-Start"))
+        if SHED_MAX_QUEUE_MS and waited is not None and waited > SHED_MAX_QUEUE_MS:
+            ADMISSIONS.inc((rule, "shed"))
+            return overloaded()
+        # Every Flask request holds a thread, streaming responses included, so all of them count.
+        upload_bytes = upload_size(request.content_type, request.content_length,
+                                   app.config.get("MAX_CONTENT_LENGTH"))
+        if not admission.enter(upload_bytes):
+            ADMISSIONS.inc((rule, "shed"))
+            return overloaded()
+        g.admission_upload_bytes = upload_bytes
+        ADMISSIONS.inc((rule, "admitted"))
+        return None
+
+    @app.teardown_request
+    def _release(exc):
+        upload_bytes = g.pop("admission_upload_bytes", None)
+        if upload_bytes is not None:
+            admission.leave(upload_bytes)
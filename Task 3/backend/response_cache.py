@@ -0,0 +1,132 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from flask import jsonify, request, current_app
+
+
+class MemoryBackend:
+    """Per-process LRU with TTL.
+
+    Versions bumped in one gunicorn worker are not seen by the others, so
+    entries also expire after ``ttl`` seconds to bound cross-worker staleness.
+    """
+
+    def __init__(self, max_size=256, ttl=30):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                self._entries.pop(key, None)
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def version(self, namespace):
+        with self._lock:
+            return self._versions.get(namespace, 0)
+
+    def bump(self, namespace):
+        with self._lock:
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+            # Old versions can never be read again; free them eagerly.
+            prefix = f"{namespace}:"
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+
+class RedisBackend:
+    """Shared cache for all workers; versions are Redis counters, so a bump is global."""
+
+    def __init__(self, url, ttl=300, prefix="owl:cache:"):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value):
+        self.client.set(self.prefix + key, value, ex=self.ttl)
+
+    def version(self, namespace):
+        return int(self.client.get(f"{self.prefix}version:{namespace}") or 0)
+
+    def bump(self, namespace):
+        self.client.incr(f"{self.prefix}version:{namespace}")
+
+
+class ResponseCache:
+    """Caches serialized JSON GET responses per collection version."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    def cached_json(self, namespace, build):
+        """Return ``build()`` as a JSON response, served from cache while ``namespace`` is unchanged.
+
+        ``build`` returns either a payload or ``(payload, status)``; only 200
+        responses are cached. Responses carry a strong ETag and answer
+        ``If-None-Match`` with 304.
+        """
+        if self.backend is None:
+            return build()
+        key = f"{namespace}:{self.backend.version(namespace)}:{request.full_path}"
+        body = self.backend.get(key)
+        if body is None:
+            self.misses += 1
+            result = build()
+            if isinstance(result, tuple):
+                return result
+            body = jsonify(result).get_data()
+            self.backend.set(key, body)
+        else:
+            self.hits += 1
+
+        response = current_app.response_class(body, mimetype="application/json")
+        response.set_etag(hashlib.sha1(body).hexdigest())
+        # Catalog reads need a token, so only the browser may cache, and must revalidate.
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+    def invalidate(self, namespace):
+        if self.backend is not None:
+            self.backend.bump(namespace)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses,
+                "backend": type(self.backend).__name__ if self.backend else None}
+
+
+def create_response_cache(kind, redis_url=None):
+    if kind == "off":
+        return ResponseCache(None)
+    if kind == "redis":
+        return ResponseCache(RedisBackend(redis_url, ttl=int(os.getenv("CATALOG_CACHE_TTL", "300"))))
+    if kind != "memory":
+        raise ValueError(f"Unknown response cache backend '{kind}'")
+    return ResponseCache(MemoryBackend(
+        max_size=int(os.getenv("CATALOG_CACHE_SIZE", "256")),
+        ttl=int(os.getenv("CATALOG_CACHE_TTL", "30")),
+    ))
+
+
+catalog_cache = create_response_cache(os.getenv("CATALOG_CACHE", "memory"), os.getenv("REDIS_URL"))
@@ -0,0 +1,474 @@
+import heapq
+import math
+import os
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import Counter, OrderedDict, defaultdict
+from itertools import chain
+from bson.objectid import ObjectId
+from pymongo import ReturnDocument
+from logger import logger
+
+SEARCH_SYNC_INTERVAL = float(os.getenv("SEARCH_SYNC_INTERVAL", "5"))
+# How many vocabulary terms a trailing prefix may expand to.
+PREFIX_EXPANSION = int(os.getenv("SEARCH_PREFIX_EXPANSION", "64"))
+# Cached bitmaps/score groups; each bitmap is at most entries/8 bytes.
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "2048"))
+# Result sets up to this size are scored exhaustively; larger ones use the threshold walk.
+EXACT_RANK_LIMIT = 2000
+# Result sets up to this size count facets from their entries' values; larger ones
+# intersect only the FACET_CANDIDATES most common values of each facet in the catalog.
+FACET_WALK_LIMIT = int(os.getenv("SEARCH_FACET_WALK_LIMIT", "1000"))
+FACET_CANDIDATES = int(os.getenv("SEARCH_FACET_CANDIDATES", "64"))
+# Values returned per facet; matched entries with none of them are counted in ``facetOther``.
+FACET_TOP = 20
+VERSION_ID = "search_catalog"
+
+CATALOGS = {
+    "projects": {"kind": "project", "title": "name"},
+    "internships": {"kind": "internship", "title": "title"},
+}
+FIELD_WEIGHTS = {"title": 3.0, "skills": 2.0, "tech_stack": 1.5, "description": 1.0}
+FACETS = ("kind", "duration", "mode", "skills")
+# Facets whose entry value is a list; the others hold one value or None.
+LIST_FACETS = {"skills"}
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(value):
+    if isinstance(value, (list, tuple)):
+        value = " ".join(str(v) for v in value)
+    return _TOKEN.findall(str(value or "").lower())
+
+
+def _as_list(value):
+    if isinstance(value, (list, tuple)):
+        return list(dict.fromkeys(str(v) for v in value if v))
+    return [value] if value else []
+
+
+def _top_counts(counts):
+    """The ``FACET_TOP`` largest counts, ties broken by value."""
+    return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:FACET_TOP])
+
+
+def _entry(collection, doc):
+    """The summary returned in results, plus its facet values."""
+    spec = CATALOGS[collection]
+    return {
+        "kind": spec["kind"],
+        "id": doc.get("id") or str(doc["_id"]),
+        "title": doc.get(spec["title"]),
+        "icon": doc.get("icon"),
+        "duration": doc.get("duration"),
+        "mode": doc.get("mode"),
+        "skills": _as_list(doc.get("skills")),
+    }
+
+
+def _weighted_terms(collection, doc):
+    spec = CATALOGS[collection]
+    weights = defaultdict(float)
+    for field, weight in FIELD_WEIGHTS.items():
+        source = spec["title"] if field == "title" else field
+        for term in tokenize(doc.get(source)):
+            weights[term] += weight
+    return weights
+
+
+def _iter_bits(bitmap):
+    """Yield the set bit positions of ``bitmap`` in ascending order."""
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    for index, byte in enumerate(data):
+        while byte:
+            low = byte & -byte
+            yield index * 8 + low.bit_length() - 1
+            byte ^= low
+
+
+class CatalogIndex:
+    """In-process inverted index over projects and internships.
+
+    Every entry gets a small integer ordinal. Postings map each term to
+    ``{ordinal: field-weighted frequency}``; a sorted vocabulary gives prefix
+    expansion for search-as-you-type and autocomplete. At query time the
+    postings a query touches are turned into Python-int bitmaps (cached until
+    the next write), so intersections, facet filters and facet counts are a
+    handful of big-int ANDs and popcounts regardless of how many entries
+    match. Ranking scores small result sets exhaustively and large ones with
+    a threshold walk down impact-ordered postings, which stops after the top
+    few hundred candidates.
+
+    Admin writes in this process update the index in place; other workers
+    notice the bumped version in ``counters`` within ``SEARCH_SYNC_INTERVAL``
+    seconds and rebuild in the background while the old index keeps serving.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._keys = []
+        self._free = []
+        self._ordinals = {}
+        self._entries = {}
+        self._terms = {}
+        self._postings = defaultdict(dict)
+        self._title_postings = defaultdict(set)
+        self._facet_postings = defaultdict(set)
+        self._vocab = []
+        self._title_vocab = []
+        self._cache = OrderedDict()
+        self.version = None
+        self._checked = 0.0
+        self._rebuilding = False
+
+    # --- writes -------------------------------------------------------------
+    def _add(self, collection, doc):
+        entry = _entry(collection, doc)
+        key = (entry["kind"], entry["id"])
+        self._remove(key)
+        if self._free:
+            ordinal = self._free.pop()
+            self._keys[ordinal] = key
+        else:
+            ordinal = len(self._keys)
+            self._keys.append(key)
+        self._ordinals[key] = ordinal
+        self._entries[key] = entry
+        terms = _weighted_terms(collection, doc)
+        self._terms[key] = terms
+        for term, weight in terms.items():
+            if term not in self._postings:
+                insort(self._vocab, term)
+            self._postings[term][ordinal] = weight
+        for term in set(tokenize(entry["title"])):
+            if term not in self._title_postings:
+                insort(self._title_vocab, term)
+            self._title_postings[term].add(ordinal)
+        for name in FACETS:
+            for value in _as_list(entry[name]):
+                self._facet_postings[(name, value)].add(ordinal)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        ordinal = self._ordinals.pop(key)
+        self._keys[ordinal] = None
+        self._free.append(ordinal)
+        for term in self._terms.pop(key):
+            postings = self._postings[term]
+            postings.pop(ordinal, None)
+            if not postings:
+                del self._postings[term]
+                del self._vocab[bisect_left(self._vocab, term)]
+        for term in set(tokenize(entry["title"])):
+            ordinals = self._title_postings[term]
+            ordinals.discard(ordinal)
+            if not ordinals:
+                del self._title_postings[term]
+                del self._title_vocab[bisect_left(self._title_vocab, term)]
+        for name in FACETS:
+            for value in _as_list(entry[name]):
+                ordinals = self._facet_postings[(name, value)]
+                ordinals.discard(ordinal)
+                if not ordinals:
+                    del self._facet_postings[(name, value)]
+
+    def add_documents(self, collection, docs):
+        with self._lock:
+            for doc in docs:
+                self._add(collection, doc)
+            self._cache.clear()
+
+    def build(self, db):
+        """Replace the whole index from Mongo."""
+        fresh = CatalogIndex()
+        version = self._shared_version(db)
+        for collection in CATALOGS:
+            fresh.add_documents(collection, db[collection].find({}, {"how_to_do": 0, "how_to_submit": 0, "features": 0}))
+        with self._lock:
+            for name in ("_keys", "_free", "_ordinals", "_entries", "_terms", "_postings",
+                         "_title_postings", "_facet_postings", "_vocab", "_title_vocab", "_cache"):
+                setattr(self, name, getattr(fresh, name))
+            self.version = version
+            self._checked = time.monotonic()
+        logger.info(f"Search index built: {len(self._entries)} catalog entries, {len(self._vocab)} terms")
+
+    def record_write(self, db, collection, *catalog_ids):
+        """Re-index catalog entries after an admin write and publish the change to other workers.
+
+        A PUT that renames an entry passes both its old and new ``id``: the old
+        key is removed and the document is indexed under the new one.
+        """
+        kind = CATALOGS[collection]["kind"]
+        for catalog_id in dict.fromkeys(str(i) for i in catalog_ids if i is not None):
+            doc = db[collection].find_one({"id": catalog_id})
+            if doc is None and ObjectId.is_valid(catalog_id):
+                doc = db[collection].find_one({"_id": ObjectId(catalog_id)})
+            with self._lock:
+                if doc is None:
+                    self._remove((kind, catalog_id))
+                else:
+                    self._add(collection, doc)
+        with self._lock:
+            self._cache.clear()
+        new_version = db.counters.find_one_and_update(
+            {"_id": VERSION_ID}, {"$inc": {"version": 1}},
+            upsert=True, return_document=ReturnDocument.AFTER)["version"]
+        with self._lock:
+            if self.version is not None and new_version == self.version + 1:
+                self.version = new_version
+            else:
+                # Another worker wrote concurrently; pick up its change too.
+                self._checked = 0.0
+
+    # --- freshness ----------------------------------------------------------
+    @staticmethod
+    def _shared_version(db):
+        doc = db.counters.find_one({"_id": VERSION_ID})
+        return doc["version"] if doc else 0
+
+    def ensure_fresh(self, db):
+        """Build on first use; afterwards poll the shared version at most every ``SEARCH_SYNC_INTERVAL``."""
+        if self.version is None:
+            with self._lock:
+                if self.version is None:
+                    self.build(db)
+            return
+        now = time.monotonic()
+        if now - self._checked < SEARCH_SYNC_INTERVAL or self._rebuilding:
+            return
+        self._checked = now
+        if self._shared_version(db) == self.version:
+            return
+        self._rebuilding = True
+
+        def rebuild():
+            try:
+                self.build(db)
+            except Exception as e:
+                logger.error(f"Search index rebuild failed: {e}")
+            finally:
+                self._rebuilding = False
+
+        threading.Thread(target=rebuild, name="search-rebuild", daemon=True).start()
+
+    # --- cached query building blocks ---------------------------------------
+    def _cached(self, key, compute):
+        value = self._cache.get(key)
+        if value is None:
+            value = compute()
+            self._cache[key] = value
+            if len(self._cache) > SEARCH_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        return value
+
+    def _bitmap(self, ordinals):
+        buffer = bytearray((len(self._keys) + 7) // 8)
+        for ordinal in ordinals:
+            buffer[ordinal >> 3] |= 1 << (ordinal & 7)
+        return int.from_bytes(buffer, "little")
+
+    def _bytes(self, bitmap):
+        """Bitmap as bytes, for O(1) membership tests on many ordinals."""
+        return bitmap.to_bytes((len(self._keys) + 7) // 8, "little")
+
+    def _expand(self, vocab, prefix):
+        start = bisect_left(vocab, prefix)
+        terms = []
+        for term in vocab[start:start + PREFIX_EXPANSION]:
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+        return terms
+
+    def _group(self, term, prefix):
+        """``{ordinal: contribution}`` for one query word, its bitmap and impact order.
+
+        ``prefix`` sums every vocabulary term starting with ``term``.
+        """
+        def compute():
+            n = len(self._entries) or 1
+            scores = defaultdict(float)
+            for candidate in (self._expand(self._vocab, term) if prefix else [term]):
+                postings = self._postings.get(candidate, {})
+                idf = math.log(1 + n / (len(postings) or 1))
+                for ordinal, weight in postings.items():
+                    scores[ordinal] += weight * idf
+            return {"scores": scores, "bitmap": self._bitmap(scores), "impact": None}
+        return self._cached(("group", term, prefix), compute)
+
+    def _facet_bitmap(self, name, values):
+        return self._cached(("facet", name, tuple(sorted(values))), lambda: self._bitmap(
+            set().union(*(self._facet_postings.get((name, v), ()) for v in values))))
+
+    def _all_bitmap(self):
+        return self._cached(("all",), lambda: self._bitmap(self._ordinals.values()))
+
+    def _ranked_facet_values(self):
+        """Each facet's values, most common in the whole catalog first."""
+        def compute():
+            ranked = defaultdict(list)
+            for (name, value), ordinals in self._facet_postings.items():
+                ranked[name].append((-len(ordinals), value))
+            return {name: [value for _, value in sorted(pairs)] for name, pairs in ranked.items()}
+        return self._cached(("facet_ranked",), compute)
+
+    def _facet_any_bitmap(self, name):
+        """Entries having any value for facet ``name``."""
+        return self._cached(("facet_any", name), lambda: self._bitmap(
+            set().union(*(ordinals for (facet, _), ordinals in self._facet_postings.items() if facet == name))))
+
+    def _walk_facets(self, matched):
+        """Exact counts from the matched entries' stored values: O(matched), whatever the cardinality."""
+        entries = [self._entries[self._keys[ordinal]] for ordinal in _iter_bits(matched)]
+        facets, other = {}, {}
+        for name in FACETS:
+            column = [entry[name] for entry in entries if entry[name]]
+            if name in LIST_FACETS:
+                counts = Counter(chain.from_iterable(column))
+                top = _top_counts(counts)
+                other[name] = sum(1 for values in column if top.keys().isdisjoint(values))
+            else:
+                counts = Counter(column)
+                top = _top_counts(counts)
+                other[name] = len(column) - sum(top.values())
+            facets[name] = top
+        return facets, other
+
+    def _intersect_facets(self, matched):
+        """Counts for each facet's most common catalog values only; cost independent of cardinality."""
+        facets, other = {}, {}
+        ranked = self._ranked_facet_values()
+        for name in FACETS:
+            counts = {}
+            for value in ranked.get(name, [])[:FACET_CANDIDATES]:
+                count = (matched & self._facet_bitmap(name, [value])).bit_count()
+                if count:
+                    counts[value] = count
+            top = _top_counts(counts)
+            listed = 0
+            for value in top:
+                listed |= self._facet_bitmap(name, [value])
+            facets[name] = top
+            other[name] = (matched & self._facet_any_bitmap(name) & ~listed).bit_count()
+        return facets, other
+
+    # --- reads --------------------------------------------------------------
+    def _rank(self, groups, matched, total, k):
+        """Top ``k`` (score, ordinal) pairs among ``matched``; ties keep catalog order."""
+        if not groups:
+            top = []
+            for ordinal in _iter_bits(matched):
+                top.append((0.0, ordinal))
+                if len(top) >= k:
+                    break
+            return top
+        score_maps = [g["scores"] for g in groups]
+        if total <= EXACT_RANK_LIMIT:
+            scored = ((sum(s[o] for s in score_maps), o) for o in _iter_bits(matched))
+            return heapq.nsmallest(k, scored, key=lambda hit: (-hit[0], hit[1]))
+
+        # Threshold algorithm: walk each word's postings in descending contribution;
+        # once k hits beat the best score any unseen entry could still reach, stop.
+        impacts = []
+        for group in groups:
+            if group["impact"] is None:
+                group["impact"] = sorted(group["scores"].items(), key=lambda item: -item[1])
+            impacts.append(group["impact"])
+        members = self._bytes(matched)
+        heap, seen, depth = [], set(), 0
+        while True:
+            threshold, progressed = 0.0, False
+            for impact in impacts:
+                if depth >= len(impact):
+                    continue
+                ordinal, contribution = impact[depth]
+                threshold += contribution
+                progressed = True
+                if ordinal in seen:
+                    continue
+                seen.add(ordinal)
+                if members[ordinal >> 3] >> (ordinal & 7) & 1:
+                    item = (sum(s[ordinal] for s in score_maps), -ordinal)
+                    if len(heap) < k:
+                        heapq.heappush(heap, item)
+                    elif item > heap[0]:
+                        heapq.heapreplace(heap, item)
+            depth += 1
+            if not progressed or (len(heap) >= k and heap[0][0] >= threshold):
+                break
+        return [(score, -neg) for score, neg in sorted(heap, reverse=True)]
+
+    def search(self, query, filters=None, limit=20, offset=0):
+        """Ranked entries for ``query`` plus facet counts over the filtered result set.
+
+        ``filters`` maps a facet name to accepted values; ``skills`` matches
+        entries having any of them. An empty query browses the whole catalog.
+        ``facets`` holds the top ``FACET_TOP`` values of each facet and
+        ``facetOther`` how many matched entries have only other values. Small
+        result sets are counted exactly; large ones consider only the
+        ``FACET_CANDIDATES`` values most common in the whole catalog.
+        """
+        terms = tokenize(query)
+        with self._lock:
+            groups = [self._group(term, i == len(terms) - 1) for i, term in enumerate(terms)]
+            matched = self._all_bitmap()
+            for group in sorted(groups, key=lambda g: len(g["scores"])):
+                matched &= group["bitmap"]
+            for name, values in (filters or {}).items():
+                if values and matched:
+                    matched &= self._facet_bitmap(name, values)
+            total = matched.bit_count()
+
+            if total <= FACET_WALK_LIMIT:
+                facets, facet_other = self._walk_facets(matched)
+            else:
+                facets, facet_other = self._intersect_facets(matched)
+
+            top = self._rank(groups, matched, total, offset + limit) if matched else []
+            items = [dict(self._entries[self._keys[ordinal]], score=round(score, 3))
+                     for score, ordinal in top[offset:]]
+        return {"total": total, "items": items, "facets": facets, "facetOther": facet_other}
+
+    def suggest(self, prefix, limit=8):
+        """Titles containing every typed word, the last one matched as a prefix; shortest first."""
+        terms = tokenize(prefix)
+        if not terms:
+            return []
+        with self._lock:
+            matched = None
+            for i, term in enumerate(terms):
+                candidates = self._expand(self._title_vocab, term) if i == len(terms) - 1 else [term]
+                bitmap = self._cached(("title", tuple(candidates)), lambda: self._bitmap(
+                    set().union(*(self._title_postings.get(c, ()) for c in candidates))))
+                matched = bitmap if matched is None else matched & bitmap
+                if not matched:
+                    return []
+            if matched.bit_count() <= EXACT_RANK_LIMIT:
+                entries = sorted((self._entries[self._keys[o]] for o in _iter_bits(matched)),
+                                 key=lambda e: (len(e["title"] or ""), e["title"] or ""))[:limit]
+            else:
+                # Dense matches: walk all titles shortest-first and keep the first hits.
+                order = self._cached(("title_order",), lambda: sorted(
+                    self._ordinals.values(), key=lambda o: (len(self._entries[self._keys[o]]["title"] or ""),
+                                                            self._entries[self._keys[o]]["title"] or "")))
+                members = self._bytes(matched)
+                entries = []
+                for ordinal in order:
+                    if members[ordinal >> 3] >> (ordinal & 7) & 1:
+                        entries.append(self._entries[self._keys[ordinal]])
+                        if len(entries) >= limit:
+                            break
+        return [{"kind": e["kind"], "id": e["id"], "title": e["title"]} for e in entries]
+
+    def stats(self):
+        return {"entries": len(self._entries), "terms": len(self._vocab), "version": self.version}
+
+
+catalog_index = CatalogIndex()
@@ -0,0 +1,71 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Origin for this process's timings: interpreter import time, reset in forked workers.
+_origin = time.monotonic()
+_timings = {}
+_first_request = threading.Lock()
+_first_request_seen = False
+
+
+def mark_worker_started():
+    """Reset the origin in a freshly forked worker (gunicorn ``post_fork``)."""
+    global _origin, _first_request_seen
+    _origin = time.monotonic()
+    _timings.clear()
+    _first_request_seen = False
+
+
+@contextmanager
+def phase(name):
+    """Record how long a startup phase (import, warmup, ...) took in this process."""
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        _timings[f"{name}_seconds"] = time.monotonic() - started
+
+
+def mark_ready():
+    _timings["cold_start_seconds"] = time.monotonic() - _origin
+
+
+def timings():
+    return dict(_timings, pid=os.getpid())
+
+
+def init_app(app):
+    """Measure time-to-first-request and the first request's own duration."""
+    from flask import g
+    from logger import logger
+
+    @app.before_request
+    def _first_request_started():
+        global _first_request_seen
+        if _first_request_seen:
+            return
+        with _first_request:
+            if _first_request_seen:
+                return
+            _first_request_seen = True
+        g.startup_first_request = time.monotonic()
+
+    @app.teardown_request
+    def _first_request_finished(exc):
+        started = g.pop("startup_first_request", None)
+        if started is None:
+            return
+        now = time.monotonic()
+        _timings["time_to_first_request_seconds"] = now - _origin
+        _timings["first_request_seconds"] = now - started
+        logger.info(f"Worker {os.getpid()} startup: " + ", ".join(
+            f"{name}={value * 1000:.1f}ms" for name, value in sorted(_timings.items())))
+
+
+def metrics_lines():
+    lines = ["# TYPE worker_startup_seconds gauge"]
+    for name, value in sorted(_timings.items()):
+        lines.append(f'worker_startup_seconds{{phase="{name[:-len("_seconds")]}"}} {value}')
+    return lines
@@ -0,0 +1,331 @@
+import datetime
+import os
+import queue
+import threading
+import time
+from collections import defaultdict, deque
+from bson.timestamp import Timestamp
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from pymongo import CursorType
+from pymongo.errors import CollectionInvalid, OperationFailure, PyMongoError
+from logger import logger
+
+# "auto": change streams when the deployment supports them, else the shared event log.
+# "off": record nothing. Unset means "auto" in processes that serve streams (asgi.py)
+# and "off" elsewhere, so WSGI deployments, whose clients poll, pay for no event writes.
+STATUS_EVENTS = os.getenv("STATUS_EVENTS", "")
+SSE_MAX_CONNECTIONS = int(os.getenv("SSE_MAX_CONNECTIONS", "200"))
+SSE_MAX_PER_USER = int(os.getenv("SSE_MAX_PER_USER", "5"))
+SSE_HEARTBEAT = float(os.getenv("SSE_HEARTBEAT", "15"))
+# Streams are closed after this long so proxies and clients reconnect (and resume) periodically.
+SSE_MAX_STREAM_SECONDS = float(os.getenv("SSE_MAX_STREAM_SECONDS", "1800"))
+SSE_REPLAY_BUFFER = int(os.getenv("SSE_REPLAY_BUFFER", "5000"))
+SSE_TICKET_TTL = int(os.getenv("SSE_TICKET_TTL", "60"))
+# How often clients refetch when this deployment does not stream (WSGI mode).
+STATUS_POLL_INTERVAL = int(os.getenv("STATUS_POLL_INTERVAL", "30"))
+SSE_RETRY_MS = 5000
+
+APPLICATION_COLLECTIONS = {"internship_applications": "internship", "project_applications": "project"}
+# Capped collection every worker tails when change streams are unavailable.
+EVENT_LOG = "status_events"
+EVENT_LOG_BYTES = int(os.getenv("STATUS_EVENT_LOG_BYTES", str(16 * 1024 * 1024)))
+
+
+class TooManyStreams(Exception):
+    """Raised when this worker (or this user) already has the maximum number of open streams."""
+
+
+def _ticket_serializer(secret):
+    return URLSafeTimedSerializer(secret, salt="status-events")
+
+
+def issue_ticket(secret, user_id):
+    """Short-lived token that only opens the event stream, for use in its URL.
+
+    EventSource cannot send an Authorization header; putting the JWT itself
+    in the query string would leak a day-long credential into access logs.
+    """
+    return _ticket_serializer(secret).dumps(str(user_id))
+
+
+def read_ticket(secret, ticket):
+    """The user id a ticket was issued to, or None when it is invalid or expired."""
+    try:
+        return _ticket_serializer(secret).loads(ticket, max_age=SSE_TICKET_TTL)
+    except BadSignature:
+        return None
+
+
+def format_event_id(ts):
+    """Event ids are MongoDB timestamps, ``"<seconds>-<increment>"``, in both delivery modes."""
+    return f"{ts.time}-{ts.inc}"
+
+
+def parse_event_id(value):
+    """Comparable ``(seconds, increment)`` tuple for an event id, or None."""
+    try:
+        seconds, increment = value.split("-", 1)
+        return int(seconds), int(increment)
+    except (AttributeError, ValueError):
+        return None
+
+
+def status_event(collection, application_id, status, kind="status", at=None):
+    return {
+        "type": kind,
+        "id": str(application_id),
+        "applicationType": APPLICATION_COLLECTIONS.get(collection, collection),
+        "status": status,
+        "at": at or datetime.datetime.now(datetime.timezone.utc),
+    }
+
+
+class StatusHub:
+    """Per-process fan-out of application events to the owning user's open streams.
+
+    Every worker sees every event, whichever worker handled the write: with
+    change streams from the oplog, otherwise from the ``status_events``
+    capped collection that writers append to and each worker tails. Either
+    way ids come from MongoDB timestamps, so a client may resume on any
+    worker. Recent events are kept in a bounded buffer so a reconnecting
+    client can send ``Last-Event-ID`` and receive what it missed; when the id
+    is older than what this process has buffered the client gets a
+    ``resync`` event and refetches ``/api/my_applications`` once.
+    """
+
+    def __init__(self, max_connections, max_per_user, buffer_size):
+        self.max_connections = max_connections
+        self.max_per_user = max_per_user
+        self._subscribers = defaultdict(set)
+        self._buffer = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        self.connections = 0
+        self.rejected = 0
+        self.published = 0
+        self.mode = None
+        self.streaming = False
+        self._covered_from = None
+        self._mode_pid = None
+        self._started_pid = None
+
+    # --- mode selection -------------------------------------------------------
+    def _select_mode(self, db):
+        """Pick the delivery mode once per process (after any fork)."""
+        if self._mode_pid == os.getpid():
+            return self.mode
+        with self._lock:
+            if self._mode_pid == os.getpid():
+                return self.mode
+            setting = STATUS_EVENTS or ("auto" if self.streaming else "off")
+            mode = "off" if setting == "off" else "event_log"
+            if setting in ("auto", "change_stream"):
+                try:
+                    # Fails straight away on standalone servers.
+                    db.watch([{"$match": {"operationType": "update"}}], max_await_time_ms=1).close()
+                    mode = "change_stream"
+                except OperationFailure as e:
+                    if setting == "change_stream":
+                        raise
+                    logger.info(f"Change streams unavailable ({e.code}), using the {EVENT_LOG} log")
+            if mode == "event_log":
+                try:
+                    db.create_collection(EVENT_LOG, capped=True, size=EVENT_LOG_BYTES, max=self._buffer.maxlen)
+                except CollectionInvalid:
+                    pass  # Created by another worker.
+            self.mode = mode
+            self._mode_pid = os.getpid()
+        return self.mode
+
+    def start(self, db):
+        """Start following events in this process; called before the first stream opens."""
+        if self._started_pid == os.getpid():
+            return
+        mode = self._select_mode(db)
+        with self._lock:
+            if self._started_pid == os.getpid():
+                return
+            self._started_pid = os.getpid()
+        if mode == "change_stream":
+            self._covered_from = (int(time.time()), 0)
+            target, args = self._watch, (db,)
+        elif mode == "event_log":
+            # Load what the log still holds first, so replay covers it before any stream opens.
+            last = self._catch_up(db)
+            target, args = self._tail, (db, last)
+        else:
+            return
+        threading.Thread(target=target, args=args, name="status-events", daemon=True).start()
+
+    # --- publishing -----------------------------------------------------------
+    def record(self, db, user_id, event):
+        self.record_many(db, [(user_id, event)])
+
+    def record_many(self, db, events):
+        """Called by writers after status or submission changes, with ``(user_id, event)`` pairs.
+
+        One unordered ``insert_many`` per call, so a bulk review costs one
+        round trip. A no-op with change streams, which pick the updates up
+        from the oplog. The writes themselves have already succeeded, so
+        failures are only logged; streaming clients then miss the events
+        until they next refetch.
+        """
+        if not events:
+            return
+        try:
+            if self._select_mode(db) != "event_log":
+                return
+            # An empty Timestamp is replaced by the server's current timestamp on insert.
+            db[EVENT_LOG].insert_many(
+                [{"ts": Timestamp(0, 0), "user_id": str(user_id), "event": event} for user_id, event in events],
+                ordered=False)
+        except PyMongoError as e:
+            logger.warning(f"{len(events)} status events not recorded: {e}")
+
+    def publish(self, user_id, event, event_id):
+        event = dict(event, eventId=event_id)
+        key = parse_event_id(event_id)
+        with self._lock:
+            self._buffer.append((key, str(user_id), event))
+            targets = list(self._subscribers.get(str(user_id), ()))
+            self.published += 1
+        for target in targets:
+            try:
+                target.put_nowait(event)
+            except queue.Full:
+                # A stalled client; it will resync from Last-Event-ID when it reconnects.
+                pass
+
+    def _publish_logged(self, doc):
+        self.publish(doc["user_id"], doc["event"], format_event_id(doc["ts"]))
+
+    def _catch_up(self, db):
+        docs = list(db[EVENT_LOG].find({}, sort=[("$natural", 1)]))
+        with self._lock:
+            first = (docs[0]["ts"].time, docs[0]["ts"].inc) if docs else (int(time.time()), 0)
+            self._covered_from = first
+        for doc in docs:
+            self._publish_logged(doc)
+        return docs[-1]["ts"] if docs else None
+
+    def _tail(self, db, last):
+        while True:
+            try:
+                cursor = db[EVENT_LOG].find({"ts": {"$gt": last}} if last else {},
+                                            cursor_type=CursorType.TAILABLE_AWAIT)
+                while cursor.alive:
+                    for doc in cursor:
+                        last = doc["ts"]
+                        self._publish_logged(doc)
+            except PyMongoError as e:
+                if isinstance(e, OperationFailure) and e.code == 136:
+                    # CappedPositionLost: the log wrapped past our position; clients resync.
+                    with self._lock:
+                        self._buffer.clear()
+                        self._covered_from = (int(time.time()), 0)
+                logger.warning(f"Status event log tail interrupted, resuming: {e}")
+            time.sleep(1)
+
+    def _watch(self, db):
+        pipeline = [
+            {"$match": {
+                "ns.coll": {"$in": list(APPLICATION_COLLECTIONS)},
+                "$or": [
+                    {"operationType": "replace"},
+                    {"updateDescription.updatedFields.status": {"$exists": True}},
+                    {"updateDescription.updatedFields.submission": {"$exists": True}},
+                ],
+            }},
+            {"$project": {"ns": 1, "clusterTime": 1, "documentKey": 1, "updateDescription": 1,
+                          "fullDocument.user_id": 1, "fullDocument.status": 1}},
+        ]
+        resume_token = None
+        while True:
+            try:
+                with db.watch(pipeline, full_document="updateLookup", resume_after=resume_token) as stream:
+                    for change in stream:
+                        resume_token = stream.resume_token
+                        self._publish_change(change)
+            except PyMongoError as e:
+                if isinstance(e, OperationFailure) and e.code == 286:
+                    # ChangeStreamHistoryLost: the oplog moved past our token; clients resync.
+                    resume_token = None
+                    with self._lock:
+                        self._buffer.clear()
+                        self._covered_from = (int(time.time()), 0)
+                logger.warning(f"Status change stream interrupted, resuming: {e}")
+                time.sleep(1)
+
+    def _publish_change(self, change):
+        doc = change.get("fullDocument") or {}
+        if not doc.get("user_id"):
+            return
+        updated = (change.get("updateDescription") or {}).get("updatedFields", {})
+        kind = "submission" if any(f.startswith("submission") for f in updated) else "status"
+        self.publish(doc["user_id"], status_event(
+            change["ns"]["coll"], change["documentKey"]["_id"], doc.get("status"), kind),
+            format_event_id(change["clusterTime"]))
+
+    # --- subscribing ----------------------------------------------------------
+    def subscribe(self, user_id, inbox=None):
+        """Register an inbox (anything with ``put_nowait``) for the user's events."""
+        user_id = str(user_id)
+        with self._lock:
+            if (self.connections >= self.max_connections
+                    or len(self._subscribers.get(user_id, ())) >= self.max_per_user):
+                self.rejected += 1
+                raise TooManyStreams()
+            inbox = inbox if inbox is not None else queue.Queue(maxsize=256)
+            self._subscribers[user_id].add(inbox)
+            self.connections += 1
+        return inbox
+
+    def unsubscribe(self, user_id, inbox):
+        user_id = str(user_id)
+        with self._lock:
+            subscribers = self._subscribers.get(user_id)
+            if subscribers and inbox in subscribers:
+                subscribers.discard(inbox)
+                self.connections -= 1
+                if not subscribers:
+                    del self._subscribers[user_id]
+
+    def replay(self, user_id, last_event_id):
+        """Events for ``user_id`` after ``last_event_id``; None when they may have been lost."""
+        key = parse_event_id(last_event_id)
+        if key is None:
+            return None
+        user_id = str(user_id)
+        with self._lock:
+            covered_from = self._covered_from
+            if len(self._buffer) == self._buffer.maxlen:
+                covered_from = self._buffer[0][0]
+            if covered_from is None or key < covered_from:
+                return None
+            return [event for event_key, owner, event in self._buffer if owner == user_id and event_key > key]
+
+    def stats(self):
+        return {"mode": self.mode, "connections": self.connections,
+                "rejected": self.rejected, "published": self.published}
+
+
+hub = StatusHub(SSE_MAX_CONNECTIONS, SSE_MAX_PER_USER, SSE_REPLAY_BUFFER)
+
+
+def format_sse(event, dumps):
+    return f"id: {event['eventId']}\nevent: {event['type']}\ndata: {dumps(event)}\n\n"
+
+
+def replay_frames(user_id, last_event_id, dumps):
+    """SSE frames a resuming client missed, and the id of the newest one sent."""
+    sent = parse_event_id(last_event_id) or (0, 0)
+    frames = [f"retry: {SSE_RETRY_MS}\n\n"]
+    if last_event_id:
+        missed = hub.replay(user_id, last_event_id)
+        if missed is None:
+            frames.append("event: resync\ndata: {}\n\n")
+        else:
+            for event in missed:
+                sent = max(sent, parse_event_id(event["eventId"]))
+                frames.append(format_sse(event, dumps))
+    return frames, sent
+
@@ -0,0 +1,145 @@
+import hashlib
+import os
+import tempfile
+from logger import logger
+
+CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(64 * 1024)))
+RESUME_MAX_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(5 * 1024 * 1024)))
+RESUME_ALLOWED_TYPES = [t.strip().lower() for t in os.getenv("RESUME_ALLOWED_TYPES", "pdf,doc,docx").split(",") if t.strip()]
+
+# Leading bytes expected for each accepted extension.
+MAGIC_BYTES = {
+    "pdf": (b"%PDF",),
+    "doc": (b"\xd0\xcf\x11\xe0",),
+    "docx": (b"PK\x03\x04",),
+}
+
+
+class UploadRejected(ValueError):
+    """Raised when an upload is too large or not an accepted file type."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class StoredFile:
+    def __init__(self, key, size, original_name):
+        self.key = key
+        self.size = size
+        self.original_name = original_name
+
+
+def _extension(filename):
+    _, ext = os.path.splitext(filename or "")
+    return ext.lstrip(".").lower()
+
+
+def spool_upload(file_storage, tmp_dir=None, max_bytes=RESUME_MAX_BYTES, allowed_types=RESUME_ALLOWED_TYPES):
+    """Copy an upload to a temp file in fixed-size chunks while hashing it.
+
+    Returns ``(temp_path, sha256_hex, size, extension)``. Memory use is bounded
+    by ``CHUNK_SIZE`` regardless of the upload size.
+    """
+    ext = _extension(file_storage.filename)
+    if ext not in allowed_types:
+        raise UploadRejected(f"Unsupported file type, allowed: {', '.join(allowed_types)}")
+
+    digest = hashlib.sha256()
+    size = 0
+    fd, temp_path = tempfile.mkstemp(dir=tmp_dir, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            first = True
+            while True:
+                chunk = file_storage.stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                if first:
+                    if ext in MAGIC_BYTES and not chunk.startswith(MAGIC_BYTES[ext]):
+                        raise UploadRejected(f"File content does not match .{ext}")
+                    first = False
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadRejected(f"File exceeds {max_bytes} bytes", status=413)
+                digest.update(chunk)
+                out.write(chunk)
+        if size == 0:
+            raise UploadRejected("Empty file")
+    except Exception:
+        os.remove(temp_path)
+        raise
+    return temp_path, digest.hexdigest(), size, ext
+
+
+class LocalStorage:
+    """Content-addressed files in a local directory: ``<sha256>.<ext>``."""
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def save(self, file_storage):
+        temp_path, sha, size, ext = spool_upload(file_storage, tmp_dir=self.root)
+        key = f"{sha}.{ext}"
+        target = os.path.join(self.root, key)
+        if os.path.exists(target):
+            os.remove(temp_path)
+            logger.info(f"Deduplicated upload {file_storage.filename} -> {key}")
+        else:
+            os.replace(temp_path, target)
+        return StoredFile(key, size, file_storage.filename)
+
+    def exists(self, key):
+        return os.path.isfile(os.path.join(self.root, key))
+
+    def open(self, key):
+        return open(os.path.join(self.root, key), "rb")
+
+
+class GridFSStorage:
+    """Content-addressed files in a GridFS bucket, keyed by ``filename``."""
+
+    def __init__(self, mongo, bucket="resumes"):
+        self.mongo = mongo
+        self.bucket = bucket
+        self._fs = None
+        self._pid = None
+
+    @property
+    def fs(self):
+        """GridFS handle bound to this process's client (rebuilt after a fork)."""
+        if self._pid != os.getpid():
+            import gridfs
+            self._fs = gridfs.GridFS(self.mongo.db, collection=self.bucket)
+            self._pid = os.getpid()
+        return self._fs
+
+    def save(self, file_storage):
+        temp_path, sha, size, ext = spool_upload(file_storage)
+        key = f"{sha}.{ext}"
+        try:
+            if self.fs.exists({"filename": key}):
+                logger.info(f"Deduplicated upload {file_storage.filename} -> {key}")
+            else:
+                with open(temp_path, "rb") as src:
+                    self.fs.put(src, filename=key, chunk_size_bytes=255 * 1024,
+                                metadata={"sha256": sha, "original_name": file_storage.filename})
+        finally:
+            os.remove(temp_path)
+        return StoredFile(key, size, file_storage.filename)
+
+    def exists(self, key):
+        return self.fs.exists({"filename": key})
+
+    def open(self, key):
+        return self.fs.get_last_version(filename=key)
+
+
+def create_storage(kind, uploads_dir, mongo=None):
+    """Build the resume storage backend selected by ``RESUME_STORAGE``."""
+    if kind == "gridfs":
+        return GridFSStorage(mongo)
+    if kind != "local":
+        raise ValueError(f"Unknown storage backend '{kind}'")
+    return LocalStorage(uploads_dir)
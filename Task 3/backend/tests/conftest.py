@@ -0,0 +1,44 @@
+import os
+import sys
+import tempfile
+
+import mongomock
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+# Unit tests never tail or watch a status event log, touch the real uploads/ or hit rate limits.
+os.environ.setdefault("STATUS_EVENTS", "off")
+os.environ.setdefault("ENSURE_INDEXES_ON_START", "false")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("UPLOADS_DIR", tempfile.mkdtemp(prefix="owl-test-uploads-"))
+
+
+@pytest.fixture
+def db():
+    return mongomock.MongoClient().db
+
+
+@pytest.fixture
+def app_module(db, monkeypatch):
+    """The Flask app bound to the mongomock ``db``."""
+    import app as app_module
+    monkeypatch.setattr(app_module.mongo, "_client", db.client)
+    monkeypatch.setattr(app_module.mongo, "_db", db)
+    monkeypatch.setattr(app_module.mongo, "_pid", os.getpid())
+    return app_module
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def auth(app_module):
+    """``auth(user_id)`` -> Authorization headers carrying a token for that user."""
+    from flask_jwt_extended import create_access_token
+
+    def headers(user_id):
+        with app_module.app.app_context():
+            return {"Authorization": f"Bearer {create_access_token(identity=user_id)}"}
+    return headers
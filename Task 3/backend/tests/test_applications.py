@@ -0,0 +1,94 @@
+import datetime
+
+import pytest
+from bson.objectid import ObjectId
+from mongomock.collection import Collection
+
+from applications import apply_review, finish_my_applications, my_applications_pipeline, resolve_status
+
+
+@pytest.mark.parametrize("current, decision, expected", [
+    ("in_process", "approved", "approved"),
+    ("in_process", "rejected", "rejected"),
+    ("submitted", "approved", "completed"),
+    ("submitted", "rejected", "resubmit"),
+    ("resubmit", "approved", "completed"),
+    ("resubmit", "rejected", "resubmit"),
+    (None, "approved", "approved"),
+])
+def test_resolve_status(current, decision, expected):
+    assert resolve_status(current, decision) == expected
+
+
+def _insert(db, *statuses):
+    return [str(db.internship_applications.insert_one({"user_id": "u1", "status": s}).inserted_id)
+            for s in statuses]
+
+
+def test_apply_review_groups_transitions(db):
+    pending, submitted = _insert(db, "in_process", "submitted")
+    results = apply_review(db, "internship_applications", [pending, submitted], "approved")
+    assert results == {pending: {"status": "approved"}, submitted: {"status": "completed"}}
+    stored = {str(d["_id"]): d["status"] for d in db.internship_applications.find()}
+    assert stored == {pending: "approved", submitted: "completed"}
+
+
+def test_apply_review_reports_invalid_and_missing_ids(db):
+    missing = str(ObjectId())
+    results = apply_review(db, "internship_applications", ["nope", missing], "rejected")
+    assert results == {"nope": {"error": "invalid_id"}, missing: {"error": "not_found"}}
+
+
+def test_apply_review_without_changes_writes_nothing(db, monkeypatch):
+    (approved,) = _insert(db, "approved")
+    monkeypatch.setattr(Collection, "bulk_write", lambda *a, **k: pytest.fail("no write expected"))
+    assert apply_review(db, "internship_applications", [approved], "approved") == {approved: {"status": "approved"}}
+
+
+def test_apply_review_reports_conflicts(db, monkeypatch):
+    kept, moved = _insert(db, "in_process", "in_process")
+    bulk_write = Collection.bulk_write
+
+    def racing_bulk_write(self, requests, **kwargs):
+        # Another admin reviews one application between the read and the write.
+        self.update_one({"_id": ObjectId(moved)}, {"$set": {"status": "submitted"}})
+        return bulk_write(self, requests, **kwargs)
+
+    monkeypatch.setattr(Collection, "bulk_write", racing_bulk_write)
+    results = apply_review(db, "internship_applications", [kept, moved], "rejected")
+    assert results == {kept: {"status": "rejected"}, moved: {"error": "conflict"}}
+    assert db.internship_applications.find_one({"_id": ObjectId(moved)})["status"] == "submitted"
+
+
+def test_apply_review_counts_only_applied_transitions(db, monkeypatch):
+    kept, moved = _insert(db, "in_process", "in_process")
+    recorded = []
+    monkeypatch.setattr("counters.record_transitions", lambda db, coll, changes: recorded.extend(changes))
+    bulk_write = Collection.bulk_write
+
+    def racing_bulk_write(self, requests, **kwargs):
+        self.update_one({"_id": ObjectId(moved)}, {"$set": {"status": "approved"}})
+        return bulk_write(self, requests, **kwargs)
+
+    monkeypatch.setattr(Collection, "bulk_write", racing_bulk_write)
+    apply_review(db, "internship_applications", [kept, moved], "rejected")
+    assert recorded == [("in_process", "rejected", 1)]
+
+
+def test_my_applications_pages_through_undated_applications(db):
+    start = datetime.datetime(2025, 1, 1)
+    db.internship_applications.insert_many(
+        [{"user_id": "u1", "created_at": start + datetime.timedelta(days=i)} for i in range(3)]
+        + [{"user_id": "u1"}, {"user_id": "u1", "created_at": None}])
+    seen, cursor = [], None
+    while True:
+        # mongomock has no $unionWith, so page through the internship branch alone.
+        pipeline = my_applications_pipeline("u1", limit=2, cursor=cursor)
+        branch = [stage for stage in pipeline if "$unionWith" not in stage]
+        items, cursor = finish_my_applications(list(db.internship_applications.aggregate(branch)), 2)
+        seen += [item["id"] for item in items]
+        if not cursor:
+            break
+    newest_first = sorted(db.internship_applications.find(), reverse=True,
+                          key=lambda d: (d.get("created_at") is not None, d.get("created_at") or start, d["_id"]))
+    assert seen == [str(d["_id"]) for d in newest_first]
@@ -0,0 +1,49 @@
+import counters
+
+
+def _seed(db):
+    db.users.insert_many([{}, {}])
+    db.internship_applications.insert_many([{"status": "in_process"}, {"status": "in_process"}, {"status": "approved"}])
+
+
+def test_rebuild_counts_the_source_collections(db):
+    _seed(db)
+    summary = counters.rebuild(db)
+    assert summary["users"] == {"total": 2}
+    assert summary["internship_applications"] == {"total": 3, "status": {"in_process": 2, "approved": 1}}
+    assert summary["project_applications"] == {"total": 0, "status": {}}
+    assert "built_at" in db.counters.find_one({"_id": counters.SUMMARY_ID})
+
+
+def test_increment_never_creates_a_partial_summary(db):
+    counters.record_insert(db, "internship_applications", "in_process")
+    assert db.counters.find_one({"_id": counters.SUMMARY_ID}) is None
+
+
+def test_get_summary_rebuilds_a_missing_or_partial_document(db):
+    _seed(db)
+    db.counters.insert_one({"_id": counters.SUMMARY_ID, "users": {"total": 99}})
+    assert counters.get_summary(db)["users"] == {"total": 2}
+    assert counters.get_summary(db)["internship_applications"]["total"] == 3
+
+
+def test_writes_keep_the_summary_in_step(db):
+    _seed(db)
+    counters.rebuild(db)
+    counters.record_insert(db, "internship_applications", "in_process")
+    counters.record_delete(db, "users")
+    counters.record_transitions(db, "internship_applications",
+                                [("in_process", "approved", 2), ("approved", "approved", 5)])
+    summary = counters.get_summary(db)
+    assert summary["users"]["total"] == 1
+    assert summary["internship_applications"] == {"total": 4, "status": {"in_process": 1, "approved": 3}}
+    assert "built_at" not in summary
+
+
+def test_ensure_summary_rebuilds_only_once(db, monkeypatch):
+    calls = []
+    monkeypatch.setattr(counters, "rebuild", lambda db: calls.append(db) or db.counters.insert_one(
+        {"_id": counters.SUMMARY_ID, "built_at": 1}))
+    counters.ensure_summary(db)
+    counters.ensure_summary(db)
+    assert len(calls) == 1
@@ -0,0 +1,65 @@
+import csv
+import datetime
+import io
+import json
+
+import pytest
+from bson.objectid import ObjectId
+
+import exports
+from exports import _csv_value
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("=HYPERLINK(\"http://x\")", "'=HYPERLINK(\"http://x\")"),
+    ("+1", "'+1"), ("-1+2", "'-1+2"), ("@SUM(A1)", "'@SUM(A1)"), ("\tx", "'\tx"), ("\rx", "'\rx"),
+    ("Ada Lovelace", "Ada Lovelace"), ("a=b", "a=b"), (None, ""), (-3, -3),
+    (datetime.datetime(2025, 1, 2, 3, 4), "2025-01-02T03:04:00"),
+])
+def test_csv_value_neutralises_formulas(value, expected):
+    assert _csv_value(value) == expected
+
+
+@pytest.fixture
+def admin(db, auth):
+    admin_id = db.admins.insert_one({"email": "admin@example.com", "is_admin": True}).inserted_id
+    return auth(str(admin_id))
+
+
+def _seed(db, count):
+    user_id = db.users.insert_one({"name": "=cmd|' /C calc'!A0"}).inserted_id
+    db.projects.insert_one({"id": "site", "name": "Portfolio Site"})
+    db.project_applications.insert_many([{
+        "user_id": str(user_id), "project_id": "site", "name": f"Applicant {i}", "email": f"@{i}@example.com",
+        "status": "approved" if i % 2 else "in_process",
+        "created_at": datetime.datetime(2025, 1, 1) + datetime.timedelta(days=i),
+    } for i in range(count)])
+
+
+def test_csv_export_streams_every_row_in_batches(client, db, admin, monkeypatch):
+    monkeypatch.setattr(exports, "EXPORT_BATCH_SIZE", 2)
+    _seed(db, 5)
+    response = client.get("/api/admin/export/project_applications", headers=admin)
+    assert response.status_code == 200 and response.mimetype == "text/csv"
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [r["applicant"] for r in rows] == [f"Applicant {i}" for i in range(5)]
+    assert rows[0]["catalog_title"] == "Portfolio Site"
+    assert rows[0]["user_name"].startswith("'=")
+    assert rows[0]["email"] == "'@0@example.com"
+
+
+def test_ndjson_export_filters_and_keeps_raw_values(client, db, admin):
+    _seed(db, 4)
+    response = client.get("/api/admin/export/project_applications?format=ndjson&status=approved", headers=admin)
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [r["applicant"] for r in rows] == ["Applicant 1", "Applicant 3"]
+    assert rows[0]["user_name"].startswith("=")  # only CSV cells are neutralised
+
+
+def test_export_rejects_unknown_kind_and_format(client, admin):
+    assert client.get("/api/admin/export/users", headers=admin).status_code == 404
+    assert client.get("/api/admin/export/project_applications?format=xlsx", headers=admin).status_code == 400
+
+
+def test_export_is_admin_only(client, auth):
+    assert client.get("/api/admin/export/project_applications", headers=auth(str(ObjectId()))).status_code == 401
@@ -0,0 +1,35 @@
+import asyncio
+from types import SimpleNamespace
+
+import metrics
+from metrics import ASGIRequestMetrics, MongoCommandListener
+
+
+def run_command(listener, name, collection, request_id):
+    listener.started(SimpleNamespace(command_name=name, command={name: collection},
+                                     connection_id=("db", 27017), request_id=request_id))
+    listener.succeeded(SimpleNamespace(command_name=name, connection_id=("db", 27017), request_id=request_id,
+                                       duration_micros=1500, reply={"cursor": {"firstBatch": [{}, {}]}}))
+
+
+def test_commands_outside_a_request_count_as_background():
+    run_command(MongoCommandListener(), "find", "bg_test", 1)
+    assert metrics.MONGO_LATENCY._series[("background", "find", "bg_test")][2] == 1
+
+
+def test_async_client_commands_are_attributed_to_the_asgi_route():
+    listener = MongoCommandListener()
+
+    async def endpoint(scope, receive, send):
+        run_command(listener, "find", "asgi_test", 2)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    async def send(message):
+        pass
+
+    app = ASGIRequestMetrics(endpoint, "/api/my_applications")
+    asyncio.run(app({"type": "http", "method": "GET"}, None, send))
+    assert metrics.MONGO_LATENCY._series[("/api/my_applications", "find", "asgi_test")][2] == 1
+    assert metrics.MONGO_DOCS._values[("/api/my_applications", "asgi_test")] == 2
+    assert metrics._route() == "background"
@@ -0,0 +1,98 @@
+import datetime
+
+import pytest
+from bson.objectid import ObjectId
+from flask import Flask
+from pymongo import ASCENDING, DESCENDING
+
+from pagination import (
+    PaginationError, after_cursor, decode_cursor, encode_cursor, paginated_find, parse_limit,
+    MAX_PAGE_SIZE, DEFAULT_PAGE_SIZE,
+)
+
+START = datetime.datetime(2025, 1, 1)
+
+
+def test_cursor_round_trip():
+    oid = ObjectId()
+    when = datetime.datetime(2025, 3, 4, 5, 6, 7, 123000)
+    token = encode_cursor(when, oid)
+    assert "=" not in token
+    assert decode_cursor(token) == (when, oid)
+
+
+@pytest.mark.parametrize("token", ["", "not-base64!", "e30", encode_cursor("x", "y")[:-3]])
+def test_decode_cursor_rejects_garbage(token):
+    with pytest.raises(PaginationError):
+        decode_cursor(token)
+
+
+@pytest.mark.parametrize("value, expected", [(None, DEFAULT_PAGE_SIZE), ("5", 5), ("100000", MAX_PAGE_SIZE)])
+def test_parse_limit(value, expected):
+    assert parse_limit(value) == expected
+
+
+@pytest.mark.parametrize("value", ["0", "-1", "ten"])
+def test_parse_limit_rejects(value):
+    with pytest.raises(PaginationError):
+        parse_limit(value)
+
+
+def test_after_cursor_breaks_ties_on_id():
+    oid = ObjectId()
+    cursor = encode_cursor(START, oid)
+    assert after_cursor("created_at", DESCENDING, cursor) == {"$or": [
+        {"created_at": {"$lt": START}}, {"created_at": START, "_id": {"$lt": oid}}, {"created_at": None}]}
+    assert after_cursor("created_at", ASCENDING, cursor) == {"$or": [
+        {"created_at": {"$gt": START}}, {"created_at": START, "_id": {"$gt": oid}}]}
+    assert after_cursor("_id", ASCENDING, encode_cursor(oid, oid)) == {"_id": {"$gt": oid}}
+
+
+def _walk(collection, query_string):
+    app = Flask(__name__)
+    pages, cursor = [], None
+    while True:
+        qs = query_string + (f"&cursor={cursor}" if cursor else "")
+        with app.test_request_context(f"/?{qs}"):
+            page = paginated_find(collection, {}, sort_fields=("_id", "created_at"),
+                                  default_sort="_id", date_field="created_at")
+        pages.append([d["_id"] for d in page.items])
+        cursor = page.next_cursor
+        if not cursor:
+            return pages
+
+
+@pytest.mark.parametrize("sort", ["created_at", "-created_at", "_id", "-_id"])
+def test_keyset_pages_cover_every_document_once(db, sort):
+    # Several documents share each created_at, so pages must split ties on _id.
+    db.items.insert_many([{"created_at": START + datetime.timedelta(minutes=i // 3)} for i in range(11)])
+    pages = _walk(db.items, f"limit=4&sort={sort}")
+    assert [len(p) for p in pages] == [4, 4, 3]
+    field, reverse = sort.lstrip("-"), sort.startswith("-")
+    expected = [d["_id"] for d in sorted(db.items.find(), key=lambda d: (d[field], d["_id"]), reverse=reverse)]
+    assert [oid for page in pages for oid in page] == expected
+
+
+def test_null_cursor_round_trip():
+    oid = ObjectId()
+    assert decode_cursor(encode_cursor(None, oid)) == (None, oid)
+
+
+@pytest.mark.parametrize("sort", ["created_at", "-created_at"])
+def test_keyset_pages_order_null_and_missing_values_first(db, sort):
+    docs = [{"created_at": START + datetime.timedelta(minutes=i // 3)} for i in range(7)]
+    docs += [{"created_at": None}, {}, {"created_at": None}, {}, {"created_at": None}]
+    db.items.insert_many(docs)
+    pages = _walk(db.items, f"limit=3&sort={sort}")
+    assert [len(p) for p in pages] == [3, 3, 3, 3]
+    ids = [oid for page in pages for oid in page]
+    # MongoDB puts null and missing before every date; ties break on _id.
+    nulls = sorted(d["_id"] for d in db.items.find({"created_at": None}))
+    dated = [d["_id"] for d in sorted(db.items.find({"created_at": {"$ne": None}}),
+                                      key=lambda d: (d["created_at"], d["_id"]))]
+    assert ids == (nulls + dated if sort == "created_at" else (nulls + dated)[::-1])
+
+
+def test_exact_last_page_has_no_cursor(db):
+    db.items.insert_many([{"created_at": START} for _ in range(4)])
+    assert [len(p) for p in _walk(db.items, "limit=2")] == [2, 2]
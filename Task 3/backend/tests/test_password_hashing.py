@@ -0,0 +1,82 @@
+import threading
+
+import pytest
+
+import password_hashing
+from password_hashing import HashingBusy, HashingPool
+
+
+@pytest.fixture
+def gate():
+    """Blocks pool jobs until released, so the tests control when they finish."""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def test_run_returns_the_result():
+    pool = HashingPool(1, 2)
+    assert pool.run(lambda a, b: a + b, 2, 3) == 5
+
+
+def test_submit_rejects_beyond_the_queue_limit(gate):
+    pool = HashingPool(1, 2)
+    running = pool.submit(gate.wait)
+    queued = pool.submit(gate.wait)
+    with pytest.raises(HashingBusy):
+        pool.submit(gate.wait)
+    assert pool.rejected == 1
+    gate.set()
+    running.result(1), queued.result(1)
+    assert pool.run(lambda: "ok") == "ok"  # slots came back when the jobs finished
+
+
+def test_timeout_raises_busy_and_keeps_the_slot_until_the_job_ends(gate, monkeypatch):
+    monkeypatch.setattr(password_hashing, "HASH_TIMEOUT", 0.05)
+    pool = HashingPool(1, 1)
+    with pytest.raises(HashingBusy):
+        pool.run(gate.wait)
+    assert pool.timed_out == 1
+    with pytest.raises(HashingBusy):
+        pool.submit(lambda: None)  # the timed-out job is still running
+    gate.set()
+    monkeypatch.setattr(password_hashing, "HASH_TIMEOUT", 1)
+    for _ in range(50):
+        try:
+            assert pool.run(lambda: "ok") == "ok"
+            break
+        except HashingBusy:
+            threading.Event().wait(0.01)
+    else:
+        pytest.fail("slot was never released")
+
+
+def test_timeout_cancels_a_job_that_never_started(gate, monkeypatch):
+    monkeypatch.setattr(password_hashing, "HASH_TIMEOUT", 0.05)
+    pool = HashingPool(1, 2)
+    pool.submit(gate.wait)
+    ran = []
+    with pytest.raises(HashingBusy):
+        pool.run(ran.append, 1)
+    gate.set()
+    pool.run(lambda: None)
+    assert ran == []
+
+
+def test_busy_pool_answers_429(client, db, monkeypatch, app_module):
+    db.users.insert_one({"email": "a@example.com", "password_hash": "x"})
+
+    def busy(*args):
+        raise HashingBusy()
+
+    monkeypatch.setattr(app_module, "verify_password", busy)
+    response = client.post("/auth/login", json={"email": "a@example.com", "password": "pw"})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == str(HashingBusy.retry_after)
+
+
+def test_needs_rehash():
+    assert password_hashing.needs_rehash("pbkdf2:sha256:1000$salt$hash") != (
+        password_hashing.PASSWORD_HASH_METHOD == "pbkdf2:sha256:1000")
+    assert not password_hashing.needs_rehash("")
+    assert not password_hashing.needs_rehash(f"{password_hashing.PASSWORD_HASH_METHOD}$salt$hash")
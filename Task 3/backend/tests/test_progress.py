@@ -0,0 +1,100 @@
+import datetime
+
+import pytest
+from bson.objectid import ObjectId
+
+import progress
+from progress import (
+    _completion_update, complete_task, format_progress, format_task, mentor_advice, module_tasks, module_total,
+)
+
+NOW = datetime.datetime(2025, 5, 1)
+
+
+@pytest.fixture
+def module(db):
+    module_id = db.modules.insert_one({"title": "Basics"}).inserted_id
+    task_ids = db.tasks.insert_many([{"module_id": module_id, "title": f"Task {i}"} for i in range(3)]).inserted_ids
+    return module_id, task_ids
+
+
+@pytest.fixture
+def no_round(monkeypatch):
+    """mongomock lacks $round; keep the rest of the completion pipeline as written."""
+    def update(task_id, total, now):
+        stages = _completion_update(task_id, total, now)
+        stages[1]["$set"]["percent"] = stages[1]["$set"]["percent"]["$round"][0]
+        return stages
+    monkeypatch.setattr(progress, "_completion_update", update)
+
+
+def test_completion_update_adds_to_the_set_and_recomputes_counts():
+    task_id = ObjectId()
+    set_completed, counts = (stage["$set"] for stage in _completion_update(task_id, 4, NOW))
+    assert set_completed["completed"] == {"$setUnion": [{"$ifNull": ["$completed", []]}, [task_id]]}
+    assert counts["completed_count"] == {"$size": "$completed"}
+    assert counts["total_tasks"] == 4 and counts["updated_at"] == NOW
+    assert counts["percent"]["$round"][1] == 1
+    # An empty module must not divide by zero.
+    percent = _completion_update(task_id, 0, NOW)[1]["$set"]["percent"]
+    divide = percent["$round"][0]["$multiply"][0]["$divide"]
+    assert divide[1] == 1
+
+
+def test_format_helpers():
+    task_id = ObjectId()
+    assert format_task({"_id": task_id, "title": "T"}, {task_id})["completed"] is True
+    assert format_progress(None) is None
+    assert format_progress({"module_id": "m"}) == {
+        "moduleId": "m", "completedTasks": [], "completed": 0, "total": 0, "percent": 0, "updatedAt": None}
+
+
+def test_module_tasks_returns_zero_progress_before_any_completion(db, module):
+    module_id, task_ids = module
+    result = module_tasks(db, "u1", module_id)
+    assert [t["id"] for t in result["tasks"]] == task_ids
+    assert result["progress"]["total"] == 3 and result["progress"]["completed"] == 0
+    assert module_tasks(db, "u1", ObjectId()) is None
+
+
+def test_module_total_is_counted_once_and_stored(db, module, monkeypatch):
+    module_id, _ = module
+    assert module_total(db, module_id) == 3
+    assert db.modules.find_one({"_id": module_id})["total_tasks"] == 3
+    monkeypatch.setattr(type(db.tasks), "count_documents", lambda *a, **k: pytest.fail("recounted"))
+    assert module_total(db, module_id) == 3
+
+
+def test_complete_task_is_idempotent_and_feeds_module_tasks(db, module, no_round):
+    module_id, task_ids = module
+    complete_task(db, "u1", task_ids[0])
+    doc = complete_task(db, "u1", task_ids[0])
+    assert doc["completed"] == [task_ids[0]] and doc["completed_count"] == 1 and doc["total_tasks"] == 3
+    complete_task(db, "u1", task_ids[2])
+    result = module_tasks(db, "u1", module_id)
+    assert [t["completed"] for t in result["tasks"]] == [True, False, True]
+    assert result["progress"]["completed"] == 2
+    assert module_tasks(db, "u2", module_id)["progress"]["completed"] == 0
+    assert complete_task(db, "u1", ObjectId()) is None
+
+
+def test_mentor_advice_uses_the_latest_module(db):
+    assert mentor_advice(db, "u1")["progress"] is None
+    db.progress.insert_many([
+        {"user_id": "u1", "module_id": "old", "completed_count": 3, "total_tasks": 3, "percent": 100,
+         "updated_at": NOW - datetime.timedelta(days=1)},
+        {"user_id": "u1", "module_id": "new", "completed_count": 1, "total_tasks": 4, "percent": 25.0, "updated_at": NOW},
+    ])
+    advice = mentor_advice(db, "u1")
+    assert advice["progress"]["moduleId"] == "new"
+    assert advice["advice"].startswith("You've completed 1 of 4 tasks (25.0%)")
+    db.progress.update_one({"module_id": "old"}, {"$set": {"updated_at": NOW + datetime.timedelta(days=1)}})
+    assert mentor_advice(db, "u1")["advice"].startswith("You've finished all 3 tasks")
+
+
+def test_tasks_route_returns_tasks_and_progress(client, db, auth, module):
+    module_id, _ = module
+    response = client.get(f"/tasks/{module_id}", headers=auth("u1"))
+    assert response.status_code == 200
+    assert set(response.json) == {"tasks", "progress"}
+    assert client.get("/tasks/not-an-id", headers=auth("u1")).status_code == 400
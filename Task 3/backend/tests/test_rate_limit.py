@@ -0,0 +1,102 @@
+import pytest
+from pymongo.errors import ServerSelectionTimeoutError
+
+import rate_limit
+from rate_limit import AdmissionControl, MemoryStore
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_memory_store_spends_and_refills(clock):
+    store = MemoryStore()
+    assert store.take("k", 2, 10) == (True, 0)
+    assert store.take("k", 2, 10) == (True, 0)
+    allowed, retry_after = store.take("k", 2, 10)
+    assert not allowed and retry_after == pytest.approx(5)
+    clock[0] += 5
+    assert store.take("k", 2, 10)[0]
+    assert not store.take("k", 2, 10)[0]
+
+
+def test_memory_store_never_exceeds_capacity(clock):
+    store = MemoryStore()
+    store.take("k", 3, 3)
+    clock[0] += 3600
+    assert [store.take("k", 3, 3)[0] for _ in range(4)] == [True, True, True, False]
+
+
+def test_memory_store_evicts_least_recently_used(clock):
+    store = MemoryStore(max_keys=2)
+    store.take("a", 1, 60)
+    store.take("b", 1, 60)
+    store.take("a", 1, 60)  # "a" is now the most recent, so "b" goes first
+    store.take("c", 1, 60)
+    assert list(store._buckets) == ["a", "c"]
+    assert store.take("b", 1, 60)[0]  # evicted, so it starts with a full bucket
+
+
+def test_admission_sheds_beyond_in_flight_limit():
+    control = AdmissionControl("test", {}, MemoryStore(), 2, 0)
+    assert control.enter() and control.enter()
+    assert not control.enter()
+    control.leave()
+    assert control.enter()
+    assert control.stats()["in_flight"] == 2
+
+
+def test_admission_sheds_beyond_upload_bytes():
+    control = AdmissionControl("test", {}, MemoryStore(), 0, 100)
+    assert control.enter(60)
+    assert not control.enter(50)
+    assert control.enter()  # requests without a body are never shed on bytes
+    control.leave(60)
+    assert control.enter(100)
+    assert control.stats()["upload_bytes"] == 100
+
+
+def test_admission_zero_limits_never_shed():
+    control = AdmissionControl("test", {}, MemoryStore(), 0, 0)
+    assert all(control.enter(10 ** 9) for _ in range(100))
+
+
+def test_check_rate_uses_rule_then_default_budget(clock):
+    control = AdmissionControl("test", {"/login": (1, 60), "default": (2, 60)}, MemoryStore(), 0, 0)
+    assert control.check_rate("/login", "ip:1") is None
+    assert control.check_rate("/login", "ip:1") == 60
+    assert control.check_rate("/other", "ip:1") is None
+    assert control.check_rate("/another", "ip:1") is None
+    assert control.check_rate("/other", "ip:1") == 30  # both share the default bucket
+    assert control.check_rate("/login", "ip:2") is None
+
+
+def test_check_rate_fails_open_when_the_store_is_down():
+    class DownStore:
+        def take(self, key, capacity, period):
+            raise ServerSelectionTimeoutError("down")
+
+    control = AdmissionControl("test", {"default": (1, 60)}, DownStore(), 0, 0)
+    assert control.check_rate("/x", "ip:1") is None
+    assert control.stats()["store_errors"] == 1
+
+
+def test_forwarded_ip_trusts_only_the_configured_hops():
+    assert rate_limit.forwarded_ip("10.0.0.1", "203.0.113.7", hops=1) == "203.0.113.7"
+    # A client-supplied header is prepended to, so only the last entries are trusted.
+    assert rate_limit.forwarded_ip("10.0.0.1", "6.6.6.6, 203.0.113.7", hops=1) == "203.0.113.7"
+    assert rate_limit.forwarded_ip("10.0.0.1", "6.6.6.6, 203.0.113.7, 10.0.0.2", hops=2) == "203.0.113.7"
+    assert rate_limit.forwarded_ip("10.0.0.1", "203.0.113.7", hops=0) == "10.0.0.1"
+    assert rate_limit.forwarded_ip("10.0.0.1", None, hops=1) == "10.0.0.1"
+
+
+def test_clients_behind_the_proxy_get_their_own_budget(client, monkeypatch):
+    seen = []
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(rate_limit.admission, "check_rate", lambda rule, key: seen.append(key))
+    client.get("/api/projects", headers={"X-Forwarded-For": "203.0.113.7"},
+               environ_base={"REMOTE_ADDR": "10.0.0.1"})
+    assert seen == ["ip:203.0.113.7"]
@@ -0,0 +1,105 @@
+import pytest
+
+import search
+from search import CatalogIndex
+
+PROJECTS = [
+    {"id": "portfolio", "name": "Portfolio Website", "description": "Personal site with React",
+     "skills": ["React", "CSS"], "mode": "Remote"},
+    {"id": "chat", "name": "Chat App", "description": "Realtime chat; a portfolio piece",
+     "skills": ["Node"], "mode": "Onsite"},
+    {"id": "shop", "name": "Online Shop", "description": "Store front", "skills": ["React"], "mode": "Remote"},
+]
+
+
+@pytest.fixture
+def index(db):
+    db.projects.insert_many([dict(p) for p in PROJECTS])
+    index = CatalogIndex()
+    index.build(db)
+    return index
+
+
+def ids(result):
+    return [item["id"] for item in result["items"]]
+
+
+def test_title_matches_outrank_description_matches(index):
+    assert ids(index.search("portfolio")) == ["portfolio", "chat"]
+
+
+def test_last_term_matches_as_prefix(index):
+    assert ids(index.search("portf")) == ["portfolio", "chat"]
+    assert ids(index.search("online sh")) == ["shop"]
+
+
+def test_every_term_must_match(index):
+    assert ids(index.search("react store")) == ["shop"]
+    assert index.search("react node")["total"] == 0
+
+
+def test_facet_filters_and_counts(index):
+    result = index.search("", {"mode": ["Remote"]})
+    assert sorted(ids(result)) == ["portfolio", "shop"]
+    assert result["facets"]["skills"] == {"React": 2, "CSS": 1}
+
+
+def test_offset_and_limit(index):
+    everything = ids(index.search(""))
+    assert ids(index.search("", limit=1, offset=1)) == everything[1:2]
+
+
+def test_removed_entry_disappears_from_results_and_suggestions(db, index):
+    db.projects.delete_one({"id": "portfolio"})
+    index.record_write(db, "projects", "portfolio")
+    assert ids(index.search("portfolio")) == ["chat"]
+    assert index.suggest("port") == []
+    assert "React" in index.search("")["facets"]["skills"]
+    assert index.search("css")["total"] == 0
+
+
+def test_freed_slot_is_reused_cleanly(db, index):
+    db.projects.delete_one({"id": "portfolio"})
+    index.record_write(db, "projects", "portfolio")
+    db.projects.insert_one({"id": "blog", "name": "Blog Engine", "skills": ["Python"]})
+    index.record_write(db, "projects", "blog")
+    assert ids(index.search("blog")) == ["blog"]
+    assert index.search("react")["total"] == 1
+    assert index.stats()["entries"] == 3
+
+
+def test_renamed_entry_is_indexed_under_its_new_id(db, index):
+    db.projects.update_one({"id": "shop"}, {"$set": {"id": "store"}})
+    index.record_write(db, "projects", "shop", "store")
+    assert ids(index.search("online")) == ["store"]
+    assert index.stats()["entries"] == 3
+
+
+@pytest.mark.parametrize("walk_limit", [10 ** 6, 0])
+def test_facet_counts_match_in_both_counting_modes(monkeypatch, walk_limit):
+    monkeypatch.setattr(search, "FACET_WALK_LIMIT", walk_limit)
+    monkeypatch.setattr(search, "FACET_TOP", 2)
+    index = CatalogIndex()
+    index.add_documents("projects", [
+        {"id": "a", "name": "A", "skills": ["Go", "Rust", "Rust"]},
+        {"id": "b", "name": "B", "skills": ["Go"]},
+        {"id": "c", "name": "C", "skills": ["Go", "Rust"]},
+        {"id": "d", "name": "D", "skills": ["Zig"]},
+        {"id": "e", "name": "E", "skills": ["Elm", "Zig"]},
+        {"id": "f", "name": "F"},
+    ])
+    result = index.search("")
+    assert result["facets"]["skills"] == {"Go": 3, "Rust": 2}
+    assert result["facetOther"]["skills"] == 2  # d and e have only unlisted skills
+    assert result["facets"]["kind"] == {"project": 6} and result["facetOther"]["kind"] == 0
+
+
+def test_large_result_sets_only_intersect_common_values(monkeypatch):
+    monkeypatch.setattr(search, "FACET_WALK_LIMIT", 0)
+    monkeypatch.setattr(search, "FACET_CANDIDATES", 1)
+    index = CatalogIndex()
+    index.add_documents("projects", [{"id": str(i), "name": "x", "skills": ["Common"] if i < 3 else [f"Rare{i}"]}
+                                     for i in range(5)])
+    result = index.search("")
+    assert result["facets"]["skills"] == {"Common": 3}
+    assert result["facetOther"]["skills"] == 2
@@ -0,0 +1,75 @@
+import pytest
+from bson.objectid import ObjectId
+from mongomock.collection import Collection
+from mongomock.database import Database
+from pymongo.errors import OperationFailure
+
+import status_events
+from applications import apply_review
+from status_events import StatusHub, format_event_id, issue_ticket, parse_event_id, read_ticket, status_event
+
+
+def hub():
+    return StatusHub(max_connections=10, max_per_user=2, buffer_size=100)
+
+
+@pytest.fixture(autouse=True)
+def standalone(monkeypatch):
+    """Make mongomock behave like a standalone server: no change streams, capped collections accepted."""
+    def watch(self, *args, **kwargs):
+        raise OperationFailure("The $changeStream stage is only supported on replica sets", code=40573)
+
+    create_collection = Database.create_collection
+    monkeypatch.setattr(Database, "watch", watch, raising=False)
+    monkeypatch.setattr(Database, "create_collection", lambda self, name, **options: create_collection(self, name))
+
+
+@pytest.mark.parametrize("setting, streaming, mode", [
+    ("", False, "off"),
+    ("", True, "event_log"),  # mongomock has no change streams, like a standalone server
+    ("event_log", False, "event_log"),
+    ("off", True, "off"),
+])
+def test_mode_defaults_to_off_unless_this_process_streams(db, monkeypatch, setting, streaming, mode):
+    monkeypatch.setattr(status_events, "STATUS_EVENTS", setting)
+    h = hub()
+    h.streaming = streaming
+    assert h._select_mode(db) == mode
+
+
+def test_record_many_is_one_insert(db, monkeypatch):
+    monkeypatch.setattr(status_events, "STATUS_EVENTS", "event_log")
+    calls = []
+    insert_many = Collection.insert_many
+    monkeypatch.setattr(Collection, "insert_many", lambda self, docs, **kw: calls.append(kw) or insert_many(self, docs))
+    h = hub()
+    h.record_many(db, [(f"u{i}", status_event("project_applications", i, "approved")) for i in range(50)])
+    h.record_many(db, [])
+    assert calls == [{"ordered": False}]
+    assert db[status_events.EVENT_LOG].count_documents({}) == 50
+
+
+def test_record_is_a_no_op_when_off(db, monkeypatch):
+    monkeypatch.setattr(status_events, "STATUS_EVENTS", "")
+    hub().record(db, "u1", status_event("project_applications", 1, "approved"))
+    assert status_events.EVENT_LOG not in db.list_collection_names()
+
+
+def test_bulk_review_records_its_events_once(db, monkeypatch):
+    recorded = []
+    monkeypatch.setattr(status_events.hub, "record_many", lambda db, events: recorded.append(events))
+    ids = [str(i) for i in db.project_applications.insert_many(
+        [{"user_id": f"u{i}", "status": "in_process"} for i in range(20)]).inserted_ids]
+    apply_review(db, "project_applications", ids + [str(ObjectId())], "approved")
+    assert len(recorded) == 1
+    assert sorted(user for user, _ in recorded[0]) == sorted(f"u{i}" for i in range(20))
+    assert {event["status"] for _, event in recorded[0]} == {"approved"}
+
+
+def test_event_ids_and_tickets():
+    from bson.timestamp import Timestamp
+    assert parse_event_id(format_event_id(Timestamp(1700000000, 7))) == (1700000000, 7)
+    assert parse_event_id("garbage") is None
+    ticket = issue_ticket("secret", "u1")
+    assert read_ticket("secret", ticket) == "u1"
+    assert read_ticket("other", ticket) is None
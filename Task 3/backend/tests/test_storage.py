@@ -0,0 +1,66 @@
+import hashlib
+import io
+import os
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+import storage
+from storage import LocalStorage, UploadRejected, create_storage, spool_upload
+
+PDF = b"%PDF-1.4\n" + b"x" * 1000
+
+
+def upload(data, filename="cv.pdf"):
+    return FileStorage(stream=io.BytesIO(data), filename=filename)
+
+
+def test_spool_upload_hashes_in_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "CHUNK_SIZE", 64)
+    path, sha, size, ext = spool_upload(upload(PDF), tmp_dir=tmp_path)
+    with open(path, "rb") as f:
+        assert f.read() == PDF
+    assert (size, ext) == (len(PDF), "pdf")
+    assert sha == hashlib.sha256(PDF).hexdigest()
+
+
+@pytest.mark.parametrize("data, filename, status", [
+    (PDF, "cv.exe", 400),
+    (b"MZ" + b"x" * 100, "cv.pdf", 400),
+    (b"", "cv.pdf", 400),
+    (PDF, "CV.PDF", None),
+])
+def test_spool_upload_checks_type_and_content(tmp_path, data, filename, status):
+    if status is None:
+        assert spool_upload(upload(data, filename), tmp_dir=tmp_path)[3] == "pdf"
+        return
+    with pytest.raises(UploadRejected) as e:
+        spool_upload(upload(data, filename), tmp_dir=tmp_path)
+    assert e.value.status == status
+    assert os.listdir(tmp_path) == []  # the partial temp file is removed
+
+
+def test_spool_upload_stops_at_the_size_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "CHUNK_SIZE", 256)
+    with pytest.raises(UploadRejected) as e:
+        spool_upload(upload(PDF), tmp_dir=tmp_path, max_bytes=500)
+    assert e.value.status == 413
+    assert os.listdir(tmp_path) == []
+
+
+def test_local_storage_deduplicates_by_content(tmp_path):
+    store = LocalStorage(str(tmp_path / "uploads"))
+    first = store.save(upload(PDF, "a.pdf"))
+    second = store.save(upload(PDF, "b.pdf"))
+    assert first.key == second.key and first.key.endswith(".pdf")
+    assert second.original_name == "b.pdf"
+    assert os.listdir(store.root) == [first.key]
+    assert store.exists(first.key)
+    with store.open(first.key) as f:
+        assert f.read() == PDF
+
+
+def test_create_storage_rejects_unknown_backends(tmp_path):
+    assert isinstance(create_storage("local", str(tmp_path)), LocalStorage)
+    with pytest.raises(ValueError):
+        create_storage("s3", str(tmp_path))
@@ -259,7 +259,7 @@ export default function AdminDashboard() {
             <div><strong>Status:</strong> <span style={{ textTransform: 'capitalize' }}>{viewAppModal.app.status || 'in_process'}</span></div>
             {(viewAppModal.app.resume || viewAppModal.app.resumeName) && (
               <div style={{ marginTop: 8 }}>
-                <a href={`${API_BASE}/uploads/${encodeURIComponent(viewAppModal.app.resume || viewAppModal.app.resumeName)}`} target="_blank" rel="noreferrer" style={styles.modalLink}>
+                <a href={`${API_BASE}/uploads/${encodeURIComponent(viewAppModal.app.resumeKey || viewAppModal.app.resume || viewAppModal.app.resumeName)}`} target="_blank" rel="noreferrer" style={styles.modalLink}>
                   Open Resume
                 </a>
               </div>
@@ -4,6 +4,7 @@ import { useParams, useNavigate, Link, useLocation } from "react-router-dom";
 import Particles, { initParticlesEngine } from "@tsparticles/react";
 import { loadSlim } from "@tsparticles/slim";
 import { motion } from "framer-motion";
+import { watchApplication } from "../utils/applicationEvents";
 
 const API_BASE =
   (typeof import.meta !== "undefined" &&
@@ -61,6 +62,7 @@ function InternshipDetail() {
   const [error, setError] = useState(null);
 
   const [application, setApplication] = useState(null);
+  const [statusVersion, setStatusVersion] = useState(0);
   const [hasApplied, setHasApplied] = useState(false);
   const [isApproved, setIsApproved] = useState(false);
   const [isCompleted, setIsCompleted] = useState(false);
@@ -193,7 +195,13 @@ function InternshipDetail() {
     };
     
     checkApplicationStatus();
-  }, [data]);
+  }, [data, statusVersion]);
+
+  // Refetch when the server reports a change to this application (streamed, or polled under WSGI).
+  useEffect(() => {
+    if (!application?.id) return;
+    return watchApplication(API_BASE, application.id, () => setStatusVersion(v => v + 1));
+  }, [application?.id]);
 
   const handleApplyClick = () => setShowModal(true);
 
@@ -6,6 +6,7 @@ export default function ModuleView() {
   const { id } = useParams()
   const [tasks, setTasks] = useState([])
   const [advice, setAdvice] = useState('')
+  const [progress, setProgress] = useState(null)
 
   useEffect(() => {
     const fetchTasks = async () => {
@@ -13,16 +14,19 @@ export default function ModuleView() {
       const res = await axios.get(`https://owl-task3.onrender.com/tasks/${id}`, {
         headers: { Authorization: `Bearer ${token}` }
       })
-      setTasks(res.data)
+      setTasks(res.data.tasks)
+      setProgress(res.data.progress)
     }
     fetchTasks()
   }, [id])
 
   const completeTask = async (taskId) => {
     const token = localStorage.getItem('token')
-    await axios.post(`https://owl-task3.onrender.com/progress/${taskId}`, {}, {
+    const progressRes = await axios.post(`https://owl-task3.onrender.com/progress/${taskId}`, {}, {
       headers: { Authorization: `Bearer ${token}` }
     })
+    setProgress(progressRes.data.progress)
+    setTasks(prev => prev.map(t => (t.id === taskId ? { ...t, completed: true } : t)))
     const adviceRes = await axios.get('https://owl-task3.onrender.com/mentor/advice', {
       headers: { Authorization: `Bearer ${token}` }
     })
@@ -32,11 +36,14 @@ export default function ModuleView() {
   return (
     <div>
       <h2>Module Tasks</h2>
+      {progress && <p>{progress.completed} / {progress.total} tasks done ({Math.round(progress.percent)}%)</p>}
       <ul>
         {tasks.map(t => (
           <li key={t.id}>
             {t.title} - {t.description}
-            <button onClick={() => completeTask(t.id)}>Complete</button>
+            <button onClick={() => completeTask(t.id)} disabled={t.completed}>
+              {t.completed ? 'Completed' : 'Complete'}
+            </button>
           </li>
         ))}
       </ul>
@@ -3,6 +3,7 @@ import { useParams, Link, useNavigate, useLocation } from "react-router-dom";
 import Particles, { initParticlesEngine } from "@tsparticles/react";
 import { loadSlim } from "@tsparticles/slim";
 import { motion } from "framer-motion";
+import { watchApplication } from "../utils/applicationEvents";
 
 const API_BASE =
   (typeof import.meta !== "undefined" &&
@@ -50,6 +51,7 @@ export default function ProjectDetail() {
   const [hasApplied, setHasApplied] = useState(false);
   const [applicationStatus, setApplicationStatus] = useState(null); 
   const [application, setApplication] = useState(null);
+  const [statusVersion, setStatusVersion] = useState(0);
   const [links, setLinks] = useState({ github_url: "", live_url: "", docs_url: "", notes: "" });
   
   const [particlesReady, setParticlesReady] = useState(false);
@@ -141,7 +143,13 @@ export default function ProjectDetail() {
     };
 
     checkApplicationStatus();
-  }, [project]);
+  }, [project, statusVersion]);
+
+  // Refetch when the server reports a change to this application (streamed, or polled under WSGI).
+  useEffect(() => {
+    if (!application?.id) return;
+    return watchApplication(API_BASE, application.id, () => setStatusVersion(v => v + 1));
+  }, [application?.id]);
   
   const handleApply = () => setShowModal(true);
 
@@ -0,0 +1,61 @@
+// Calls onChange when the given application's status or submission may have changed.
+// Uses the server's event stream when the backend serves one (ASGI mode) and
+// polls otherwise. Returns a cleanup function.
+export const watchApplication = (apiBase, applicationId, onChange) => {
+  const token = localStorage.getItem("token");
+  let closed = false;
+  let source = null;
+  let timer = null;
+  let retry = null;
+  let lastEventId = "";
+
+  const poll = (seconds) => {
+    timer = setInterval(() => {
+      if (!document.hidden) onChange();
+    }, seconds * 1000);
+  };
+
+  const open = async () => {
+    let ticket;
+    try {
+      const res = await fetch(`${apiBase}/api/my_applications/events/ticket`, {
+        method: "POST",
+        headers: { Authorization: `Bearer ${token}` },
+      });
+      if (!res.ok) throw new Error(res.statusText);
+      ticket = await res.json();
+    } catch {
+      ticket = { stream: false, pollInterval: 30 };
+    }
+    if (closed) return;
+    if (!ticket.stream) {
+      poll(ticket.pollInterval);
+      return;
+    }
+    // The ticket only opens the stream and expires within a minute; the JWT never goes in a URL.
+    const params = new URLSearchParams({ ticket: ticket.ticket });
+    if (lastEventId) params.set("lastEventId", lastEventId);
+    source = new EventSource(`${apiBase}/api/my_applications/events?${params}`);
+    const handle = (e) => {
+      if (e.lastEventId) lastEventId = e.lastEventId;
+      const event = e.data ? JSON.parse(e.data) : {};
+      if (e.type === "resync" || event.id === applicationId) onChange();
+    };
+    ["status", "submission", "resync"].forEach((name) => source.addEventListener(name, handle));
+    source.onerror = () => {
+      // The browser stops retrying once a reconnect is refused (e.g. the ticket expired): get a new one.
+      if (source.readyState === EventSource.CLOSED && !closed) {
+        source = null;
+        retry = setTimeout(open, 5000);
+      }
+    };
+  };
+
+  if (token) open();
+  return () => {
+    closed = true;
+    if (source) source.close();
+    clearInterval(timer);
+    clearTimeout(retry);
+  };
+};